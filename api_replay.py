@@ -0,0 +1,325 @@
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import tweepy
+
+from rate_limits import RateLimitTracker
+from twitter_transport import EventLoopThread, PAGING_PARAMS
+
+# ========================================
+# API RECORD / REPLAY
+# ========================================
+# RecordingClient wraps a live tweepy.Client and writes every raw response
+# from the read endpoints the app uses into a fixture directory. ReplayClient
+# serves those fixtures back through the same method signatures, optionally
+# with injected latency, so a full scan can run offline and deterministically.
+# Fixtures are keyed by method + parameters, minus the clock-derived ones
+# (start_time, since_id, ...), so a replay at a frozen clock finds the same
+# files the recording wrote. Paging tokens stay in the key — they come from
+# the recorded responses, so replay sees the same ones — and a follow-up page
+# requested under another endpoint's paging parameter is rejected the way
+# the API rejects it, instead of quietly being served the recorded page.
+
+RECORDED_METHODS = {
+    # method -> tweepy type of response.data
+    "search_recent_tweets": tweepy.Tweet,
+    "get_list_tweets": tweepy.Tweet,
+    "get_users_tweets": tweepy.Tweet,
+    "get_tweets": tweepy.Tweet,
+    "get_tweet": tweepy.Tweet,
+    "get_user": tweepy.User,
+}
+
+# Derived from "now" — left out of fixture keys
+CLOCK_PARAMS = frozenset({"start_time", "end_time", "since_id", "until_id"})
+
+_INCLUDE_TYPES = {
+    "users": tweepy.User,
+    "tweets": tweepy.Tweet,
+    "media": tweepy.Media,
+    "places": tweepy.Place,
+    "polls": tweepy.Poll,
+}
+
+MANIFEST_FILE = "manifest.json"
+
+
+class ReplayMiss(LookupError):
+    """No fixture recorded for this call"""
+
+
+def check_paging_param(method, kwargs):
+    """Raise like the API does when a page is asked for with the wrong paging parameter"""
+    expected = PAGING_PARAMS.get(method)
+    for name in {"next_token", "pagination_token"} & kwargs.keys():
+        if name != expected:
+            raise RuntimeError(f"Replayed API error: {method} does not accept '{name}' (pages with '{expected}')")
+
+
+def _raw(obj):
+    return obj.data if hasattr(obj, "data") else obj
+
+
+def serialize_response(response):
+    """tweepy.Response -> JSON-able dict of the raw API payload"""
+    if response is None:
+        return None
+    data = response.data
+    if isinstance(data, list):
+        data = [_raw(item) for item in data]
+    elif data is not None:
+        data = _raw(data)
+    includes = {key: [_raw(item) for item in items] for key, items in (response.includes or {}).items()}
+    return {"data": data, "includes": includes, "errors": response.errors, "meta": response.meta}
+
+
+def deserialize_response(payload, data_type=tweepy.Tweet):
+    """Inverse of serialize_response — rebuilds tweepy model objects"""
+    if payload is None:
+        return None
+    data = payload.get("data")
+    if isinstance(data, list):
+        data = [data_type(item) for item in data]
+    elif data is not None:
+        data = data_type(data)
+    includes = {
+        key: [_INCLUDE_TYPES[key](item) for item in items] if key in _INCLUDE_TYPES else items
+        for key, items in (payload.get("includes") or {}).items()
+    }
+    return tweepy.Response(data, includes, payload.get("errors") or [], payload.get("meta") or {})
+
+
+def fixture_key(method, args, kwargs):
+    """Stable file name for a call — method name + hash of its non-clock parameters"""
+    params = {k: v for k, v in kwargs.items() if k not in CLOCK_PARAMS}
+    canonical = json.dumps([method, [str(a) for a in args], params], sort_keys=True, default=str)
+    return f"{method}-{hashlib.sha1(canonical.encode()).hexdigest()[:16]}"
+
+
+class RecordingClient:
+    """Pass-through tweepy.Client wrapper that saves each response as a fixture"""
+
+    def __init__(self, client, fixture_dir):
+        self._client = client
+        self.fixture_dir = Path(fixture_dir)
+        self.fixture_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        manifest = self.fixture_dir / MANIFEST_FILE
+        if not manifest.exists():
+            manifest.write_text(json.dumps({"recorded_at": datetime.utcnow().isoformat()}))
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in RECORDED_METHODS:
+            return attr
+
+        def recorded(*args, **kwargs):
+            try:
+                response = attr(*args, **kwargs)
+            except Exception as e:
+                self._save(name, args, kwargs, {"error": str(e)})
+                raise
+            self._save(name, args, kwargs, {"response": serialize_response(response)})
+            return response
+
+        return recorded
+
+    def _save(self, method, args, kwargs, entry):
+        path = self.fixture_dir / f"{fixture_key(method, args, kwargs)}.json"
+        with self._lock:
+            try:
+                fixture = json.loads(path.read_text()) if path.exists() else {
+                    "method": method,
+                    "args": [str(a) for a in args],
+                    "params": {k: v for k, v in kwargs.items() if k not in CLOCK_PARAMS},
+                    "calls": [],
+                }
+                fixture["calls"].append(entry)
+                path.write_text(json.dumps(fixture, default=str))
+            except Exception as e:
+                print(f"Fixture record error ({method}): {e}")
+
+
+class ReplayClient:
+    """Serves recorded fixtures through tweepy.Client's method names
+
+    Repeated calls to the same fixture step through the recorded responses
+    in order and then keep returning the last one. latency_ms + a uniform
+    0..jitter_ms (from its own seeded RNG, so the app's `random` stream is
+    untouched) is slept before every call.
+    """
+
+    def __init__(self, fixture_dir, latency_ms=0, jitter_ms=0, seed=0):
+        self.fixture_dir = Path(fixture_dir)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._rng = random.Random(seed)
+        self._cursors = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.misses = 0
+
+    @property
+    def recorded_at(self):
+        """When the fixtures were recorded (naive UTC), or None"""
+        manifest = self.fixture_dir / MANIFEST_FILE
+        if not manifest.exists():
+            return None
+        return datetime.fromisoformat(json.loads(manifest.read_text())["recorded_at"])
+
+    def __getattr__(self, name):
+        if name not in RECORDED_METHODS:
+            raise AttributeError(f"ReplayClient has no recorded endpoint '{name}'")
+
+        def replayed(*args, **kwargs):
+            return self._serve(name, args, kwargs)
+
+        return replayed
+
+    def _serve(self, method, args, kwargs):
+        check_paging_param(method, kwargs)
+        delay, entry = self._next(method, args, kwargs)
+        if delay:
+            time.sleep(delay / 1000)
+        return self._respond(method, entry)
+
+    def _next(self, method, args, kwargs):
+        """(delay ms, recorded entry) for a call — advances the fixture's cursor"""
+        key = fixture_key(method, args, kwargs)
+        with self._lock:
+            self.calls += 1
+            delay = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+            path = self.fixture_dir / f"{key}.json"
+            if not path.exists():
+                self.misses += 1
+                raise ReplayMiss(f"no fixture for {method} ({key})")
+            calls = json.loads(path.read_text())["calls"]
+            position = self._cursors.get(key, 0)
+            self._cursors[key] = position + 1
+            entry = calls[min(position, len(calls) - 1)]
+        return delay, entry
+
+    @staticmethod
+    def _respond(method, entry):
+        if "error" in entry:
+            raise RuntimeError(f"Replayed API error: {entry['error']}")
+        return deserialize_response(entry["response"], RECORDED_METHODS[method])
+
+    def rewind(self):
+        """Start every fixture from its first recorded response again"""
+        with self._lock:
+            self._cursors.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "misses": self.misses}
+
+
+class ReplayTransport:
+    """Drop-in for TwitterTransport when replaying — no sockets, so no pool stats"""
+
+    def __init__(self, client):
+        self.client = client
+        self.pool_size = 0
+        self.rate_limits = RateLimitTracker()  # Never sees headers, so never refuses
+
+    def connection_stats(self):
+        calls = self.client.stats()["calls"]
+        return {"requests": calls, "new_connections": 0, "reused": calls}
+
+
+class AsyncReplayClient:
+    """Coroutine methods over a ReplayClient — same fixtures, cursors and counters"""
+
+    def __init__(self, replay):
+        self._replay = replay
+
+    def __getattr__(self, name):
+        if name not in RECORDED_METHODS:
+            raise AttributeError(f"ReplayClient has no recorded endpoint '{name}'")
+
+        async def replayed(*args, **kwargs):
+            check_paging_param(name, kwargs)
+            delay, entry = self._replay._next(name, args, kwargs)
+            if delay:
+                await asyncio.sleep(delay / 1000)
+            return self._replay._respond(name, entry)
+
+        return replayed
+
+
+class AsyncReplayTransport:
+    """Drop-in for AsyncTwitterTransport when replaying"""
+
+    def __init__(self, replay, rate_limits):
+        self.replay = replay
+        self.pool_size = 0
+        self.rate_limits = rate_limits
+        self.loop = EventLoopThread()
+
+    async def connect(self):
+        return AsyncReplayClient(self.replay)
+
+    def connection_stats(self):
+        return {"requests": 0, "new_connections": 0, "reused": 0}
+
+
+class OfflineAnthropic:
+    """Stand-in Anthropic client for replay runs — every generation call fails fast"""
+
+    class _Messages:
+        def create(self, **kwargs):
+            raise RuntimeError("Anthropic calls are disabled during API replay")
+
+        def stream(self, **kwargs):
+            raise RuntimeError("Anthropic calls are disabled during API replay")
+
+    def __init__(self):
+        self.messages = self._Messages()
+
+
+@contextmanager
+def frozen_clock(at, modules):
+    """Pin datetime.utcnow()/now() and time.time() to `at` inside the given modules
+
+    Patches each module's own `datetime` / `time` names, so only code that
+    imported them at module level (the app's pattern) sees the frozen clock.
+    """
+    real_datetime = datetime
+    frozen_ts = (at - datetime(1970, 1, 1)).total_seconds()
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return at
+
+        @classmethod
+        def now(cls, tz=None):
+            return at if tz is None else at.replace(tzinfo=timezone.utc).astimezone(tz)
+
+    class FrozenTime:
+        def __getattr__(self, name):
+            return getattr(time, name)
+
+        def time(self):
+            return frozen_ts
+
+    saved = []
+    for module in modules:
+        for name, replacement in (("datetime", FrozenDatetime), ("time", FrozenTime())):
+            current = getattr(module, name, None)
+            if current is real_datetime or current is time:
+                saved.append((module, name, current))
+                setattr(module, name, replacement)
+    try:
+        yield
+    finally:
+        for module, name, original in saved:
+            setattr(module, name, original)
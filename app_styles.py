@@ -0,0 +1,94 @@
+# ========================================
+# APP STYLES
+# ========================================
+# Static CSS for the page. Built once per server process on import; the
+# script still injects it each rerun because Streamlit redraws from scratch.
+
+APP_CSS = """
+<style>
+    .main { background-color: #000000; color: #e7e9ea; }
+    .stButton>button { 
+        background-color: #1d9bf0; 
+        color: white; 
+        border-radius: 20px;
+        border: none;
+        font-weight: bold;
+        padding: 12px 24px;
+        font-size: 16px;
+    }
+    .stButton>button[kind="secondary"] {
+        background-color: #2f3336;
+        border: 1px solid #536471;
+    }
+    .stTextArea>div>div>textarea {
+        background-color: #16181c;
+        color: #e7e9ea;
+        border: 1px solid #2f3336;
+        border-radius: 8px;
+    }
+    div[data-testid="stVerticalBlock"] > div.tweet-card {
+        background-color: #16181c;
+        border: 1px solid #2f3336;
+        border-radius: 16px;
+        padding: 16px;
+        margin: 12px 0;
+    }
+    div[data-testid="stVerticalBlock"] > div.top-pick {
+        background-color: #1a2332;
+        border: 2px solid #1d9bf0;
+        box-shadow: 0 0 20px rgba(29, 155, 240, 0.3);
+        border-radius: 16px;
+        padding: 16px;
+        margin: 12px 0;
+    }
+    .metric-high { color: #f91880; font-weight: bold; }
+    .debate-badge {
+        background-color: #ff4500;
+        color: white;
+        padding: 4px 10px;
+        border-radius: 12px;
+        font-size: 11px;
+        font-weight: bold;
+        margin-left: 8px;
+    }
+    .subject-badge {
+        background-color: #2f3336;
+        color: #8899a6;
+        padding: 3px 8px;
+        border-radius: 10px;
+        font-size: 10px;
+        font-weight: bold;
+        margin-left: 6px;
+    }
+    .rewrite-preview {
+        background-color: #1c1f23;
+        border-left: 3px solid #1d9bf0;
+        padding: 12px;
+        margin: 8px 0;
+        border-radius: 8px;
+        font-size: 14px;
+    }
+    .priority-badge {
+        display: inline-block;
+        padding: 4px 12px;
+        border-radius: 12px;
+        font-size: 12px;
+        font-weight: bold;
+        margin-right: 8px;
+    }
+    .top-pick-badge {
+        background-color: #1d9bf0;
+        color: white;
+        padding: 6px 14px;
+        border-radius: 20px;
+        font-size: 13px;
+        font-weight: bold;
+        margin-bottom: 8px;
+        display: inline-block;
+    }
+    .bo-nix { background-color: #ff4500; color: white; }
+    .sean-payton { background-color: #ff8c00; color: white; }
+    .nuggets { background-color: #ffd700; color: black; }
+    .broncos { background-color: #fb4f14; color: white; }
+</style>
+"""
@@ -0,0 +1,37 @@
+"""Import streamlit_app outside `streamlit run` for offline scripts.
+
+The page is executed once in Streamlit "bare" mode from a scratch directory
+(every button reads False, so nothing is scanned on import), which leaves
+the pipeline functions and module-level stores available as attributes.
+"""
+import logging
+import os
+import shutil
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+
+def load_app(mode, fixture_dir, workdir, latency_ms=0):
+    """Import the app with the given API mode ("record" / "replay") from workdir"""
+    os.environ["TWEET_HUNTER_API_MODE"] = mode
+    os.environ["TWEET_HUNTER_FIXTURES"] = str(fixture_dir)
+    os.environ["TWEET_HUNTER_REPLAY_LATENCY_MS"] = str(latency_ms)
+    if mode == "record":
+        secrets = REPO_ROOT / ".streamlit" / "secrets.toml"
+        if secrets.exists():
+            (workdir / ".streamlit").mkdir(exist_ok=True)
+            shutil.copy(secrets, workdir / ".streamlit" / "secrets.toml")
+    os.chdir(workdir)
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    # Bare mode hands out a throwaway session state on every access, so the
+    # page's own `if key not in st.session_state` setup would never stick
+    from streamlit.runtime.state import SafeSessionState, SessionState, session_state_proxy
+    state = SafeSessionState(SessionState(), lambda: None)
+    session_state_proxy.get_session_state = lambda: state
+
+    import streamlit_app
+    return streamlit_app
@@ -0,0 +1,97 @@
+"""Benchmark: TeamQuota diversity selector vs. the old inline multi-pass selection.
+
+Run from the repo root:  python benchmarks/bench_diversity.py
+"""
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from diversity import TeamQuota, select_diverse
+
+SUBJECTS = ["Bo Nix", "Sean Payton", "Defense", "Offense", "QB Discussion", "Trade Talk",
+            "Nikola Jokic", "Jamal Murray", "MVP", "Injury", "Contract", "General Broncos"]
+
+
+def legacy_select(all_tweets):
+    """The pre-heap implementation: sort, then up to three passes with list membership"""
+    all_tweets = sorted(all_tweets, key=lambda x: x['debate_score'], reverse=True)
+    final_broncos, final_nuggets = [], []
+    count_b, count_n = defaultdict(int), defaultdict(int)
+    backup_b, backup_n = [], []
+
+    def fits(counts, tweet, cap):
+        return all(counts[s] < cap for s in tweet['subjects'])
+
+    def add(final, counts, tweet):
+        final.append(tweet)
+        for s in tweet['subjects']:
+            counts[s] += 1
+
+    for tweet in all_tweets:
+        if tweet['is_broncos'] and len(final_broncos) < 10:
+            (add(final_broncos, count_b, tweet) if fits(count_b, tweet, 2) else backup_b.append(tweet))
+        elif tweet['is_nuggets'] and len(final_nuggets) < 5:
+            (add(final_nuggets, count_n, tweet) if fits(count_n, tweet, 2) else backup_n.append(tweet))
+
+    for final, counts, backup, limit, below, cap in (
+        (final_broncos, count_b, backup_b, 10, 8, 3), (final_nuggets, count_n, backup_n, 5, 4, 3),
+        (final_broncos, count_b, backup_b, 10, 6, 5), (final_nuggets, count_n, backup_n, 5, 3, 5),
+    ):
+        if len(final) < below and backup:
+            for tweet in backup:
+                if len(final) >= limit:
+                    break
+                if tweet not in final and fits(counts, tweet, cap):
+                    add(final, counts, tweet)
+    return final_broncos, final_nuggets
+
+
+TEAMS = [
+    TeamQuota("broncos", lambda t: t['is_broncos'], 10, [2, (3, 8), (5, 6)]),
+    TeamQuota("nuggets", lambda t: t['is_nuggets'], 5, [2, (3, 4), (5, 3)]),
+]
+
+
+def synthetic_pool(n, rng, subject_pool=SUBJECTS):
+    pool = []
+    for i in range(n):
+        pool.append({
+            'id': i,
+            'text': f"tweet {i}",
+            'debate_score': rng.choice([rng.randint(0, 10**6), 250000]),  # force some ties
+            'subjects': set(rng.sample(subject_pool, rng.randint(1, min(3, len(subject_pool))))),
+            'is_broncos': rng.random() < 0.7,
+            'is_nuggets': rng.random() < 0.4,
+        })
+    return pool
+
+
+def timed(fn, pool, rounds=3):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(pool)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    rng = random.Random(7)
+
+    # Equivalence — narrow subject pools force the relaxed stages to run
+    for trial in range(500):
+        pool = synthetic_pool(rng.randint(0, 80), rng, SUBJECTS[:rng.randint(2, len(SUBJECTS))])
+        if list(legacy_select(pool)) != select_diverse(pool, TEAMS):
+            print(f"MISMATCH on trial {trial}")
+            sys.exit(1)
+    print("500 random pools — identical selections")
+
+    for n in (100, 1000, 10000, 50000):
+        pool = synthetic_pool(n, rng)
+        old = timed(legacy_select, pool)
+        new = timed(lambda p: select_diverse(p, TEAMS), pool)
+        print(f"pool {n:>6}: legacy {old:8.2f} ms   select_diverse {new:8.2f} ms   ({old / new:.1f}x)")
@@ -0,0 +1,295 @@
+"""Benchmark: scan pipeline stages on synthetic corpora, checked against a baseline.
+
+    python benchmarks/bench_pipeline.py                      # compare to baseline
+    python benchmarks/bench_pipeline.py --update-baseline    # record a new baseline
+    python benchmarks/bench_pipeline.py --sizes 100 1000 --tolerance 0.3
+
+For each corpus size a stub Twitter client serves that many synthetic tweets,
+split across the scan's searches. Each stage below is timed over several
+cold runs (caches cleared): throughput, min/p50/p95 latency, and peak traced
+memory from one extra tracemalloc run. The exit code is 1 when a stage's peak
+memory, or its min time, exceeds the stored baseline by more than the tolerance.
+
+Times are gated relative to a fixed pure-Python reference workload timed in
+the same run (min of several runs before and after the stages), so a slower
+machine or a noisy neighbour scales the reference along with the stages
+instead of failing the gate. Stages under MIN_COMPARABLE_MS are reported
+but never gated — at a few milliseconds, scheduler noise is the signal.
+
+Stages and what "size" means for each:
+  get_top_debate_tweets     tweets served across all searches (incremental
+                            windows off, so their 2000-tweet cap doesn't hide scale)
+  get_trending_topics       tweet dicts aggregated
+  save_scan_to_history      tweet dicts aggregated into one history entry
+  get_weekly_topic_summary  history holds size / 100 scans (at least 1)
+  find_reply_targets        tweets per reply-target search
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import tweepy
+
+from app_harness import load_app
+
+BASELINE_FILE = Path(__file__).resolve().parent / "pipeline_baseline.json"
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+MIN_COMPARABLE_MS = 5.0  # Stages faster than this (in the baseline) are too noisy to gate on
+REFERENCE_RUNS = 15
+
+WORDS = ("the", "game", "tonight", "honestly", "season", "week", "fans", "ref", "call", "drive",
+         "play", "quarter", "snap", "coach", "roster", "film", "stat", "line", "look", "take")
+PHRASES = ("Bo Nix", "Sean Payton", "Broncos", "Denver Broncos", "Broncos defense", "Courtland Sutton",
+           "Jokic", "Denver Nuggets", "Nuggets", "Jamal Murray", "MVP", "trade", "overrated", "bust",
+           "injury", "contract", "Broncos Country", "#BroncosCountry", "playoffs", "Aaron Gordon")
+
+
+def synthetic_tweets(n, seed=0):
+    """n (tweet, user) payload pairs with app-like text and engagement"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    tweets, users = [], {}
+    for i in range(n):
+        uid = str(rng.randint(1, max(50, n // 20)))
+        text = " ".join(rng.sample(WORDS, 6) + rng.sample(PHRASES, rng.randint(1, 3)))
+        tweet_id = str(10**18 + i)
+        tweets.append({
+            "id": tweet_id,
+            "text": text,
+            "author_id": uid,
+            "created_at": (now - timedelta(hours=rng.uniform(0, 35))).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "edit_history_tweet_ids": [tweet_id],
+            "public_metrics": {
+                "reply_count": rng.randint(0, 120),
+                "retweet_count": rng.randint(0, 300),
+                "like_count": rng.randint(0, 1500),
+                "quote_count": 0,
+            },
+        })
+        users[uid] = {
+            "id": uid, "name": f"User {uid}", "username": f"user{uid}",
+            "public_metrics": {"followers_count": rng.randint(100, 200000)},
+        }
+    return tweets, users
+
+
+class SyntheticClient:
+    """Stub tweepy client — each distinct query/list gets its own slice of the corpus"""
+
+    SLOTS = 10  # One per search in a scan
+
+    def __init__(self, size, seed=0):
+        tweets, users = synthetic_tweets(size, seed)
+        self.tweets = [tweepy.Tweet(t) for t in tweets]
+        self.users = {uid: tweepy.User(u) for uid, u in users.items()}
+        self.chunk = max(1, -(-size // self.SLOTS))
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def _slice(self, key, count=None):
+        with self._lock:
+            slot = self._slots.setdefault(key, len(self._slots) % self.SLOTS)
+        start = slot * self.chunk
+        data = self.tweets[start:start + (count or self.chunk)]
+        author_ids = {t.author_id for t in data}
+        users = [self.users[str(uid)] for uid in author_ids]
+        return tweepy.Response(data, {"users": users}, [], {"result_count": len(data)})
+
+    def search_recent_tweets(self, query, **kwargs):
+        return self._slice(("search", query, kwargs.get("sort_order")))
+
+    def get_list_tweets(self, id, **kwargs):
+        return self._slice(("list", id))
+
+    def search_all(self, query):
+        """Every tweet in one response (reply-target stage)
+
+        Not a slotted slice: a slot's offset depends on how many distinct
+        queries the scan stage sent first, which would make this stage's
+        workload change whenever the scan's query plan does.
+        """
+        data = self.tweets
+        users = [self.users[str(uid)] for uid in {t.author_id for t in data}]
+        return tweepy.Response(data, {"users": users}, [], {"result_count": len(data)})
+
+
+def tweet_dicts(client, extract_subjects):
+    """The corpus as the scan's tweet dicts, for the aggregation stages"""
+    return [
+        {
+            'id': t.id,
+            'text': t.text,
+            'replies': t.public_metrics['reply_count'],
+            'retweets': t.public_metrics['retweet_count'],
+            'likes': t.public_metrics['like_count'],
+            'subjects': extract_subjects(t.text),
+        }
+        for t in client.tweets
+    ]
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def reference_workload():
+    """Fixed tokenize / count / sort work — the yardstick stage times are divided by"""
+    rng = random.Random(0)
+    texts = [" ".join(rng.sample(WORDS, 6) + rng.sample(PHRASES, 2)) for _ in range(2000)]
+    counts = {}
+    for text in texts:
+        for word in text.lower().split():
+            counts[word] = counts.get(word, 0) + 1
+    return sorted(texts), sorted(counts.items(), key=lambda kv: kv[1])
+
+
+def reference_ms():
+    """Min ms of REFERENCE_RUNS reference workloads"""
+    samples = []
+    for _ in range(REFERENCE_RUNS):
+        start = time.perf_counter()
+        reference_workload()
+        samples.append((time.perf_counter() - start) * 1000)
+    return min(samples)
+
+
+def measure(fn, runs, setup=None):
+    """min/p50/p95 ms over `runs` timed calls + peak traced KiB from one more"""
+    samples = []
+    for _ in range(runs):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "min_ms": round(min(samples), 3),
+        "p50_ms": round(percentile(samples, 0.5), 3),
+        "p95_ms": round(percentile(samples, 0.95), 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def bench_size(app, size, workdir):
+    from scan_history import ScanHistoryLog
+    from velocity_store import VelocityStore
+
+    client = SyntheticClient(size)
+    app.client_twitter = client
+    app.velocity_store = VelocityStore(workdir / f"snapshots-{size}.bin")
+    app.scan_history = ScanHistoryLog(workdir / f"history-{size}.jsonl")
+    runs = 20 if size <= 1000 else 5 if size <= 10000 else 3
+
+    def cold():
+        app.search_cache.clear()
+        app.incremental_store.clear()
+
+    pool = tweet_dicts(client, app.extract_subjects)
+    half = len(pool) // 2
+    results = {}
+
+    results["get_top_debate_tweets"] = measure(app.get_top_debate_tweets, runs, setup=cold)
+    results["get_trending_topics"] = measure(lambda: app.get_trending_topics(pool[:half], pool[half:]), runs)
+    results["save_scan_to_history"] = measure(lambda: app.save_scan_to_history(pool[:half], pool[half:]), runs)
+
+    app.scan_history.clear()
+    scan_pool = pool[:15]
+    for _ in range(max(1, size // 100)):
+        app.save_scan_to_history(scan_pool[:10], scan_pool[10:])
+    results["get_weekly_topic_summary"] = measure(app.get_weekly_topic_summary, runs)
+
+    # Both reply-target searches see the whole corpus
+    app.client_twitter = type("ReplyTargetClient", (), {
+        "search_recent_tweets": lambda self, query, **kwargs: client.search_all(query)
+    })()
+    results["find_reply_targets"] = measure(app.find_reply_targets, runs)
+
+    for stage in results.values():
+        stage["per_sec"] = round(size / (stage["p50_ms"] / 1000)) if stage["p50_ms"] else None
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Lines describing regressions beyond tolerance (empty when clean)
+
+    Times compare as multiples of each run's reference workload.
+    """
+    failures = []
+    ref_now, ref_base = results["_reference_ms"], baseline.get("_reference_ms")
+    for size, stages in results.items():
+        if size.startswith("_"):
+            continue
+        for stage, now in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            if not base:
+                continue
+            if ref_base and base.get("min_ms", 0) >= MIN_COMPARABLE_MS:
+                now_x, base_x = now["min_ms"] / ref_now, base["min_ms"] / ref_base
+                if now_x > base_x * (1 + tolerance):
+                    failures.append(f"{stage} @ {size}: min {now['min_ms']:.1f} ms = {now_x:.2f}x reference "
+                                    f"vs baseline {base['min_ms']:.1f} ms = {base_x:.2f}x")
+            if now["peak_kib"] > base["peak_kib"] * (1 + tolerance) + 64:
+                failures.append(f"{stage} @ {size}: peak {now['peak_kib']:.0f} KiB vs baseline {base['peak_kib']:.0f} KiB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown / growth (0.5 = +50%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="tweet-hunter-bench-"))
+    app = load_app("replay", workdir / "no-fixtures", workdir)
+    app.INCREMENTAL_SEARCH = False
+
+    results = {}
+    reference_before = reference_ms()
+    for size in args.sizes:
+        results[str(size)] = stages = bench_size(app, size, workdir)
+        print(f"\n{size} tweets")
+        for stage, r in stages.items():
+            rate = f"{r['per_sec']:>12,}/s" if r["per_sec"] else " " * 14
+            print(f"  {stage:<26} min {r['min_ms']:9.2f} ms  p50 {r['p50_ms']:9.2f} ms  p95 {r['p95_ms']:9.2f} ms"
+                  f"  {rate}  peak {r['peak_kib']:10.1f} KiB")
+    results["_reference_ms"] = round(min(reference_before, reference_ms()), 3)
+    print(f"\nreference workload: {results['_reference_ms']:.2f} ms")
+
+    if args.update_baseline:
+        baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+        baseline.update(results)
+        baseline["_machine"] = f"{platform.python_implementation()} {platform.python_version()} / {platform.machine()}"
+        BASELINE_FILE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline written to {BASELINE_FILE}")
+        return
+
+    if not BASELINE_FILE.exists():
+        print("\nNo baseline yet — run with --update-baseline")
+        return
+    failures = compare(results, json.loads(BASELINE_FILE.read_text()), args.tolerance)
+    if failures:
+        print(f"\nREGRESSIONS (tolerance +{args.tolerance:.0%}):")
+        for line in failures:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions against baseline (tolerance +{args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: keyword-index subject matcher vs. the old chain of substring scans.
+
+The index matches whole words, so subject sets differ from the legacy
+substring scans wherever a keyword only appeared inside another word
+("ag" in "against", "rest" in "interest"). The count of such tweets is
+reported alongside throughput.
+
+Run from the repo root:  python benchmarks/bench_subjects.py [n_tweets]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from keyword_index import TweetIndex
+from subject_matcher import SUBJECT_KEYWORDS, extract_subjects
+
+
+def legacy_extract_subjects(tweet_text):
+    """The pre-matcher implementation: one any() substring scan per subject"""
+    text_lower = tweet_text.lower()
+    subjects = set()
+    for subject, keywords in SUBJECT_KEYWORDS:
+        if any(kw in text_lower for kw in keywords):
+            subjects.add(subject)
+    if not subjects:
+        if "broncos" in text_lower:
+            subjects.add("General Broncos")
+        elif "nuggets" in text_lower or "jokic" in text_lower:
+            subjects.add("General Nuggets")
+        else:
+            subjects.add("Other")
+    return subjects
+
+
+FILLER = (
+    "the", "game", "tonight", "is", "about", "to", "get", "wild", "honestly",
+    "nobody", "talking", "interest", "against", "phoenix", "during", "ideal",
+    "denver", "mile", "high", "season", "week", "coach", "fans", "line", "take",
+)
+
+
+def synthetic_tweets(n, seed=42):
+    """Random tweet-length strings mixing keywords and filler words"""
+    rng = random.Random(seed)
+    keywords = [kw for _, kws in SUBJECT_KEYWORDS for kw in kws] + ["broncos", "nuggets"]
+    tweets = []
+    for _ in range(n):
+        words = []
+        while sum(len(w) + 1 for w in words) < rng.randint(60, 280):
+            if rng.random() < 0.15:
+                words.append(rng.choice(keywords).title())
+            else:
+                words.append(rng.choice(FILLER))
+        tweets.append(" ".join(words)[:280])
+    return tweets
+
+
+def bench(fn, tweets, rounds=5):
+    """Best-of-N tweets/sec for fn over the corpus"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for t in tweets:
+            fn(t)
+        best = min(best, time.perf_counter() - start)
+    return len(tweets) / best
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    tweets = synthetic_tweets(n)
+
+    changed = sum(1 for t in tweets if extract_subjects(t) != legacy_extract_subjects(t))
+
+    old = bench(legacy_extract_subjects, tweets)
+    # Build a fresh index per call so the cache never hides tokenization cost
+    new = bench(lambda t: extract_subjects(t, TweetIndex(t)), tweets)
+    print(f"{n} synthetic tweets — {changed} with different subjects (word-boundary fixes)")
+    print(f"legacy any() scans : {old:>10,.0f} tweets/sec")
+    print(f"keyword index      : {new:>10,.0f} tweets/sec  ({new / old:.2f}x)")
@@ -0,0 +1,168 @@
+"""Record live API responses once, then replay full scans offline.
+
+    python benchmarks/replay_scan.py record fixtures/ [--scans 1] [--seed 7]
+    python benchmarks/replay_scan.py replay fixtures/ [--scans 1] [--seed 7]
+                                   [--latency-ms 150] [--jitter-ms 50] [--verify]
+                                   [--backend asyncio]
+
+record needs real credentials in .streamlit/secrets.toml. Both modes import
+the app in Streamlit "bare" mode (no server, every button reads False) from a
+scratch directory, so scan history and snapshot files never touch the real
+ones. random is seeded before the first scan (it draws each scan's fresh
+window), and replay also freezes the app's clock at the recording time.
+Record and replay the same number of --scans: repeated calls step through
+the responses recorded for them in order.
+
+Each scan prints a digest of the ranked (id, score) lists, per-stage
+timings and the scan's trace waterfall (one "search: ..." span per source).
+--backend picks the app's SEARCH_BACKEND, so both fan-outs replay the same
+fixtures. --verify replays the whole sequence a second time and checks that
+the digests are identical.
+"""
+import argparse
+import hashlib
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from app_harness import load_app
+
+# Functions wrapped with a timer — looked up as module globals at call time,
+# so the wrappers see every call get_top_debate_tweets makes
+STAGES = [
+    "get_top_debate_tweets",
+    "get_subject_penalty_from_history",
+    "select_diverse",
+    "save_scan_to_history",
+    "get_trending_topics",
+]
+
+
+class StageTimes:
+    """Thread-safe call count / total / max wall time per stage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = defaultdict(int)
+            self.total = defaultdict(float)
+            self.worst = defaultdict(float)
+
+    def wrap(self, name, fn):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.calls[name] += 1
+                    self.total[name] += elapsed
+                    self.worst[name] = max(self.worst[name], elapsed)
+        return timed
+
+    def report(self):
+        lines = []
+        for name in STAGES:
+            if self.calls[name]:
+                lines.append(
+                    f"    {name:<34} {self.calls[name]:>3} call(s)  "
+                    f"{self.total[name] * 1000:9.1f} ms total  {self.worst[name] * 1000:8.1f} ms max"
+                )
+        return "\n".join(lines)
+
+
+def scan_digest(broncos, nuggets):
+    ranked = [(t['id'], t['debate_score']) for t in broncos] + [None] + [(t['id'], t['debate_score']) for t in nuggets]
+    return hashlib.sha1(repr(ranked).encode()).hexdigest()[:12]
+
+
+def run_scans(app, stage_times, scans, seed, workdir, label):
+    """One seeded sequence of cold scans — returns the digests"""
+    from velocity_store import VelocityStore
+
+    random.seed(seed)
+    app.scan_history.clear()
+    app.velocity_store = VelocityStore(workdir / f"snapshots-{label}.bin")
+    if hasattr(app.client_twitter, "rewind"):
+        app.client_twitter.rewind()
+
+    digests = []
+    for i in range(scans):
+        app.search_cache.clear()
+        app.incremental_store.clear()
+        stage_times.reset()
+        broncos, nuggets, stats = app.get_top_debate_tweets()
+        app.save_scan_to_history(broncos, nuggets)
+        app.get_trending_topics(broncos, nuggets)
+        digest = scan_digest(broncos, nuggets)
+        digests.append(digest)
+        print(f"  scan {i + 1}: {len(broncos)} Broncos + {len(nuggets)} Nuggets "
+              f"(raw {stats['total_raw']}, kept {stats['kept']}, fresh window {stats['fresh_window']})  digest {digest}"
+              + ("  [degraded]" if stats.get('degraded') else ""))
+        print(stage_times.report())
+        print("    spans:")
+        print("\n".join(f"      {line}" for line in stats['trace'].waterfall().splitlines()))
+    return digests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("fixture_dir", type=Path)
+    parser.add_argument("--scans", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--verify", action="store_true", help="replay twice and compare digests")
+    parser.add_argument("--backend", choices=["threads", "asyncio"], default="threads")
+    args = parser.parse_args()
+
+    fixture_dir = args.fixture_dir.resolve()
+    if args.mode == "replay" and not fixture_dir.is_dir():
+        parser.error(f"no fixtures at {fixture_dir} — record some first")
+
+    workdir = Path(tempfile.mkdtemp(prefix="tweet-hunter-replay-"))
+    app = load_app(args.mode, fixture_dir, workdir, args.latency_ms)
+    app.SEARCH_BACKEND = args.backend
+
+    stage_times = StageTimes()
+    for name in STAGES:
+        setattr(app, name, stage_times.wrap(name, getattr(app, name)))
+
+    if args.mode == "record":
+        print(f"Recording {args.scans} scan(s) into {fixture_dir}")
+        run_scans(app, stage_times, args.scans, args.seed, workdir, "record")
+        return
+
+    from api_replay import frozen_clock
+    import tweet_window
+
+    replay = app.client_twitter
+    replay.jitter_ms = args.jitter_ms
+    at = replay.recorded_at
+    print(f"Replaying {args.scans} scan(s) from {fixture_dir} at {at.isoformat()} UTC "
+          f"(latency {args.latency_ms:g} ms + jitter {args.jitter_ms:g} ms, {args.backend} backend)")
+
+    with frozen_clock(at, [app, tweet_window]):
+        digests = run_scans(app, stage_times, args.scans, args.seed, workdir, "first")
+        stats = replay.stats()
+        print(f"  replayed {stats['calls']} API calls, {stats['misses']} without a fixture")
+        if args.verify:
+            print("Verify pass")
+            again = run_scans(app, stage_times, args.scans, args.seed, workdir, "second")
+            if again != digests:
+                print("NOT deterministic — digests differ between passes")
+                sys.exit(1)
+            print("Deterministic — both passes ranked identically")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from collections import defaultdict
+
+# ========================================
+# DIVERSITY SELECTOR
+# ========================================
+# Diversity-constrained top-k. Candidates are walked in score order (a stable
+# sort, so ties keep input order), routed to the first team that matches and
+# still has room, and taken if none of their subjects is at the team's cap.
+# Rejects wait in a per-team backup queue; if a team ends up short, its later
+# cap stages relax the cap and walk the backups once more. Membership is
+# tracked by position, never by comparing tweet dicts.
+
+
+class TeamQuota:
+    """One team's slot limit and per-subject cap schedule
+
+    caps is [first_cap, (cap, relax_if_below), ...] — each relaxed stage only
+    runs while the team has fewer than relax_if_below picks.
+    """
+
+    def __init__(self, name, match, limit, caps):
+        self.name = name
+        self.match = match
+        self.limit = limit
+        self.first_cap = caps[0]
+        self.relaxed_caps = list(caps[1:])
+
+
+def select_diverse(candidates, teams, score=lambda c: c['debate_score'], subjects=lambda c: c['subjects']):
+    """Pick per-team lists from scored candidates — returns one list per team, in team order"""
+    picks = {team.name: [] for team in teams}
+    counts = {team.name: defaultdict(int) for team in teams}
+    backups = {team.name: [] for team in teams}
+
+    def fits(team, cand, cap):
+        team_counts = counts[team.name]
+        return all(team_counts[s] < cap for s in subjects(cand))
+
+    def take(team, cand):
+        picks[team.name].append(cand)
+        for s in subjects(cand):
+            counts[team.name][s] += 1
+
+    open_teams = len(teams)
+    for cand in sorted(candidates, key=score, reverse=True):
+        if not open_teams:
+            break
+        for team in teams:
+            if len(picks[team.name]) < team.limit and team.match(cand):
+                if fits(team, cand, team.first_cap):
+                    take(team, cand)
+                    if len(picks[team.name]) == team.limit:
+                        open_teams -= 1
+                else:
+                    backups[team.name].append(cand)
+                break
+
+    # Relaxed stages — each backup is visited at most once per stage
+    for team in teams:
+        pending = backups[team.name]
+        for cap, relax_if_below in team.relaxed_caps:
+            if len(picks[team.name]) >= relax_if_below or not pending:
+                continue
+            remaining = []
+            for pos, cand in enumerate(pending):
+                if len(picks[team.name]) >= team.limit:
+                    remaining.extend(pending[pos:])
+                    break
+                if fits(team, cand, cap):
+                    take(team, cand)
+                else:
+                    remaining.append(cand)
+            pending = remaining
+
+    return [picks[team.name] for team in teams]
@@ -0,0 +1,80 @@
+from keyword_index import compile_keywords
+
+# ========================================
+# FILTER KEYWORDS
+# ========================================
+# Search keywords and every classifier keyword list, compiled once per server
+# process. Living in a module (instead of the Streamlit script) means reruns
+# reuse the compiled sets rather than rebuilding them on every click.
+
+# Search keywords
+BRONCOS_KEYWORDS = [
+    "Denver Broncos",        # Most specific - prioritize this
+    "#Broncos",
+    "#BroncosCountry",
+    "Broncos NFL",           # Add NFL context
+    "Bo Nix",
+    "Surtain",
+    "Sean Payton"
+]
+
+NUGGETS_KEYWORDS = [
+    "#Nuggets", "Nuggets", "Denver Nuggets", "Jokic"
+]
+
+# Extra terms a debate-mode search requires (any of them)
+DEBATE_QUERY_TERMS = [
+    "fire", "trade", "overrated", "bust", "sucks", "trash", "worst",
+    "choke", "flop", "out", "hot take", "debate", "controversial",
+    "payton out", "nix sucks", "jokic flop", "worst trade", "mistake",
+    "regret", "washed", "benched", "russ cooked"
+]
+
+# Compiled keyword sets — matched on whole words via the tweet's keyword index
+BRONCOS_TEAM_KWS = compile_keywords(BRONCOS_KEYWORDS)
+NUGGETS_TEAM_KWS = compile_keywords(NUGGETS_KEYWORDS)
+
+PRIORITY_BO_NIX_KWS = compile_keywords(["bo nix", "nix", "bo mix"])
+PRIORITY_PAYTON_KWS = compile_keywords(["sean payton", "payton"])
+PRIORITY_NUGGETS_KWS = compile_keywords(["jokic", "nuggets"])
+
+CONTROVERSY_KWS = compile_keywords([
+    "fire", "trade", "overrated", "bust", "sucks", "trash", "worst",
+    "choke", "flop", "out", "hot take", "debate", "controversial",
+    "payton out", "nix sucks", "jokic flop", "worst trade", "mistake",
+    "regret", "washed", "benched", "russ cooked", "payton system",
+    "draft mistake", "playoff miss", "murray inconsistent", "title window",
+    "mpj contract", "no fly zone"
+])
+
+RUGBY_KWS = compile_keywords([
+    "rugby", "nrl", "brisbane", "queensland", "super league",
+    "world club challenge", "red hill", "suncorp stadium",
+    "reece walsh", "adam reynolds", "broncos rugby", "league"
+])
+BRONCOS_MENTION_KWS = compile_keywords(["broncos"])
+NFL_CONTEXT_KWS = compile_keywords([
+    "denver", "nfl", "super bowl", "afc", "bo nix",
+    "sean payton", "surtain", "mile high", "empower field",
+    "football", "quarterback", "qb", "touchdown"
+])
+
+NUGGETS_MENTION_KWS = compile_keywords(["nuggets", "#nuggets"])
+NUGGETS_HASHTAG_KWS = compile_keywords(["#nuggets"])
+NBA_CONTEXT_KWS = compile_keywords([
+    "denver", "nba", "jokic", "joker", "murray", "aaron gordon",
+    "michael porter", "mpj", "malone", "coach", "playoff", "playoffs",
+    "championship", "western conference", "ball arena", "altitude",
+    "basketball", "game", "season", "roster", "draft", "trade",
+    "free agent", "mvp", "all-star", "starting lineup", "bench",
+    "points", "assists", "rebounds", "triple double", "load management"
+])
+NUGGETS_SPAM_KWS = compile_keywords([
+    "chicken", "eating", "food", "recipe", "cook", "fry", "fried",
+    "mcdonalds", "burger", "sauce", "meal", "nugget meal",
+    "trading", "traders", "forex", "crypto", "stock", "candle",
+    "chart", "profit", "motivation", "daily motivation",
+    "ford", "ev", "electric vehicle", "pickup", "truck", "platform",
+    "gold nugget", "nuggets of wisdom", "information nuggets",
+    "dog", "cat", "pet", "puppy", "pidgey", "bird"
+])
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# ========================================
+# GENERATION CACHE
+# ========================================
+# Claude outputs (rewrites, threads, show prep, podcast ideas, reply
+# suggestions) stored on disk, one JSON file per entry, named by a hash of
+# (kind, prompt template version, model, inputs). The same tweet asked for
+# from another session, a later scan or after a restart is served from disk.
+# Bumping a template's version orphans its old entries. Entries are evicted
+# least-recently-used once the directory is over max_bytes; a hit touches
+# the file's mtime, so the LRU order survives restarts. Errors are never cached.
+
+
+def generation_key(kind, version, model, *inputs):
+    """Content address for one generation — hex digest of everything that shapes the output"""
+    canonical = json.dumps([kind, version, model, *inputs], sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class GenerationCache:
+    """Size-bounded LRU of generated outputs on local disk, shared by every session"""
+
+    def __init__(self, directory, max_bytes=50 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._sizes = OrderedDict()  # key -> file size, least recently used first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> lock, so concurrent misses for one key generate once
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def _load(self):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entries = [(p.stat().st_mtime, p.stem, p.stat().st_size) for p in self.directory.glob("*.json")]
+        except Exception as e:
+            print(f"Generation cache read error: {e}")
+            return
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._bytes += size
+        with self._lock:
+            self._evict()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._sizes
+
+    def get(self, key):
+        """Cached value or None"""
+        path = self._path(key)
+        try:
+            value = json.loads(path.read_text())["value"]
+            os.utime(path)
+        except Exception:
+            with self._lock:
+                self.misses += 1
+                self._bytes -= self._sizes.pop(key, 0)  # Evicted by another process
+            return None
+        with self._lock:
+            self.hits += 1
+            if key in self._sizes:
+                self._sizes.move_to_end(key)
+        return value
+
+    def put(self, key, kind, value):
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps({"kind": kind, "created_at": time.time(), "value": value}))
+            tmp.replace(path)
+            size = path.stat().st_size
+        except Exception as e:
+            print(f"Generation cache write error: {e}")
+            return
+        with self._lock:
+            self._bytes += size - self._sizes.pop(key, 0)
+            self._sizes[key] = size
+            self._evict()
+
+    def _evict(self):
+        # Caller holds the lock
+        while self._bytes > self.max_bytes and len(self._sizes) > 1:
+            key, size = self._sizes.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Generation cache evict error: {e}")
+
+    def get_or_generate(self, key, kind, generate):
+        """Cached value, or generate() and store it — generate() raising stores nothing"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            inflight = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with inflight:
+                # Another session may have finished the same generation while we waited
+                value = self.get(key) if key in self._sizes else None
+                if value is None:
+                    value = generate()
+                    if value is not None:
+                        self.put(key, kind, value)
+                return value
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is inflight:
+                    del self._inflight[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._sizes),
+                "bytes": self._bytes,
+            }
@@ -0,0 +1,145 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ========================================
+# GENERATION JOBS
+# ========================================
+# Claude calls started from a button run on a small in-process worker pool
+# instead of inside the script run, so the page stays usable and several can
+# be in flight at once. Jobs are registered under (session, tweet id, kind):
+# a second click on the same card joins the running job, and a new scan
+# cancels the jobs for tweets it dropped. A job's on_field callback keeps the
+# streamed fields seen so far (shown while it runs) and is also where a
+# cancelled job stops — its next streamed field raises JobCancelled. A job's
+# on_done hook fires when it finishes (the app uses it to wake the page), and
+# finished jobs nobody collected — their browser session closed — are purged
+# after ttl_seconds.
+
+
+class JobCancelled(Exception):
+    """Raised inside a cancelled job's stream to stop generating"""
+
+
+class GenerationJob:
+    """One queued / running generation — partial fields so far, then the result"""
+
+    __slots__ = ("key", "future", "partial", "finished_at", "_cancelled", "_on_done")
+
+    def __init__(self, key, on_done=None):
+        self.key = key  # (session, tweet id, kind)
+        self.future = None
+        self.partial = {}  # Streamed field -> value, filled in by the worker
+        self.finished_at = None  # time.monotonic() once the future is done
+        self._cancelled = threading.Event()
+        self._on_done = on_done
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()  # Only stops it if it hasn't started yet
+
+    def on_field(self, key, value):
+        if self._cancelled.is_set():
+            raise JobCancelled(f"{self.key[2]} for {self.key[1]} cancelled")
+        self.partial[key] = value
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def _finish(self, future):
+        self.finished_at = time.monotonic()
+        if self._on_done is not None and not self.cancelled:
+            try:
+                self._on_done()
+            except Exception as e:
+                print(f"Generation job on_done error ({self.key[2]}): {e}")
+
+
+class GenerationJobs:
+    """Worker pool + registry of generation jobs keyed by (session, tweet id, kind)"""
+
+    def __init__(self, max_workers=4, ttl_seconds=600):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generation")
+        self.ttl_seconds = ttl_seconds
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.deduplicated = 0
+        self.cancelled = 0
+        self.expired = 0
+
+    def submit(self, session, tweet_id, kind, fn, *args, on_done=None):
+        """Queue fn(*args, on_field=job.on_field), or join the same job if it's still in flight -> job
+
+        on_done() is called from the worker once the job finishes (not if it was cancelled).
+        """
+        key = (session, tweet_id, kind)
+        with self._lock:
+            self._purge()
+            job = self._jobs.get(key)
+            if job is not None and not job.done():
+                self.deduplicated += 1
+                return job
+            job = GenerationJob(key, on_done)
+            job.future = self._executor.submit(fn, *args, on_field=job.on_field)
+            job.future.add_done_callback(job._finish)
+            self._jobs[key] = job
+            self.submitted += 1
+        return job
+
+    def _purge(self):
+        # Caller holds the lock. Finished jobs no session came back for (tab closed).
+        cutoff = time.monotonic() - self.ttl_seconds
+        stale = [key for key, job in self._jobs.items() if job.finished_at is not None and job.finished_at < cutoff]
+        for key in stale:
+            del self._jobs[key]
+        self.expired += len(stale)
+
+    def get(self, session, tweet_id, kind):
+        with self._lock:
+            return self._jobs.get((session, tweet_id, kind))
+
+    def finished(self, session):
+        """Take the session's completed jobs off the registry -> [(tweet id, kind, result)]"""
+        with self._lock:
+            keys = [key for key, job in self._jobs.items() if key[0] == session and job.done()]
+            jobs = [self._jobs.pop(key) for key in keys]
+        results = []
+        for job in jobs:
+            if job.cancelled:
+                continue
+            try:
+                results.append((job.key[1], job.key[2], job.future.result()))
+            except Exception as e:
+                print(f"Generation job error ({job.key[2]}): {e}")
+        return results
+
+    def cancel(self, session, keep=(), kinds=None):
+        """Cancel the session's jobs (of `kinds`, default all) for tweets not in `keep` -> how many were cancelled"""
+        keep = set(keep)
+        with self._lock:
+            keys = [
+                key for key in self._jobs
+                if key[0] == session and key[1] not in keep and (kinds is None or key[2] in kinds)
+            ]
+            jobs = [self._jobs.pop(key) for key in keys]
+            self.cancelled += len(jobs)
+        for job in jobs:
+            job.cancel()
+        return len(jobs)
+
+    def stats(self):
+        with self._lock:
+            self._purge()
+            return {
+                "in_flight": sum(1 for job in self._jobs.values() if not job.done()),
+                "submitted": self.submitted,
+                "deduplicated": self.deduplicated,
+                "cancelled": self.cancelled,
+                "expired": self.expired,
+            }
@@ -0,0 +1,107 @@
+import math
+import threading
+from datetime import datetime
+
+# ========================================
+# INSIDER ROTATION
+# ========================================
+# Insider accounts are packed into as few `from:a OR from:b ...` queries as
+# the search query length limit allows (first-fit by decreasing length, so
+# the packing is deterministic). When a scan may only send max_queries of
+# them, the packs are walked round-robin, so every account is queried within
+# ceil(packs / max_queries) scans. Each account's newest seen tweet ID is
+# remembered, and a packed query asks for tweets after the oldest of its
+# accounts' IDs — no account in the pack can be skipped by since_id.
+
+QUERY_LIMIT = 512  # Recent search query length on the Basic / Pro tiers
+QUERY_TEMPLATE = "({}) -is:retweet lang:en"
+
+TWITTER_EPOCH_MS = 1288834974657
+
+
+def insider_query(accounts):
+    return QUERY_TEMPLATE.format(" OR ".join(f"from:{acct}" for acct in accounts))
+
+
+def snowflake_time(tweet_id):
+    """When a tweet ID was issued (naive UTC) — IDs embed their creation time"""
+    return datetime.utcfromtimestamp(((int(tweet_id) >> 22) + TWITTER_EPOCH_MS) / 1000)
+
+
+def pack_accounts(accounts, limit=QUERY_LIMIT):
+    """Accounts -> tuples whose insider_query fits in `limit` chars, fewest packs first-fit"""
+    packs = []
+    for acct in sorted(dict.fromkeys(accounts), key=lambda a: (-len(a), a.lower())):
+        for i, pack in enumerate(packs):
+            if len(insider_query(pack + (acct,))) <= limit:
+                packs[i] = pack + (acct,)
+                break
+        else:
+            packs.append((acct,))  # An account too long for any query still gets its own
+    return [tuple(sorted(pack, key=str.lower)) for pack in packs]
+
+
+class InsiderRotation:
+    """Packed insider queries, round-robin when capped, per-account last-seen tweet IDs"""
+
+    def __init__(self, accounts, query_limit=QUERY_LIMIT, max_queries=None):
+        self.accounts = list(accounts)
+        self.packs = pack_accounts(self.accounts, query_limit)
+        self.max_queries = min(max_queries or len(self.packs), len(self.packs))
+        self._cursor = 0
+        self._last_seen = {}  # account (lowercase) -> newest tweet ID seen
+        self._lock = threading.Lock()
+
+    @property
+    def scans_for_full_coverage(self):
+        return math.ceil(len(self.packs) / self.max_queries) if self.packs else 0
+
+    def plan(self):
+        """Advance one scan -> (packs to query now, packs served from their held window)"""
+        with self._lock:
+            due = [self.packs[(self._cursor + i) % len(self.packs)] for i in range(self.max_queries)]
+            self._cursor = (self._cursor + self.max_queries) % max(len(self.packs), 1)
+        return due, [pack for pack in self.packs if pack not in due]
+
+    def since_id(self, pack, start_time):
+        """Oldest last-seen ID across the pack, or None when any account is unknown / out of the window"""
+        with self._lock:
+            seen = [self._last_seen.get(acct.lower()) for acct in pack]
+        if not seen or None in seen:
+            return None
+        oldest = min(seen)
+        return oldest if snowflake_time(oldest) >= start_time else None
+
+    def observe(self, pack, response):
+        """Record each account's newest tweet from a packed query's response
+
+        When the response wasn't cut short (no next_token), accounts with no
+        tweets in it are known to have nothing newer than its newest_id either.
+        """
+        data = getattr(response, "data", None) or []
+        includes = getattr(response, "includes", None) or {}
+        meta = getattr(response, "meta", None) or {}
+        usernames = {str(u.id): u.username.lower() for u in includes.get("users", [])}
+        newest = {}
+        for tweet in data:
+            acct = usernames.get(str(tweet.author_id))
+            if acct is not None:
+                newest[acct] = max(newest.get(acct, 0), int(tweet.id))
+        if meta.get("newest_id") and not meta.get("next_token"):
+            for acct in pack:
+                newest.setdefault(acct.lower(), int(meta["newest_id"]))
+        with self._lock:
+            for acct, tweet_id in newest.items():
+                if tweet_id > self._last_seen.get(acct, 0):
+                    self._last_seen[acct] = tweet_id
+
+    def stats(self):
+        with self._lock:
+            known = sum(1 for acct in self.accounts if acct.lower() in self._last_seen)
+        return {
+            "accounts": len(self.accounts),
+            "packs": len(self.packs),
+            "per_scan": self.max_queries,
+            "scans_for_full_coverage": self.scans_for_full_coverage,
+            "last_seen_known": known,
+        }
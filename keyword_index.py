@@ -0,0 +1,128 @@
+import re
+from functools import lru_cache
+
+# ========================================
+# KEYWORD INDEX
+# ========================================
+# One tokenization pass per tweet. The tweet is lowercased once, split into
+# word tokens and expanded into a set of word n-grams; every filter and
+# scorer then asks the index instead of re-scanning the raw string.
+#
+# Matching is on whole words, so "out" no longer fires on "about", "ag" on
+# "against", "nix" on "phoenix" or "rest" on "interest". Punctuation inside
+# a keyword is treated as a word break, which lets "a.j. brown" match
+# "A.J. Brown" and "bo-nix" match "Bo-Nix". Hashtags index both ways:
+# "#Nuggets" satisfies "#nuggets" and "nuggets".
+#
+# The old substring scans also caught inflections ("trade" in "trades",
+# "fire" in "fired", "injury" never in "injuries" though). compile_keywords
+# adds the regular inflected forms of a keyword's last word (-s, -es, -ed,
+# -ing, y -> -ies, doubled final consonant) so those keep matching. Words
+# under MIN_INFLECT_LETTERS are left alone — "ag" must not match "aging".
+
+MAX_PHRASE_TOKENS = 4
+MIN_INFLECT_LETTERS = 4
+
+_TOKEN_RE = re.compile(r"([#@]?)([^\W_]+)")
+
+# First word of every multi-word keyword -> longest phrase starting with it.
+# Filled in by compile_keywords so tweets only build the n-grams that can match.
+# Only ever changed through _extend_phrase_heads, which drops cached indexes.
+_PHRASE_HEADS = {}
+
+
+def _tokens(text_lower):
+    """Split lowercased text into (words, hashtags)"""
+    words = []
+    hashtags = []
+    for prefix, word in _TOKEN_RE.findall(text_lower):
+        words.append(word)
+        if prefix == "#":
+            hashtags.append("#" + word)
+    return words, hashtags
+
+
+def _inflections(word):
+    """Regular inflected forms of a word (over-generating is harmless — they're only looked up)"""
+    if len(word) < MIN_INFLECT_LETTERS or not word.isalpha():
+        return set()
+    forms = {word + "s", word + "es", word + "ed", word + "ing"}
+    if word.endswith("e"):
+        forms |= {word + "d", word[:-1] + "ing"}
+    if word.endswith("y"):
+        forms |= {word[:-1] + "ies", word[:-1] + "ied"}
+    if word[-1] not in "aeiouwxy" and word[-2] in "aeiou" and word[-3] not in "aeiou":
+        forms |= {word + word[-1] + "ed", word + word[-1] + "ing"}
+    return forms
+
+
+def _extend_phrase_heads(heads):
+    """Merge phrase heads into the index and drop every cached TweetIndex
+
+    Tweets indexed before a longer phrase was compiled lack its n-grams, so
+    the index_tweet cache is cleared on every change, never patched up.
+    """
+    changed = {word: n for word, n in heads.items() if n > _PHRASE_HEADS.get(word, 0)}
+    if changed:
+        _PHRASE_HEADS.update(changed)
+        index_tweet.cache_clear()
+
+
+def compile_keywords(keywords, inflect=True):
+    """Normalize a keyword list into a frozenset of token tuples for fast lookup
+
+    inflect=False matches the exact words only, like the search API
+    (which doesn't stem).
+    """
+    compiled = set()
+    heads = {}
+    for kw in keywords:
+        kw_lower = kw.lower().strip()
+        if kw_lower.startswith("#"):
+            compiled.add((kw_lower,))
+            continue
+        words, _ = _tokens(kw_lower)
+        if not words:
+            continue
+        if len(words) > MAX_PHRASE_TOKENS:
+            raise ValueError(f"Keyword too long for index ({MAX_PHRASE_TOKENS} words max): {kw!r}")
+        compiled.add(tuple(words))
+        if inflect:
+            compiled.update(tuple(words[:-1]) + (form,) for form in _inflections(words[-1]))
+        if len(words) > 1:
+            heads[words[0]] = max(heads.get(words[0], 0), len(words))
+    _extend_phrase_heads(heads)
+    return frozenset(compiled)
+
+
+class TweetIndex:
+    """Token/phrase index for a single tweet"""
+
+    __slots__ = ("text_lower", "ngrams")
+
+    def __init__(self, text):
+        self.text_lower = text.lower()
+        words, hashtags = _tokens(self.text_lower)
+
+        ngrams = {(word,) for word in words}
+        ngrams.update((tag,) for tag in hashtags)
+        for i, word in enumerate(words):
+            longest = _PHRASE_HEADS.get(word)
+            if longest:
+                for n in range(2, longest + 1):
+                    ngrams.add(tuple(words[i:i + n]))
+        self.ngrams = ngrams
+
+    def has_any(self, compiled):
+        """True if any compiled keyword appears in the tweet"""
+        return not self.ngrams.isdisjoint(compiled)
+
+    def matches(self, compiled):
+        """The compiled keywords that appear in the tweet"""
+        return self.ngrams & compiled
+
+
+@lru_cache(maxsize=4096)
+def index_tweet(text):
+    """Build (or reuse) the index for a tweet's text"""
+    return TweetIndex(text)
@@ -0,0 +1,192 @@
+import inspect
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlparse
+
+# ========================================
+# RATE-LIMIT BUDGETS
+# ========================================
+# Instead of letting tweepy sleep until the window resets (wait_on_rate_limit),
+# we read x-rate-limit-remaining / -reset off every response and hand out the
+# remaining requests per endpoint by priority. Core searches may spend the
+# last few requests; low-value sources (fresh, insider, lists) are refused
+# once the budget drops under their reserve, and a refused or 429'd call
+# raises at once, so a scan finishes with partial results instead of hanging.
+# Listeners added with subscribe() hear about every refused / 429'd call on
+# the thread (or task) that made it — the scan trace books them to its span.
+
+PRIORITY_CORE = 0
+PRIORITY_FRESH = 1
+PRIORITY_INSIDER = 2
+PRIORITY_LIST = 3
+
+# A call at this priority only goes out while more than N requests remain
+DEFAULT_RESERVES = {
+    PRIORITY_CORE: 0,
+    PRIORITY_FRESH: 4,
+    PRIORITY_INSIDER: 8,
+    PRIORITY_LIST: 8,
+}
+
+# tweepy.Client method -> endpoint key (matches _endpoint_key of the URL path)
+CLIENT_ENDPOINTS = {
+    "search_recent_tweets": "/2/tweets/search/recent",
+    "get_list_tweets": "/2/lists/:id/tweets",
+    "get_users_tweets": "/2/users/:id/tweets",
+    "get_tweets": "/2/tweets",
+    "get_tweet": "/2/tweets/:id",
+    "get_user": "/2/users/by/username/:username",
+}
+
+MAX_EVENTS = 1000  # Older refusal events are dropped (only per-scan slices are read)
+
+_ID_SEGMENT = re.compile(r"/\d{3,}(?=/|$)")  # Tweet/user/list IDs, not the /2 version prefix
+
+
+def _endpoint_key(url):
+    path = urlparse(url).path
+    path = re.sub(r"/users/by/username/[^/]+", "/users/by/username/:username", path)
+    return _ID_SEGMENT.sub("/:id", path)
+
+
+class RateBudgetExceeded(Exception):
+    """Call refused locally — the endpoint's remaining budget is reserved for higher priorities"""
+
+
+class RateLimitTracker:
+    """Per-endpoint remaining/reset from response headers + priority-based admission"""
+
+    def __init__(self, reserves=None):
+        self.reserves = dict(DEFAULT_RESERVES if reserves is None else reserves)
+        self._limits = {}   # endpoint -> {"limit", "remaining", "reset"}
+        self._events = []   # (source, endpoint, reason) for refused / 429'd calls
+        self._events_dropped = 0
+        self._listeners = []  # fn(source, endpoint, reason), called with the lock held
+        self._lock = threading.Lock()
+        self._context = ContextVar("rate_limit_context", default=None)
+
+    # --- Context: which source / priority the current thread or task is fetching for ---
+
+    @contextmanager
+    def context(self, source, priority):
+        token = self._context.set((source, priority))
+        try:
+            yield
+        finally:
+            self._context.reset(token)
+
+    def with_context(self, source, priority, fn):
+        """fn wrapped to run under context(source, priority) — for executor.submit"""
+        def scoped(*args, **kwargs):
+            with self.context(source, priority):
+                return fn(*args, **kwargs)
+        return scoped
+
+    def _current(self):
+        return self._context.get() or (None, PRIORITY_CORE)
+
+    def subscribe(self, listener):
+        """Call listener(source, endpoint, reason) for every refused / 429'd call (once per listener)"""
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    # --- Header bookkeeping (requests response hook / aiohttp trace) ---
+
+    def observe(self, response, *args, **kwargs):
+        self.record_headers(response.url, response.status_code, response.headers)
+        return response
+
+    def record_headers(self, url, status, headers):
+        endpoint = _endpoint_key(url)
+        with self._lock:
+            if "x-rate-limit-remaining" in headers:
+                self._limits[endpoint] = {
+                    "limit": int(headers.get("x-rate-limit-limit", 0)),
+                    "remaining": int(headers["x-rate-limit-remaining"]),
+                    "reset": int(headers.get("x-rate-limit-reset", 0)),
+                }
+            if status == 429:
+                state = self._limits.setdefault(endpoint, {"limit": 0, "remaining": 0, "reset": 0})
+                state["remaining"] = 0
+                self._record(self._current()[0], endpoint, "429")
+
+    # --- Admission ---
+
+    def acquire(self, endpoint):
+        """Spend one request from the endpoint's budget or raise RateBudgetExceeded"""
+        source, priority = self._current()
+        reserve = self.reserves.get(priority, 0)
+        with self._lock:
+            state = self._limits.get(endpoint)
+            if state is None or state["reset"] <= time.time():
+                return  # Unknown or already reset — the next response refreshes it
+            if state["remaining"] <= reserve:
+                self._record(source, endpoint, "budget" if state["remaining"] else "exhausted")
+                raise RateBudgetExceeded(
+                    f"{endpoint}: {state['remaining']} requests left until "
+                    f"{time.strftime('%H:%M:%S', time.localtime(state['reset']))} (reserve {reserve})"
+                )
+            state["remaining"] -= 1
+
+    def _record(self, source, endpoint, reason):
+        # Caller holds the lock
+        self._events.append((source, endpoint, reason))
+        if len(self._events) > MAX_EVENTS:
+            drop = len(self._events) - MAX_EVENTS // 2
+            del self._events[:drop]
+            self._events_dropped += drop
+        for listener in self._listeners:
+            try:
+                listener(source, endpoint, reason)
+            except Exception as e:
+                print(f"Rate limit listener error: {e}")
+
+    def event_count(self):
+        with self._lock:
+            return self._events_dropped + len(self._events)
+
+    def events_since(self, count):
+        """Refused / 429'd calls after an event_count() checkpoint"""
+        with self._lock:
+            start = max(count - self._events_dropped, 0)
+            return [
+                {"source": source, "endpoint": endpoint, "reason": reason}
+                for source, endpoint, reason in self._events[start:]
+            ]
+
+    def snapshot(self):
+        """Known budgets: endpoint -> {limit, remaining, reset} (resets already passed are dropped)"""
+        now = time.time()
+        with self._lock:
+            return {ep: dict(state) for ep, state in self._limits.items() if state["reset"] > now}
+
+
+class BudgetedClient:
+    """tweepy.Client / AsyncClient wrapper that asks the tracker before every API call"""
+
+    def __init__(self, client, tracker):
+        self._client = client
+        self._tracker = tracker
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        endpoint = CLIENT_ENDPOINTS.get(name)
+        if endpoint is None:
+            return attr
+
+        if inspect.iscoroutinefunction(attr):
+            async def budgeted_async(*args, **kwargs):
+                self._tracker.acquire(endpoint)
+                return await attr(*args, **kwargs)
+
+            return budgeted_async
+
+        def budgeted(*args, **kwargs):
+            self._tracker.acquire(endpoint)
+            return attr(*args, **kwargs)
+
+        return budgeted
@@ -0,0 +1,34 @@
+import time
+
+# ========================================
+# RERUN TIMER
+# ========================================
+# Checkpoint-style timing for one Streamlit script run. Call mark() at the end
+# of each phase; the elapsed time since the previous mark is booked to it.
+
+
+class RerunTimer:
+    """Collects (phase, seconds) checkpoints for a single script run"""
+
+    def __init__(self, started_at=None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self._last = self.started_at
+        self.phases = []
+
+    def mark(self, phase):
+        """Close the current phase under the given name"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    @property
+    def total(self):
+        return self._last - self.started_at
+
+    def report(self):
+        """Phases as rows for display: phase, ms, share of the run"""
+        total = self.total or 1e-9
+        return [
+            {"phase": phase, "ms": round(secs * 1000, 1), "share": f"{secs / total:.0%}"}
+            for phase, secs in self.phases
+        ]
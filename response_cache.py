@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+# ========================================
+# RESPONSE CACHE
+# ========================================
+# Small thread-safe TTL + LRU cache for raw Twitter search responses. Keys are
+# built by the search functions from the logical query, sort order, list id and
+# the window's length (not its start time), so back-to-back scans within the
+# TTL reuse the same responses instead of spending read quota — the TTL alone
+# decides when a response is too old.
+
+
+def window_minutes(start_time):
+    """Length of a "since start_time" window in whole minutes (stable cache key for time windows)"""
+    now = datetime.now(start_time.tzinfo) if start_time.tzinfo else datetime.utcnow()
+    return round((now - start_time).total_seconds() / 60)
+
+
+def normalize_query(query):
+    """Case/whitespace-insensitive form of a search query for cache keys"""
+    return " ".join(query.lower().split())
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after ttl_seconds"""
+
+    def __init__(self, ttl_seconds=600, max_entries=64):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Cached value or None (expired entries count as a miss)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if time.monotonic() - stored_at <= self.ttl_seconds:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+            }
+
+    @staticmethod
+    def stats_delta(before, after):
+        """Per-scan counts from two stats() snapshots (size is reported as-is)"""
+        delta = {k: after[k] - before[k] for k in ("hits", "misses", "evictions")}
+        delta["size"] = after["size"]
+        return delta
@@ -0,0 +1,477 @@
+import bisect
+import json
+import sqlite3
+import sys
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# ========================================
+# SCAN HISTORY LOG
+# ========================================
+# Scan history as an append-only JSON-lines log plus a small sidecar index of
+# "timestamp<TAB>start<TAB>end" byte ranges, one line per scan. Appending a
+# scan is O(1); "last N scans" / "last N days" bisect the index and parse only
+# the lines they need. Entries past the retention window are dropped by an
+# occasional compaction rewrite.
+#
+# SqliteScanHistory is an optional drop-in backend with the same interface
+# whose rollups run as indexed SQL queries instead of Python loops.
+
+
+def summarize_topics(history):
+    """Aggregate scan entries into topic rankings (weekly rollup)"""
+    weekly_agg = defaultdict(lambda: {
+        "appearances": 0,  # How many scans this topic showed up in
+        "total_tweets": 0,
+        "total_replies": 0,
+        "total_retweets": 0,
+        "total_likes": 0,
+        "total_engagement": 0,
+        "sample_tweets": []
+    })
+
+    for scan in history:
+        for subject, data in scan.get("topics", {}).items():
+            wa = weekly_agg[subject]
+            wa["appearances"] += 1
+            wa["total_tweets"] += data.get("tweet_count", 0)
+            wa["total_replies"] += data.get("total_replies", 0)
+            wa["total_retweets"] += data.get("total_retweets", 0)
+            wa["total_likes"] += data.get("total_likes", 0)
+            wa["total_engagement"] += (
+                data.get("total_replies", 0) +
+                data.get("total_retweets", 0) +
+                data.get("total_likes", 0)
+            )
+            for st_text in data.get("sample_tweets", []):
+                if len(wa["sample_tweets"]) < 4:
+                    wa["sample_tweets"].append(st_text)
+
+    return sorted(
+        [{"subject": k, **v} for k, v in weekly_agg.items()],
+        key=lambda x: x["total_engagement"],
+        reverse=True
+    )
+
+
+def count_subject_appearances(history):
+    """subject -> number of scans it appeared in"""
+    appearances = defaultdict(int)
+    for entry in history:
+        for subject in entry.get("topics", {}):
+            appearances[subject] += 1
+    return dict(appearances)
+
+
+class ScanHistoryLog:
+    """Append-only scan history with time-range seeks"""
+
+    def __init__(self, path, retention_days=30, legacy_json=None):
+        self.path = Path(path)
+        self.index_path = self.path.with_suffix(self.path.suffix + ".idx")
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._index = None  # [(timestamp, start, end)], oldest first
+        if legacy_json is not None:
+            self._migrate_legacy(Path(legacy_json))
+
+    # ---------- index ----------
+
+    def _log_size(self):
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _load_index(self):
+        """Current index — cached, re-read or rebuilt if the log moved underneath it"""
+        size = self._log_size()
+        if self._index is not None and (self._index[-1][2] if self._index else 0) == size:
+            return self._index
+
+        index = []
+        try:
+            for line in self.index_path.read_text().splitlines():
+                ts, start, end = line.split("\t")
+                index.append((ts, int(start), int(end)))
+        except (FileNotFoundError, ValueError):
+            index = None
+
+        if index is None or (index[-1][2] if index else 0) != size:
+            index = self._rebuild_index()
+        self._index = index
+        return index
+
+    def _rebuild_index(self):
+        """Rescan the log to recover a missing or torn index"""
+        index = []
+        if self.path.exists():
+            offset = 0
+            with self.path.open("rb") as f:
+                for raw in f:
+                    end = offset + len(raw)
+                    try:
+                        ts = json.loads(raw).get("timestamp", "")
+                        index.append((ts, offset, end))
+                    except ValueError:
+                        pass  # Torn/partial line — skipped but its bytes still count
+                    offset = end
+            if index and index[-1][2] != offset:
+                # Trailing garbage after the last good line: extend its range so sizes match
+                ts, start, _ = index[-1]
+                index[-1] = (ts, start, offset)
+        self._write_index(index)
+        return index
+
+    def _write_index(self, index):
+        try:
+            self.index_path.write_text("".join(f"{ts}\t{start}\t{end}\n" for ts, start, end in index))
+        except Exception as e:
+            print(f"Failed to write scan history index: {e}")
+
+    # ---------- reads ----------
+
+    def _read_from(self, start):
+        """Parse every entry from byte offset start to the end of the log"""
+        if not self.path.exists():
+            return []
+        with self.path.open("rb") as f:
+            f.seek(start)
+            chunk = f.read()
+        entries = []
+        for raw in chunk.splitlines():
+            try:
+                entries.append(json.loads(raw))
+            except ValueError:
+                continue
+        return entries
+
+    def last(self, n):
+        """The most recent n scans, oldest first"""
+        with self._lock:
+            index = self._load_index()
+            if not index or n <= 0:
+                return []
+            return self._read_from(index[max(len(index) - n, 0)][1])
+
+    def since(self, days):
+        """Scans from the last N days, oldest first"""
+        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        with self._lock:
+            index = self._load_index()
+            pos = bisect.bisect_left([ts for ts, _, _ in index], cutoff)
+            if pos >= len(index):
+                return []
+            return self._read_from(index[pos][1])
+
+    def count(self):
+        with self._lock:
+            return len(self._load_index())
+
+    def topic_summary(self, days=7):
+        """(topic rankings, scan count) over the last N days"""
+        history = self.since(days)
+        return summarize_topics(history), len(history)
+
+    def subject_appearances(self, last_n=3):
+        """subject -> appearances across the last N scans"""
+        return count_subject_appearances(self.last(last_n))
+
+    # ---------- writes ----------
+
+    def append(self, entry):
+        """Append one scan entry — O(1), no read of earlier history"""
+        line = (json.dumps(entry, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            index = self._load_index()
+            start = index[-1][2] if index else 0
+            with self.path.open("ab") as f:
+                f.write(line)
+            ts = entry.get("timestamp", "")
+            index.append((ts, start, start + len(line)))
+            with self.index_path.open("a") as f:
+                f.write(f"{ts}\t{start}\t{start + len(line)}\n")
+            self._compact_if_stale(index)
+
+    def _compact_if_stale(self, index):
+        # Compact once the oldest entry is a full day past retention
+        if not index:
+            return
+        stale_before = (datetime.utcnow() - timedelta(days=self.retention_days + 1)).isoformat()
+        if index[0][0] >= stale_before:
+            return
+        cutoff = (datetime.utcnow() - timedelta(days=self.retention_days)).isoformat()
+        pos = bisect.bisect_left([ts for ts, _, _ in index], cutoff)
+        with self.path.open("rb") as f:
+            f.seek(index[pos][1] if pos < len(index) else index[-1][2])
+            kept = f.read()
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_bytes(kept)
+        tmp.replace(self.path)
+        shift = index[pos][1] if pos < len(index) else 0
+        self._index = [(ts, start - shift, end - shift) for ts, start, end in index[pos:]]
+        self._write_index(self._index)
+
+    def clear(self):
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+            self.index_path.unlink(missing_ok=True)
+            self._index = None
+
+    def _migrate_legacy(self, legacy_path):
+        """One-time conversion of the old pretty-printed scan_history.json"""
+        if self.path.exists() or not legacy_path.exists():
+            return
+        try:
+            entries = json.loads(legacy_path.read_text())
+            with self.path.open("w") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, default=str) + "\n")
+            legacy_path.rename(legacy_path.with_suffix(legacy_path.suffix + ".migrated"))
+            self._rebuild_index()
+        except Exception as e:
+            print(f"Scan history migration error: {e}")
+
+
+# ========================================
+# SQLITE BACKEND (optional)
+# ========================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    broncos_count INTEGER NOT NULL DEFAULT 0,
+    nuggets_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_scans_timestamp ON scans(timestamp);
+
+CREATE TABLE IF NOT EXISTS scan_topics (
+    scan_id INTEGER NOT NULL REFERENCES scans(id),
+    subject TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    tweet_count INTEGER NOT NULL DEFAULT 0,
+    total_replies INTEGER NOT NULL DEFAULT 0,
+    total_retweets INTEGER NOT NULL DEFAULT 0,
+    total_likes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scan_id, subject)
+);
+CREATE INDEX IF NOT EXISTS idx_scan_topics_subject ON scan_topics(subject, scan_id);
+
+CREATE TABLE IF NOT EXISTS sample_tweets (
+    scan_id INTEGER NOT NULL REFERENCES scans(id),
+    subject TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (scan_id, subject, position)
+);
+"""
+
+# Weekly rollup in one query. Ties keep first-seen order like the Python
+# version; sample tweets are the first 4 per subject in scan order.
+_TOPIC_SUMMARY_SQL = """
+WITH recent AS (
+    SELECT id FROM scans WHERE timestamp >= ?
+)
+SELECT t.subject,
+       COUNT(*) AS appearances,
+       SUM(t.tweet_count),
+       SUM(t.total_replies),
+       SUM(t.total_retweets),
+       SUM(t.total_likes),
+       SUM(t.total_replies + t.total_retweets + t.total_likes) AS total_engagement,
+       MIN(t.scan_id * 100000 + t.position) AS first_seen
+FROM scan_topics t JOIN recent r ON r.id = t.scan_id
+GROUP BY t.subject
+ORDER BY total_engagement DESC, first_seen
+"""
+
+_TOPIC_SAMPLES_SQL = """
+SELECT subject, text FROM (
+    SELECT s.subject, s.text,
+           ROW_NUMBER() OVER (PARTITION BY s.subject ORDER BY s.scan_id, s.position) AS rn
+    FROM sample_tweets s JOIN scans sc ON sc.id = s.scan_id
+    WHERE sc.timestamp >= ?
+)
+WHERE rn <= 4
+ORDER BY subject, rn
+"""
+
+
+class SqliteScanHistory:
+    """Scan history in normalized SQLite tables — same interface as ScanHistoryLog"""
+
+    def __init__(self, path, retention_days=30, migrate_from=()):
+        self.path = Path(path)
+        self.retention_days = retention_days
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        if self.count() == 0:
+            for source in migrate_from:
+                if Path(source).exists() and migrate_to_sqlite(source, self) > 0:
+                    break
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call — safe across Streamlit threads.
+        # sqlite3's own context manager only commits / rolls back, so close it here.
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _insert(self, conn, entry):
+        cur = conn.execute(
+            "INSERT INTO scans (timestamp, broncos_count, nuggets_count) VALUES (?, ?, ?)",
+            (entry.get("timestamp", ""), entry.get("broncos_count", 0), entry.get("nuggets_count", 0))
+        )
+        scan_id = cur.lastrowid
+        for position, (subject, data) in enumerate(entry.get("topics", {}).items()):
+            conn.execute(
+                "INSERT INTO scan_topics (scan_id, subject, position, tweet_count, total_replies, total_retweets, total_likes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (scan_id, subject, position, data.get("tweet_count", 0), data.get("total_replies", 0),
+                 data.get("total_retweets", 0), data.get("total_likes", 0))
+            )
+            conn.executemany(
+                "INSERT INTO sample_tweets (scan_id, subject, position, text) VALUES (?, ?, ?, ?)",
+                [(scan_id, subject, i, text) for i, text in enumerate(data.get("sample_tweets", []))]
+            )
+
+    def append(self, entry):
+        cutoff = (datetime.utcnow() - timedelta(days=self.retention_days)).isoformat()
+        with self._connect() as conn:
+            self._insert(conn, entry)
+            stale = "SELECT id FROM scans WHERE timestamp < ?"
+            conn.execute(f"DELETE FROM sample_tweets WHERE scan_id IN ({stale})", (cutoff,))
+            conn.execute(f"DELETE FROM scan_topics WHERE scan_id IN ({stale})", (cutoff,))
+            conn.execute("DELETE FROM scans WHERE timestamp < ?", (cutoff,))
+
+    def import_entries(self, entries):
+        """Bulk insert (used by the migrator) — returns rows imported"""
+        count = 0
+        with self._connect() as conn:
+            for entry in entries:
+                self._insert(conn, entry)
+                count += 1
+        return count
+
+    def _entries(self, where, params):
+        """Rebuild scan entry dicts (oldest first) for scans matching a WHERE clause"""
+        with self._connect() as conn:
+            conn.execute("BEGIN")  # One read snapshot for the three queries below
+            scans = conn.execute(
+                f"SELECT id, timestamp, broncos_count, nuggets_count FROM scans WHERE {where} ORDER BY timestamp",
+                params
+            ).fetchall()
+            if not scans:
+                return []
+            # Child rows join back to the same WHERE — no per-id placeholders
+            picked = f"WITH picked AS (SELECT id FROM scans WHERE {where}) "
+            topics = conn.execute(
+                picked + "SELECT t.scan_id, t.subject, t.tweet_count, t.total_replies, t.total_retweets, t.total_likes "
+                "FROM scan_topics t JOIN picked p ON p.id = t.scan_id ORDER BY t.scan_id, t.position", params
+            ).fetchall()
+            samples = conn.execute(
+                picked + "SELECT s.scan_id, s.subject, s.text FROM sample_tweets s JOIN picked p ON p.id = s.scan_id "
+                "ORDER BY s.scan_id, s.subject, s.position", params
+            ).fetchall()
+
+        by_scan = {
+            sid: {"timestamp": ts, "broncos_count": b, "nuggets_count": n, "topics": {}}
+            for sid, ts, b, n in scans
+        }
+        for sid, subject, tc, tr, trt, tl in topics:
+            by_scan[sid]["topics"][subject] = {
+                "tweet_count": tc, "total_replies": tr, "total_retweets": trt, "total_likes": tl, "sample_tweets": []
+            }
+        for sid, subject, text in samples:
+            by_scan[sid]["topics"][subject]["sample_tweets"].append(text)
+        return [by_scan[row[0]] for row in scans]
+
+    def last(self, n):
+        if n <= 0:
+            return []
+        return self._entries("id IN (SELECT id FROM scans ORDER BY timestamp DESC LIMIT ?)", (n,))
+
+    def since(self, days):
+        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        return self._entries("timestamp >= ?", (cutoff,))
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM scans").fetchone()[0]
+
+    def topic_summary(self, days=7):
+        """(topic rankings, scan count) over the last N days — computed in SQL"""
+        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        with self._connect() as conn:
+            scan_count = conn.execute("SELECT COUNT(*) FROM scans WHERE timestamp >= ?", (cutoff,)).fetchone()[0]
+            rows = conn.execute(_TOPIC_SUMMARY_SQL, (cutoff,)).fetchall()
+            samples = defaultdict(list)
+            for subject, text in conn.execute(_TOPIC_SAMPLES_SQL, (cutoff,)):
+                samples[subject].append(text)
+        topics = [
+            {
+                "subject": subject,
+                "appearances": appearances,
+                "total_tweets": tweets,
+                "total_replies": replies,
+                "total_retweets": retweets,
+                "total_likes": likes,
+                "total_engagement": engagement,
+                "sample_tweets": samples.get(subject, []),
+            }
+            for subject, appearances, tweets, replies, retweets, likes, engagement, _ in rows
+        ]
+        return topics, scan_count
+
+    def subject_appearances(self, last_n=3):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT subject, COUNT(*) FROM scan_topics "
+                "WHERE scan_id IN (SELECT id FROM scans ORDER BY timestamp DESC LIMIT ?) GROUP BY subject",
+                (last_n,)
+            ).fetchall()
+        return dict(rows)
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sample_tweets")
+            conn.execute("DELETE FROM scan_topics")
+            conn.execute("DELETE FROM scans")
+
+
+def migrate_to_sqlite(source, db):
+    """One-shot import of scan_history.json (array) or scan_history.jsonl into SQLite
+
+    db is a SqliteScanHistory or a path. Returns the number of scans imported.
+    """
+    source = Path(source)
+    if not isinstance(db, SqliteScanHistory):
+        db = SqliteScanHistory(db)
+    try:
+        text = source.read_text()
+        if source.suffix == ".json":
+            entries = json.loads(text)
+        else:
+            entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    except Exception as e:
+        print(f"Scan history migration error: {e}")
+        return 0
+    entries.sort(key=lambda e: e.get("timestamp", ""))
+    return db.import_entries(entries)
+
+
+if __name__ == "__main__":
+    # python scan_history.py scan_history.json scan_history.db
+    if len(sys.argv) != 3:
+        print("usage: python scan_history.py <scan_history.json|.jsonl> <scan_history.db>")
+        sys.exit(2)
+    imported = migrate_to_sqlite(sys.argv[1], sys.argv[2])
+    print(f"Imported {imported} scans into {sys.argv[2]}")
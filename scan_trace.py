@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+
+# ========================================
+# SCAN TRACE
+# ========================================
+# Lightweight spans for one scan. span() times a block (searches run one per
+# worker thread, so their spans overlap). Spans stay at source / stage level —
+# per-tweet work is summed into span attributes (e.g. tweets kept), never
+# timed one tweet at a time. Calls the rate-limit tracker refuses or that come
+# back 429 are booked (via book_rate_limit_event) to whichever span is open on
+# that thread (or asyncio task), so a thin search shows up as rate-limited,
+# not as our code.
+
+_open_span = ContextVar("open_span", default=None)  # Innermost open span dict per thread / task
+
+
+def book_rate_limit_event(source, endpoint, reason):
+    """RateLimitTracker listener — adds a refused / 429'd call to the open span"""
+    span = _open_span.get()
+    if span is not None:
+        span.setdefault("rate_limited", []).append(reason)
+
+
+class _Span:
+    __slots__ = ("_trace", "_span", "_token")
+
+    def __init__(self, trace, span):
+        self._trace = trace
+        self._span = span
+
+    def __enter__(self):
+        self._span["start"] = time.perf_counter()
+        self._token = _open_span.set(self._span)
+        return self._span
+
+    def __exit__(self, *exc):
+        self._span["end"] = time.perf_counter()
+        _open_span.reset(self._token)
+        with self._trace._lock:
+            self._trace._spans.append(self._span)
+        return False
+
+
+class ScanTrace:
+    """Spans for one scan, relative to when the trace was created"""
+
+    def __init__(self, name="scan"):
+        self.name = name
+        self.started_at = time.perf_counter()
+        self.wall_start = datetime.utcnow()
+        self._spans = []
+        self._lock = threading.Lock()
+
+    def span(self, name, **attrs):
+        """Context manager timing one block; yields the span dict for extra attrs"""
+        return _Span(self, {"name": name, "thread": threading.current_thread().name, **attrs})
+
+    def wrap(self, name, fn):
+        """fn wrapped in a span — for executor.submit"""
+        def traced(*args, **kwargs):
+            with self.span(name):
+                return fn(*args, **kwargs)
+        return traced
+
+    @property
+    def total(self):
+        with self._lock:
+            ends = [s["end"] for s in self._spans]
+        return (max(ends) if ends else time.perf_counter()) - self.started_at
+
+    def report(self):
+        """Rows for display: spans in start order"""
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: s["start"])
+        rows = []
+        for s in spans:
+            row = {
+                "span": s["name"],
+                "start_ms": round((s["start"] - self.started_at) * 1000, 1),
+                "ms": round((s["end"] - s["start"]) * 1000, 1),
+                "thread": s["thread"],
+            }
+            row.update({k: v for k, v in s.items() if k not in ("name", "start", "end", "thread")})
+            rows.append(row)
+        return rows
+
+    def waterfall(self, width=40):
+        """Monospace waterfall of the spans"""
+        rows = self.report()
+        total_ms = max((r["start_ms"] + r["ms"] for r in rows), default=0) or 1
+        label_width = max((len(r["span"]) for r in rows), default=10)
+        lines = []
+        for r in rows:
+            offset = int(r["start_ms"] / total_ms * width)
+            length = max(1, int(r["ms"] / total_ms * width))
+            bar = (" " * offset + "█" * length)[:width]
+            limited = f"  (rate-limited: {', '.join(r['rate_limited'])})" if r.get("rate_limited") else ""
+            lines.append(f"{r['span']:<{label_width}}  {bar:<{width}}  {r['ms']:>9.1f} ms{limited}")
+        return "\n".join(lines)
+
+    def export(self, path, **meta):
+        """Append one JSON line per span to a local trace file"""
+        scan = {"trace": self.name, "scan_at": self.wall_start.isoformat(), **meta}
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                for row in self.report():
+                    f.write(json.dumps({**scan, **row}, default=str) + "\n")
+        except Exception as e:
+            print(f"Trace export error: {e}")
@@ -0,0 +1,105 @@
+from datetime import datetime
+
+# ========================================
+# SCORING ENGINE
+# ========================================
+# Ranking score for one candidate from plain features (counts, priority,
+# controversy flag, age, velocity, penalty units), split into named
+# components so a tweet can be re-scored with fresh metrics while keeping the
+# parts it was ranked with. Every knob lives in a ScoringWeights object.
+
+UNKNOWN_AGE_HOURS = 999  # Tweets without created_at never get a freshness bonus
+
+COMPONENTS = ("replies", "retweets", "likes", "priority", "controversy", "freshness", "velocity", "penalty")
+
+
+class ScoringWeights:
+    """Every knob in the ranking score — pass overrides as keyword arguments"""
+
+    def __init__(
+        self,
+        reply=75000,                      # Debate king
+        retweet=1200,                     # Viral spread
+        like=8,                           # Minor factor
+        controversy=250000,               # Controversial language bonus
+        freshness=((6, 100000), (12, 50000)),  # (younger than N hours, bonus), tightest first
+        velocity_rph=40000,               # Per measured reply/hour
+        velocity_accel=10000,             # Per reply/hour gained (or lost) per hour...
+        velocity_max_accel=30,            # ...counting at most this many either way
+        young_hours=8,                    # No snapshots yet: boost tweets younger than this...
+        young_min_replies=3,              # ...with more replies than this...
+        young_reply=20000,                # ...by this much per reply
+        subject_penalty=50000,            # Per cross-scan penalty unit
+    ):
+        self.reply = reply
+        self.retweet = retweet
+        self.like = like
+        self.controversy = controversy
+        self.freshness = tuple(sorted(freshness))
+        self.velocity_rph = velocity_rph
+        self.velocity_accel = velocity_accel
+        self.velocity_max_accel = velocity_max_accel
+        self.young_hours = young_hours
+        self.young_min_replies = young_min_replies
+        self.young_reply = young_reply
+        self.subject_penalty = subject_penalty
+
+    def replace(self, **changes):
+        """Copy with some weights changed"""
+        values = dict(vars(self))
+        values.update(changes)
+        return ScoringWeights(**values)
+
+
+DEFAULT_WEIGHTS = ScoringWeights()
+
+
+def age_hours(created_at, now=None):
+    """Tweet age in hours, or UNKNOWN_AGE_HOURS when created_at is missing/unusable"""
+    if not created_at:
+        return UNKNOWN_AGE_HOURS
+    try:
+        now = now or datetime.utcnow()
+        return (now - created_at.replace(tzinfo=None)).total_seconds() / 3600
+    except Exception:
+        return UNKNOWN_AGE_HOURS
+
+
+def score_parts(metrics, priority, controversial, age_hours, velocity=None, penalty_units=0, weights=None):
+    """Per-component scores for one tweet (sum them for the total)
+
+    velocity is (replies_per_hour, acceleration) or None when the tweet has
+    no snapshot history; penalty_units is the summed cross-scan penalty of its
+    subjects.
+    """
+    w = weights or DEFAULT_WEIGHTS
+
+    freshness = 0
+    for hours, bonus in w.freshness:
+        if age_hours < hours:
+            freshness = bonus
+            break
+
+    # Measured momentum when we have snapshots (stalled tweets sink),
+    # otherwise the single-snapshot boost for young tweets. Acceleration is a
+    # difference of two short-interval rates, so one noisy interval can swing
+    # it by hundreds — it's clamped so it can't outweigh the rest of the score.
+    if velocity is not None:
+        replies_per_hour, acceleration = velocity
+        acceleration = max(-w.velocity_max_accel, min(acceleration, w.velocity_max_accel))
+        velocity_part = int(replies_per_hour * w.velocity_rph + acceleration * w.velocity_accel)
+    elif age_hours < w.young_hours and metrics['reply_count'] > w.young_min_replies:
+        velocity_part = metrics['reply_count'] * w.young_reply
+    else:
+        velocity_part = 0
+
+    return {
+        "replies": metrics['reply_count'] * w.reply,
+        "retweets": metrics['retweet_count'] * w.retweet,
+        "likes": metrics['like_count'] * w.like,
+        "priority": priority,
+        "controversy": w.controversy if controversial else 0,
+        "freshness": freshness,
+        "velocity": velocity_part,
+        "penalty": -penalty_units * w.subject_penalty,
+    }
@@ -0,0 +1,182 @@
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+
+# ========================================
+# SEARCH FAN-OUT
+# ========================================
+# A search is described once as a SearchCall: response-cache key, the
+# tweepy.Client method to call, a params builder (only run on a cache miss,
+# so since_id / the insider sample are read at fetch time) and result / error
+# handlers that fold the response into the incremental window. The same call
+# then runs either on a thread pool over the sync client (ThreadFanout) or as
+# tasks on the async transport's long-lived loop over tweepy's AsyncClient
+# (AsyncFanout). Both yield (name, value) as each call finishes and drop
+# calls past their deadline.
+# Only results are cached: an error handler's fallback (e.g. the held window)
+# is returned for this scan but the next one tries the API again. A call that
+# went over the wire notes when its response landed and which tweet IDs it
+# carried; a cache hit or an error leaves both unset.
+
+
+class SearchCall:
+    """One cached API read — see run_call / run_call_async"""
+
+    __slots__ = ("cache_key", "method", "build_params", "on_result", "on_error", "fetched_at", "fetched_ids")
+
+    def __init__(self, cache_key, method, build_params, on_result=None, on_error=None):
+        self.cache_key = cache_key  # None = never cached
+        self.method = method
+        self.build_params = build_params
+        self.on_result = on_result
+        self.on_error = on_error
+        self.fetched_at = None  # time.time() the response landed
+        self.fetched_ids = frozenset()  # IDs of the tweets it carried
+
+    def fetched(self, response):
+        """Note a response that came over the wire"""
+        self.fetched_at = time.time()
+        self.fetched_ids = frozenset(tweet.id for tweet in (getattr(response, "data", None) or ()))
+
+    def result(self, response):
+        return self.on_result(response) if self.on_result else response
+
+    def error(self, e):
+        return self.on_error(e) if self.on_error else None
+
+
+def run_call(call, client, cache):
+    """Serve a SearchCall from the cache or the sync client"""
+    if call.cache_key is not None:
+        value = cache.get(call.cache_key)
+        if value is not None:
+            return value
+    try:
+        response = getattr(client, call.method)(**call.build_params())
+    except Exception as e:
+        return call.error(e)  # A fallback, not a response — never cached
+    call.fetched(response)
+    value = call.result(response)
+    if value is not None and call.cache_key is not None:
+        cache.put(call.cache_key, value)
+    return value
+
+
+async def run_call_async(call, client, cache):
+    """run_call for an async client (same cache, same handlers)"""
+    if call.cache_key is not None:
+        value = cache.get(call.cache_key)
+        if value is not None:
+            return value
+    try:
+        response = await getattr(client, call.method)(**call.build_params())
+    except Exception as e:
+        return call.error(e)  # A fallback, not a response — never cached
+    call.fetched(response)
+    value = call.result(response)
+    if value is not None and call.cache_key is not None:
+        cache.put(call.cache_key, value)
+    return value
+
+
+class ThreadFanout:
+    """SearchCalls on a thread pool over the sync client
+
+    Calls past their deadline keep running in the background, so their
+    responses still land in the cache for the next scan.
+    """
+
+    backend = "threads"
+
+    def __init__(self, client, cache, max_workers):
+        self.client = client
+        self.cache = cache
+        self.max_workers = max_workers
+        self.pending = []
+        self.timed_out = []
+
+    def completed(self, calls, deadlines=None, scope=None):
+        """Yield (name, value) as calls finish; names past deadlines[name] seconds go to timed_out"""
+        scope = scope or (lambda name: nullcontext())
+        deadlines = deadlines or {}
+
+        def run(name, call):
+            with scope(name):
+                return run_call(call, self.client, self.cache)
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(calls)) or 1)
+        start = time.perf_counter()
+        pending = {executor.submit(run, name, call): name for name, call in calls.items()}
+        due = {f: start + deadlines.get(name, float("inf")) for f, name in pending.items()}
+        try:
+            while pending:
+                timeout = min(due[f] for f in pending) - time.perf_counter()
+                done, _ = wait(pending, timeout=max(0, timeout) if timeout != float("inf") else None,
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    self.pending = sorted(pending.values())
+                    yield name, future.result()
+                for future in [f for f in pending if due[f] <= time.perf_counter()]:
+                    self.timed_out.append(pending.pop(future))
+                self.pending = sorted(pending.values())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AsyncFanout:
+    """SearchCalls as tasks on the transport's event loop, at most `concurrency` in flight
+
+    The loop (and the AsyncClient session on it) lives as long as the
+    transport, on its own thread, so requests keep receiving while the
+    caller works on a finished source and keep-alive connections carry over
+    from scan to scan. Calls past their deadline are cancelled.
+    """
+
+    backend = "asyncio"
+
+    def __init__(self, transport, cache, concurrency):
+        self.transport = transport
+        self.cache = cache
+        self.concurrency = concurrency
+        self.pending = []
+        self.timed_out = []
+
+    def completed(self, calls, deadlines=None, scope=None):
+        """Yield (name, value) as calls finish; names past deadlines[name] seconds go to timed_out"""
+        scope = scope or (lambda name: nullcontext())
+        deadlines = deadlines or {}
+        slots = asyncio.Semaphore(self.concurrency)  # Binds to the transport's loop on first use
+
+        async def run(name, call):
+            client = await self.transport.connect()
+            async with slots:
+                with scope(name):
+                    return await run_call_async(call, client, self.cache)
+
+        start = time.perf_counter()
+        pending = {self.transport.loop.submit(run(name, call)): name for name, call in calls.items()}
+        due = {f: start + deadlines.get(name, float("inf")) for f, name in pending.items()}
+        try:
+            while pending:
+                timeout = min(due[f] for f in pending) - time.perf_counter()
+                done, _ = wait(pending, timeout=max(0, timeout) if timeout != float("inf") else None,
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    self.pending = sorted(pending.values())
+                    yield name, future.result()
+                for future in [f for f in pending if due[f] <= time.perf_counter()]:
+                    future.cancel()
+                    self.timed_out.append(pending.pop(future))
+                self.pending = sorted(pending.values())
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def gather_calls(fanout, calls, scope=None):
+    """Run every call to completion -> {name: value} in the calls' order"""
+    results = dict(fanout.completed(calls, scope=scope))
+    return {name: results.get(name) for name in calls}
@@ -0,0 +1,80 @@
+import json
+
+# ========================================
+# STREAMING JSON FIELDS
+# ========================================
+# Claude's generations are one JSON object ({"Default": ..., "Reply": ...}) or
+# array (thread tweets, show-prep segments). While the response streams in,
+# JsonFieldStream scans each chunk once, tracking string / escape state and
+# nesting depth, and hands back every top-level member as soon as its closing
+# comma or bracket arrives — a rewrite style, thread tweet or segment can be
+# shown long before the whole answer is done. Anything before the opening
+# bracket (```json fences, stray prose) is skipped.
+
+
+class JsonFieldStream:
+    """Feed text chunks; get (key or index, value) for each top-level member as it completes"""
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._kind = None  # "{" or "[" once the top-level value opens
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._start = 0  # Where the current member (or its value, after ':') starts
+        self._key = None
+        self._index = 0
+
+    def feed(self, chunk):
+        self.text += chunk
+        fields = []
+        text = self.text
+        for pos in range(self._pos, len(text)):
+            ch = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if self._depth == 0:
+                if self._kind is None and ch in "{[":
+                    self._kind = ch
+                    self._depth = 1
+                    self._start = pos + 1
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(pos, fields)
+            elif self._depth == 1:
+                if ch == ",":
+                    self._emit(pos, fields)
+                    self._start = pos + 1
+                elif ch == ":" and self._kind == "{":
+                    self._key = self._load(self._start, pos)
+                    self._start = pos + 1
+        self._pos = len(text)
+        return fields
+
+    def _load(self, start, end):
+        try:
+            return json.loads(self.text[start:end])
+        except ValueError:
+            return None  # Malformed member — the final parse of the full text decides
+
+    def _emit(self, end, fields):
+        if not self.text[self._start:end].strip():
+            return  # Empty container / trailing comma
+        value = self._load(self._start, end)
+        name = self._key if self._kind == "{" else self._index
+        self._index += 1
+        if name is not None and value is not None:
+            fields.append((name, value))
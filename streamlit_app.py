@@ -1,15 +1,48 @@
 import streamlit as st
-import tweepy
 from anthropic import Anthropic
 from datetime import datetime, timedelta
-import os
 import json
+import os
 from pathlib import Path
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote_plus
 import html as html_lib
 import random
+import time
+import uuid
+from contextlib import contextmanager
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.runtime import Runtime
+from streamlit.runtime.app_session import AppSessionState
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from api_replay import AsyncReplayTransport, OfflineAnthropic, RecordingClient, ReplayClient, ReplayTransport
+from app_styles import APP_CSS
+from diversity import TeamQuota, select_diverse
+from generation_cache import GenerationCache, generation_key
+from generation_jobs import GenerationJobs
+from persona_prompt import TokenUsage, system_blocks, task_message
+from filter_keywords import (
+    BRONCOS_KEYWORDS, NUGGETS_KEYWORDS, DEBATE_QUERY_TERMS, BRONCOS_TEAM_KWS, NUGGETS_TEAM_KWS,
+    PRIORITY_BO_NIX_KWS, PRIORITY_PAYTON_KWS, PRIORITY_NUGGETS_KWS, CONTROVERSY_KWS,
+    RUGBY_KWS, BRONCOS_MENTION_KWS, NFL_CONTEXT_KWS,
+    NUGGETS_MENTION_KWS, NUGGETS_HASHTAG_KWS, NBA_CONTEXT_KWS, NUGGETS_SPAM_KWS,
+)
+from insider_rotation import InsiderRotation, insider_query
+from keyword_index import index_tweet
+from rate_limits import PRIORITY_CORE, PRIORITY_FRESH, PRIORITY_INSIDER, PRIORITY_LIST
+from rerun_timer import RerunTimer
+from scan_history import ScanHistoryLog, SqliteScanHistory
+from scan_trace import ScanTrace, book_rate_limit_event
+from scoring_engine import ScoringWeights, age_hours, score_parts
+from stream_json import JsonFieldStream
+from search_fanout import AsyncFanout, SearchCall, ThreadFanout, gather_calls, run_call
+from response_cache import TTLCache, normalize_query, window_minutes
+from subject_matcher import extract_subjects
+from tweet_window import IncrementalSearchStore, SearchResult
+from twitter_transport import AsyncTwitterTransport, TwitterTransport
+from velocity_store import VelocityStore
 
 # ========================================
 # PRODUCTION MODE
@@ -17,8 +50,54 @@ import random
 TESTING_MODE = False
 MAX_TWEETS = 100
 HOURS_BACK = 36
-SCAN_HISTORY_FILE = Path("scan_history.json")
+SEARCH_FANOUT = 10  # Parallel searches per scan — also sizes the HTTP connection pool
+SEARCH_QUERY_LIMIT = 512  # X API recent search query length limit (Basic / Pro)
+INSIDER_MAX_QUERIES = None  # Packed insider queries per scan; None = every pack (full coverage each scan)
+SEARCH_BACKEND = "threads"  # "threads" (thread pool) or "asyncio" (one event loop — needs tweepy[async])
+ASYNC_SEARCH_CONCURRENCY = 20  # Max requests in flight on the asyncio backend
+RATE_LIMIT_RESERVES = None  # {priority: requests kept back for higher priorities}; None = rate_limits defaults
+PROVISIONAL_TOP_N = 5  # Tweets per team shown while late sources are still arriving
+SEARCH_DEADLINES = {  # Seconds from scan start before a still-running source is left out
+    PRIORITY_CORE: 20,
+    PRIORITY_FRESH: 10,
+    PRIORITY_INSIDER: 8,
+    PRIORITY_LIST: 8,
+}
+RESPONSE_CACHE_TTL_MINUTES = 10    # Reuse raw search responses this long
+RESPONSE_CACHE_MAX_ENTRIES = 64
+INCREMENTAL_SEARCH = True  # Rescans only fetch tweets newer than the last scan (since_id)
+INCREMENTAL_REFETCH_MINUTES = 30  # Held windows are re-pulled in full this often so their metrics don't freeze
+SCAN_HISTORY_FILE = Path("scan_history.jsonl")  # Append-only log (+ .idx sidecar)
+LEGACY_SCAN_HISTORY_FILE = Path("scan_history.json")  # Migrated on first run
+SCAN_HISTORY_RETENTION_DAYS = 30
+SCAN_HISTORY_BACKEND = "jsonl"  # "jsonl" (append-only log) or "sqlite" (indexed SQL rollups)
+SCAN_HISTORY_DB = Path("scan_history.db")
+VELOCITY_STORE_FILE = Path("tweet_snapshots.bin")  # Engagement snapshots for reply velocity
+SNAPSHOT_RETENTION_DAYS = 3
+API_MODE = os.environ.get("TWEET_HUNTER_API_MODE", "live")  # "live", "record" (save fixtures) or "replay" (offline)
+API_FIXTURE_DIR = Path(os.environ.get("TWEET_HUNTER_FIXTURES", "fixtures"))
+REPLAY_LATENCY_MS = float(os.environ.get("TWEET_HUNTER_REPLAY_LATENCY_MS", "0"))  # Injected per replayed call
+SCAN_TRACE_EXPORT = False  # Append every scan's span timings to SCAN_TRACE_FILE
+SCAN_TRACE_FILE = Path("scan_traces.jsonl")
+SCORING_WEIGHTS = ScoringWeights()  # Ranking weights — e.g. ScoringWeights(reply=90000, controversy=150000)
 TYLER_USERNAME = "tyler_polumbus"  # For tweet performance tracker
+GENERATION_MODEL = "claude-sonnet-4-5-20250929"
+REWRITE_BATCH_SIZE = 5  # Tweets per batched rewrite call
+REWRITE_BATCH_TOKENS_PER_TWEET = 600  # max_tokens per tweet in a batch (a cut-off batch is split and retried)
+PREGENERATE_REWRITES = False  # Default for the "pre-generate every card" switch
+GENERATION_WORKERS = 4  # Background Claude calls in flight at once (buttons queue jobs instead of blocking the page)
+GENERATION_JOB_TTL_MINUTES = 10  # Finished jobs never picked up (tab closed) are dropped after this long
+JOB_WAKE_RETRY_SECONDS = 1  # A finished job waits this long between checks while its page is mid-run (e.g. scanning)
+STREAM_GENERATION = True  # Stream Claude's answers and show each rewrite / tweet / segment as it completes
+GENERATION_CACHE_DIR = Path("generation_cache")  # Claude outputs shared across sessions + restarts
+GENERATION_CACHE_MAX_MB = 50
+PROMPT_VERSIONS = {  # Bump a kind's version when its prompt or parsing changes — old outputs stop matching
+    "rewrites": 2,
+    "thread": 2,
+    "show_prep": 2,
+    "podcast_ideas": 2,
+    "reply_suggestion": 2,
+}
 
 # High-signal accounts — beat writers, official, fan accounts with real engagement
 INSIDER_ACCOUNTS = [
@@ -44,102 +123,115 @@ TWITTER_LISTS = [
 ]
 # ========================================
 
-st.set_page_config(page_title="Tweet Hunter", layout="wide", initial_sidebar_state="collapsed")
+rerun_timer = RerunTimer()
 
-st.markdown("""
-<style>
-    .main { background-color: #000000; color: #e7e9ea; }
-    .stButton>button { 
-        background-color: #1d9bf0; 
-        color: white; 
-        border-radius: 20px;
-        border: none;
-        font-weight: bold;
-        padding: 12px 24px;
-        font-size: 16px;
-    }
-    .stButton>button[kind="secondary"] {
-        background-color: #2f3336;
-        border: 1px solid #536471;
-    }
-    .stTextArea>div>div>textarea {
-        background-color: #16181c;
-        color: #e7e9ea;
-        border: 1px solid #2f3336;
-        border-radius: 8px;
-    }
-    div[data-testid="stVerticalBlock"] > div.tweet-card {
-        background-color: #16181c;
-        border: 1px solid #2f3336;
-        border-radius: 16px;
-        padding: 16px;
-        margin: 12px 0;
-    }
-    div[data-testid="stVerticalBlock"] > div.top-pick {
-        background-color: #1a2332;
-        border: 2px solid #1d9bf0;
-        box-shadow: 0 0 20px rgba(29, 155, 240, 0.3);
-        border-radius: 16px;
-        padding: 16px;
-        margin: 12px 0;
-    }
-    .metric-high { color: #f91880; font-weight: bold; }
-    .debate-badge {
-        background-color: #ff4500;
-        color: white;
-        padding: 4px 10px;
-        border-radius: 12px;
-        font-size: 11px;
-        font-weight: bold;
-        margin-left: 8px;
-    }
-    .subject-badge {
-        background-color: #2f3336;
-        color: #8899a6;
-        padding: 3px 8px;
-        border-radius: 10px;
-        font-size: 10px;
-        font-weight: bold;
-        margin-left: 6px;
-    }
-    .rewrite-preview {
-        background-color: #1c1f23;
-        border-left: 3px solid #1d9bf0;
-        padding: 12px;
-        margin: 8px 0;
-        border-radius: 8px;
-        font-size: 14px;
-    }
-    .priority-badge {
-        display: inline-block;
-        padding: 4px 12px;
-        border-radius: 12px;
-        font-size: 12px;
-        font-weight: bold;
-        margin-right: 8px;
-    }
-    .top-pick-badge {
-        background-color: #1d9bf0;
-        color: white;
-        padding: 6px 14px;
-        border-radius: 20px;
-        font-size: 13px;
-        font-weight: bold;
-        margin-bottom: 8px;
-        display: inline-block;
-    }
-    .bo-nix { background-color: #ff4500; color: white; }
-    .sean-payton { background-color: #ff8c00; color: white; }
-    .nuggets { background-color: #ffd700; color: black; }
-    .broncos { background-color: #fb4f14; color: white; }
-</style>
-""", unsafe_allow_html=True)
+st.set_page_config(page_title="Tweet Hunter", layout="wide", initial_sidebar_state="collapsed")
 
-os.environ["TWITTER_BEARER_TOKEN"] = st.secrets["TWITTER_BEARER_TOKEN"]
-os.environ["ANTHROPIC_API_KEY"] = st.secrets["ANTHROPIC_API_KEY"]
+st.markdown(APP_CSS, unsafe_allow_html=True)
+rerun_timer.mark("Page config + CSS")
+
+# API clients are built once per server process and shared across every
+# session and rerun (st.cache_resource), not rebuilt on each button click
+@st.cache_resource
+def get_anthropic_client():
+    """One Anthropic client per server process"""
+    if API_MODE == "replay":
+        return OfflineAnthropic()
+    return Anthropic(api_key=st.secrets["ANTHROPIC_API_KEY"])
+
+@st.cache_resource
+def get_twitter_transport():
+    """One pooled keep-alive Twitter client per server process (or a fixture replay)"""
+    if API_MODE == "replay":
+        transport = ReplayTransport(ReplayClient(API_FIXTURE_DIR, latency_ms=REPLAY_LATENCY_MS))
+    else:
+        transport = TwitterTransport(st.secrets["TWITTER_BEARER_TOKEN"], pool_size=SEARCH_FANOUT, reserves=RATE_LIMIT_RESERVES)
+        if API_MODE == "record":
+            transport.client = RecordingClient(transport.client, API_FIXTURE_DIR)
+    # Refused / 429'd calls show up on the scan trace, on the span of the search that made them
+    transport.rate_limits.subscribe(book_rate_limit_event)
+    return transport
+
+@st.cache_resource
+def get_async_transport(_sync_transport):
+    """AsyncClient transport for the asyncio search backend (None = thread pool only)
+
+    Shares the sync transport's rate budgets (and, when replaying, its fixture cursors).
+    """
+    if API_MODE == "replay":
+        return AsyncReplayTransport(_sync_transport.client, _sync_transport.rate_limits)
+    if API_MODE == "record" or not AsyncTwitterTransport.available():
+        return None  # Fixtures are recorded through the sync client
+    return AsyncTwitterTransport(
+        st.secrets["TWITTER_BEARER_TOKEN"], _sync_transport.rate_limits, pool_size=ASYNC_SEARCH_CONCURRENCY
+    )
 
-client = Anthropic()
-client_twitter = tweepy.Client(bearer_token=os.environ["TWITTER_BEARER_TOKEN"], wait_on_rate_limit=True)
+@st.cache_resource
+def get_search_cache():
+    """Process-wide TTL/LRU cache of raw search responses"""
+    return TTLCache(ttl_seconds=RESPONSE_CACHE_TTL_MINUTES * 60, max_entries=RESPONSE_CACHE_MAX_ENTRIES)
+
+@st.cache_resource
+def get_incremental_store():
+    """Process-wide per-query tweet windows for since_id polling"""
+    return IncrementalSearchStore(hours_back=HOURS_BACK, refetch_minutes=INCREMENTAL_REFETCH_MINUTES)
+
+@st.cache_resource
+def get_insider_rotation():
+    """Packed insider queries + per-account last-seen IDs, shared across scans"""
+    return InsiderRotation(INSIDER_ACCOUNTS, query_limit=SEARCH_QUERY_LIMIT, max_queries=INSIDER_MAX_QUERIES)
+
+@st.cache_resource
+def get_velocity_store():
+    """Engagement snapshot store — loaded from disk once per process"""
+    return VelocityStore(VELOCITY_STORE_FILE, retention_days=SNAPSHOT_RETENTION_DAYS)
+
+@st.cache_resource
+def get_generation_cache():
+    """On-disk LRU of Claude outputs, keyed by prompt version + model + inputs"""
+    return GenerationCache(GENERATION_CACHE_DIR, max_bytes=GENERATION_CACHE_MAX_MB * 1024 * 1024)
+
+@st.cache_resource
+def get_token_usage():
+    """Process-wide Claude token totals (prompt-cache reads vs writes) for the usage panel"""
+    return TokenUsage()
+
+@st.cache_resource
+def get_generation_jobs():
+    """Worker pool + job registry for button-triggered generations, shared by every session"""
+    return GenerationJobs(max_workers=GENERATION_WORKERS, ttl_seconds=GENERATION_JOB_TTL_MINUTES * 60)
+
+@st.cache_resource
+def get_pregenerate_executor():
+    """One background worker per process for pre-generating card rewrites"""
+    return ThreadPoolExecutor(max_workers=1)
+
+@st.cache_resource
+def get_scan_history():
+    """Scan history backend — append-only log, or SQLite (migrates existing history once)"""
+    if SCAN_HISTORY_BACKEND == "sqlite":
+        return SqliteScanHistory(
+            SCAN_HISTORY_DB,
+            retention_days=SCAN_HISTORY_RETENTION_DAYS,
+            migrate_from=[SCAN_HISTORY_FILE, LEGACY_SCAN_HISTORY_FILE]
+        )
+    return ScanHistoryLog(SCAN_HISTORY_FILE, retention_days=SCAN_HISTORY_RETENTION_DAYS, legacy_json=LEGACY_SCAN_HISTORY_FILE)
+
+client = get_anthropic_client()
+twitter_transport = get_twitter_transport()
+client_twitter = twitter_transport.client
+rate_limits = twitter_transport.rate_limits
+async_transport = get_async_transport(twitter_transport)
+search_cache = get_search_cache()
+incremental_store = get_incremental_store()
+velocity_store = get_velocity_store()
+insider_rotation = get_insider_rotation()
+scan_history = get_scan_history()
+generation_cache = get_generation_cache()
+pregenerate_executor = get_pregenerate_executor()
+token_usage = get_token_usage()
+generation_jobs = get_generation_jobs()
+rerun_timer.mark("API clients")
 
 st.title("🏈 Tweet Hunter")
 st.caption(f"Find the most controversial Denver Broncos & Nuggets debates from the last {HOURS_BACK} hours")
@@ -157,135 +249,41 @@ if 'current_nuggets_tweets' not in st.session_state:
 if 'trending_topics' not in st.session_state:
     st.session_state.trending_topics = []
 
-# Keywords
-BRONCOS_KEYWORDS = [
-    "Denver Broncos",        # Most specific - prioritize this
-    "#Broncos",
-    "#BroncosCountry",
-    "Broncos NFL",           # Add NFL context
-    "Bo Nix",
-    "Surtain",
-    "Sean Payton"
-]
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex  # Keys this session's background generation jobs
 
-NUGGETS_KEYWORDS = [
-    "#Nuggets", "Nuggets", "Denver Nuggets", "Jokic"
-]
+# Background generations that finished since the last run -> rewrites_<id> / thread_<id> / reply_suggestion_<id>
+for job_tweet_id, job_kind, job_result in generation_jobs.finished(st.session_state.session_id):
+    st.session_state[f"{job_kind}_{job_tweet_id}"] = job_result
 
-def extract_subjects(tweet_text):
-    """Extract key subjects/topics from tweet - returns set of subject strings"""
-    text_lower = tweet_text.lower()
-    subjects = set()
-    
-    # BRONCOS PLAYERS
-    if any(kw in text_lower for kw in ["bo nix", "nix", "bo-nix", "bonix"]):
-        subjects.add("Bo Nix")
-    if any(kw in text_lower for kw in ["patrick surtain", "surtain", "ps2"]):
-        subjects.add("Patrick Surtain")
-    if any(kw in text_lower for kw in ["courtland sutton", "sutton"]):
-        subjects.add("Courtland Sutton")
-    if any(kw in text_lower for kw in ["javonte williams", "javonte"]):
-        subjects.add("Javonte Williams")
-    if any(kw in text_lower for kw in ["russell wilson", "russ wilson", "russ"]):
-        subjects.add("Russell Wilson")
-    if any(kw in text_lower for kw in ["riley moss"]):
-        subjects.add("Riley Moss")
-    if any(kw in text_lower for kw in ["troy franklin", "franklin"]):
-        subjects.add("Troy Franklin")
-    
-    # BRONCOS COACHES/STAFF
-    if any(kw in text_lower for kw in ["sean payton", "payton", "coach payton"]):
-        subjects.add("Sean Payton")
-    if any(kw in text_lower for kw in ["vance joseph", "vance"]):
-        subjects.add("Vance Joseph")
-    
-    # BRONCOS TOPICS
-    if any(kw in text_lower for kw in ["fire payton", "payton out", "fire sean"]):
-        subjects.add("Fire Payton")
-    if any(kw in text_lower for kw in ["qb", "quarterback"]):
-        subjects.add("QB Discussion")
-    if any(kw in text_lower for kw in ["defense", "defensive", "no fly zone"]):
-        subjects.add("Defense")
-    if any(kw in text_lower for kw in ["offense", "offensive"]):
-        subjects.add("Offense")
-    if "draft" in text_lower:
-        subjects.add("Draft")
-    if any(kw in text_lower for kw in ["playoffs", "playoff"]):
-        subjects.add("Playoffs")
-    
-    # NUGGETS PLAYERS
-    if any(kw in text_lower for kw in ["nikola jokic", "jokic", "joker"]):
-        subjects.add("Nikola Jokic")
-    if any(kw in text_lower for kw in ["jamal murray", "murray"]):
-        subjects.add("Jamal Murray")
-    if any(kw in text_lower for kw in ["aaron gordon", "ag", "gordon"]):
-        subjects.add("Aaron Gordon")
-    if any(kw in text_lower for kw in ["michael porter", "mpj", "porter jr"]):
-        subjects.add("Michael Porter Jr")
-    
-    # NUGGETS TOPICS
-    if "mvp" in text_lower:
-        subjects.add("MVP")
-    if any(kw in text_lower for kw in ["rest", "resting", "load management"]):
-        subjects.add("Player Rest")
-    if any(kw in text_lower for kw in ["championship", "title", "ring"]):
-        subjects.add("Championship")
-    
-    # GENERAL TOPICS (cross-team)
-    if any(kw in text_lower for kw in ["trade", "traded", "trading"]):
-        subjects.add("Trade Talk")
-    if any(kw in text_lower for kw in ["aj brown", "a.j. brown"]):
-        subjects.add("AJ Brown")
-    if any(kw in text_lower for kw in ["contract", "extension", "deal"]):
-        subjects.add("Contract")
-    if any(kw in text_lower for kw in ["injury", "injured", "hurt"]):
-        subjects.add("Injury")
-    
-    # Fallback: if no specific subject identified
-    if not subjects:
-        if "broncos" in text_lower:
-            subjects.add("General Broncos")
-        elif "nuggets" in text_lower or "jokic" in text_lower:
-            subjects.add("General Nuggets")
-        else:
-            subjects.add("Other")
-    
-    return subjects
 
-def determine_priority(tweet_text):
+def determine_priority(tweet_text, index=None):
     """Determine ranking priority based on content"""
-    text_lower = tweet_text.lower()
-    if any(word in text_lower for word in ["bo nix", "nix", "bo mix"]):
+    index = index or index_tweet(tweet_text)
+    if index.has_any(PRIORITY_BO_NIX_KWS):
         return {"priority": 100, "label": "🔥 BO NIX", "color": "bo-nix"}
-    elif any(word in text_lower for word in ["sean payton", "payton"]):
+    elif index.has_any(PRIORITY_PAYTON_KWS):
         return {"priority": 75, "label": "⚡ SEAN PAYTON", "color": "sean-payton"}
-    elif any(word in text_lower for word in ["jokic", "nuggets"]):
+    elif index.has_any(PRIORITY_NUGGETS_KWS):
         return {"priority": 50, "label": "🏀 NUGGETS", "color": "nuggets"}
     return {"priority": 10, "label": "🏈 BRONCOS", "color": "broncos"}
 
-def calculate_debate_score(metrics, tweet_text):
+def calculate_debate_score(metrics, tweet_text, index=None, weights=None):
     """HEAVILY prioritizes replies (debate) + retweets (virality)"""
-    text_lower = tweet_text.lower()
+    index = index or index_tweet(tweet_text)
+    w = weights or SCORING_WEIGHTS
     
     # Base score — replies dominate
     score = (
-        metrics['reply_count'] * 75000 +      # Debate king
-        metrics['retweet_count'] * 1200 +     # Viral spread
-        metrics['like_count'] * 8 +           # Minor factor
-        determine_priority(tweet_text)['priority']
+        metrics['reply_count'] * w.reply +      # Debate king
+        metrics['retweet_count'] * w.retweet +  # Viral spread
+        metrics['like_count'] * w.like +        # Minor factor
+        determine_priority(tweet_text, index)['priority']
     )
     
     # Bonus for controversial language
-    controversy_keywords = [
-        "fire", "trade", "overrated", "bust", "sucks", "trash", "worst",
-        "choke", "flop", "out", "hot take", "debate", "controversial",
-        "payton out", "nix sucks", "jokic flop", "worst trade", "mistake",
-        "regret", "washed", "benched", "russ cooked", "payton system",
-        "draft mistake", "playoff miss", "murray inconsistent", "title window",
-        "mpj contract", "no fly zone"
-    ]
-    if any(kw in text_lower for kw in controversy_keywords):
-        score += 250000  # Huge boost
+    if index.has_any(CONTROVERSY_KWS):
+        score += w.controversy  # Huge boost
     
     return score
 
@@ -307,28 +305,17 @@ def is_spam_tweet(tweet, metrics, is_recency=False):
     
     return False
 
-def is_wrong_broncos_team(tweet):
+def is_wrong_broncos_team(tweet, index=None):
     """Filter out non-Denver Broncos teams (Brisbane Broncos rugby, etc.)"""
-    text_lower = tweet.text.lower()
+    index = index or index_tweet(tweet.text)
     
     # Exclude rugby/NRL keywords
-    rugby_keywords = [
-        "rugby", "nrl", "brisbane", "queensland", "super league",
-        "world club challenge", "red hill", "suncorp stadium",
-        "reece walsh", "adam reynolds", "broncos rugby", "league"
-    ]
-    
-    if any(kw in text_lower for kw in rugby_keywords):
+    if index.has_any(RUGBY_KWS):
         return True
     
     # If tweet mentions "Broncos" but no NFL/Denver context, be suspicious
-    if "broncos" in text_lower:
-        nfl_context = [
-            "denver", "nfl", "super bowl", "afc", "bo nix", 
-            "sean payton", "surtain", "mile high", "empower field",
-            "football", "quarterback", "qb", "touchdown"
-        ]
-        has_nfl_context = any(kw in text_lower for kw in nfl_context)
+    if index.has_any(BRONCOS_MENTION_KWS):
+        has_nfl_context = index.has_any(NFL_CONTEXT_KWS)
         
         # If it mentions "Broncos" but has NO NFL context, likely wrong team
         if not has_nfl_context:
@@ -348,112 +335,123 @@ def is_original_tweet(tweet):
     
     return True
 
-def is_wrong_nuggets(tweet):
+def is_wrong_nuggets(tweet, index=None):
     """Filter out non-Denver Nuggets tweets (chicken nuggets, trading nuggets, etc.)"""
-    text_lower = tweet.text.lower()
+    index = index or index_tweet(tweet.text)
     
     # Only check tweets that mention nuggets-related keywords
-    if not any(kw in text_lower for kw in ["nuggets", "#nuggets"]):
+    if not index.has_any(NUGGETS_MENTION_KWS):
         return False  # Not a nuggets tweet, let other filters handle it
     
     # If it has clear NBA/Denver context, it's fine
-    nba_context = [
-        "denver", "nba", "jokic", "joker", "murray", "aaron gordon",
-        "michael porter", "mpj", "malone", "coach", "playoff", "playoffs",
-        "championship", "western conference", "ball arena", "altitude",
-        "basketball", "game", "season", "roster", "draft", "trade",
-        "free agent", "mvp", "all-star", "starting lineup", "bench",
-        "points", "assists", "rebounds", "triple double", "load management"
-    ]
-    has_nba_context = any(kw in text_lower for kw in nba_context)
+    has_nba_context = index.has_any(NBA_CONTEXT_KWS)
     
     if has_nba_context:
         return False  # Legit Nuggets tweet
     
     # Block food, trading, general non-basketball "nuggets"
-    spam_context = [
-        "chicken", "eating", "food", "recipe", "cook", "fry", "fried",
-        "mcdonalds", "burger", "sauce", "meal", "nugget meal",
-        "trading", "traders", "forex", "crypto", "stock", "candle",
-        "chart", "profit", "motivation", "daily motivation",
-        "ford", "ev ", "electric vehicle", "pickup", "truck", "platform",
-        "gold nugget", "nuggets of wisdom", "information nuggets",
-        "dog", "cat", "pet", "puppy", "pidgey", "bird"
-    ]
-    has_spam_context = any(kw in text_lower for kw in spam_context)
+    has_spam_context = index.has_any(NUGGETS_SPAM_KWS)
     
     if has_spam_context:
         return True  # Definitely not Denver Nuggets
     
     # If tweet ONLY says "nuggets" with no NBA context, likely not Denver
     # But if it has #Nuggets (hashtag), give benefit of the doubt
-    if "#nuggets" in text_lower:
+    if index.has_any(NUGGETS_HASHTAG_KWS):
         return False
     
     # Generic "nuggets" with no context either way — block it
     return True
 
-def search_viral_tweets(keywords, hours=36, debate_mode=False, sort_order='relevancy', start_time_override=None):
-    """Search for viral tweets — supports sort mode and time window overrides"""
-    base_query = " OR ".join(keywords)
-    query = f"({base_query}) -is:retweet lang:en"
-    
+def viral_search_call(keywords, hours=36, debate_mode=False, sort_order='relevancy', start_time_override=None):
+    """SearchCall for a keyword search — supports sort mode and time window overrides"""
+    query = f"({' OR '.join(keywords)})"
     if debate_mode:
-        controversy = [
-            "fire", "trade", "overrated", "bust", "sucks", "trash", "worst",
-            "choke", "flop", "out", "hot take", "debate", "controversial",
-            "payton out", "nix sucks", "jokic flop", "worst trade", "mistake",
-            "regret", "washed", "benched", "russ cooked"
-        ]
-        debate_part = " OR ".join(controversy)
-        query = f"({query}) ({debate_part})"
+        query = f"({query} ({' OR '.join(DEBATE_QUERY_TERMS)}))"
+    query += " -is:retweet lang:en"
     
     start_time = start_time_override or (datetime.utcnow() - timedelta(hours=hours))
+    cache_key = ("search", normalize_query(query), sort_order, window_minutes(start_time), MAX_TWEETS)
     
-    try:
-        tweets = client_twitter.search_recent_tweets(
+    # Incremental window is per query + sort order; the time window is applied on read
+    window_key = ("search", normalize_query(query), sort_order)
+    
+    def build_params():
+        since_id = incremental_store.since_id(window_key) if INCREMENTAL_SEARCH else None
+        # since_id already bounds the results, so only send start_time on a cold / refetched window
+        window_param = {'since_id': since_id} if since_id else {'start_time': start_time}
+        return dict(
             query=query,
             max_results=MAX_TWEETS,
-            start_time=start_time,
             sort_order=sort_order,
             tweet_fields=['public_metrics', 'created_at', 'referenced_tweets', 'attachments'],
             expansions=['author_id', 'attachments.media_keys'],
             user_fields=['username', 'name'],
-            media_fields=['url', 'preview_image_url', 'type']
+            media_fields=['url', 'preview_image_url', 'type'],
+            **window_param
         )
+    
+    def on_result(tweets):
+        if INCREMENTAL_SEARCH:
+            return incremental_store.merge(window_key, tweets, start_time)
         return tweets
-    except Exception as e:
+    
+    def on_error(e):
         print(f"Search error: {str(e)}")
-        return None
-
-def search_insider_tweets(accounts, hours=24):
-    """Search for tweets FROM high-signal insider accounts"""
-    sample = random.sample(accounts, min(10, len(accounts)))
-    from_clause = " OR ".join([f"from:{acct}" for acct in sample])
-    query = f"({from_clause}) -is:retweet lang:en"
+        return incremental_store.view(window_key, start_time) if INCREMENTAL_SEARCH else None
     
+    return SearchCall(cache_key, 'search_recent_tweets', build_params, on_result, on_error)
+
+def insider_search_call(accounts, hours=24):
+    """SearchCall for tweets FROM one packed group of insider accounts"""
     start_time = datetime.utcnow() - timedelta(hours=hours)
-    
-    try:
-        tweets = client_twitter.search_recent_tweets(
-            query=query,
-            max_results=50,
-            start_time=start_time,
-            sort_order='relevancy',
+    window_key = ("insiders", tuple(sorted(a.lower() for a in accounts)))
+    cache_key = window_key + (hours,)
+    
+    def build_params():
+        # Tweets after the oldest of the pack's last-seen IDs (full window on a cold start or a metrics refetch)
+        incremental = INCREMENTAL_SEARCH and not incremental_store.refetch_due(window_key)
+        since_id = insider_rotation.since_id(accounts, start_time) if incremental else None
+        window_param = {'since_id': since_id} if since_id else {'start_time': start_time}
+        return dict(
+            query=insider_query(accounts),
+            max_results=100,
+            sort_order='recency',
             tweet_fields=['public_metrics', 'created_at', 'referenced_tweets', 'attachments'],
             expansions=['author_id', 'attachments.media_keys'],
             user_fields=['username', 'name'],
-            media_fields=['url', 'preview_image_url', 'type']
+            media_fields=['url', 'preview_image_url', 'type'],
+            **window_param
         )
+    
+    def on_result(tweets):
+        insider_rotation.observe(accounts, tweets)
+        if INCREMENTAL_SEARCH:
+            return incremental_store.merge(window_key, tweets, start_time)
         return tweets
-    except Exception as e:
+    
+    def on_error(e):
         print(f"Insider search error: {str(e)}")
-        return None
+        return held_insider_tweets(accounts, hours)
+    
+    return SearchCall(cache_key, 'search_recent_tweets', build_params, on_result, on_error)
 
-def search_list_tweets(list_id, hours=36):
-    """Fetch recent tweets from a Twitter list — high-signal curated feed"""
-    try:
-        tweets = client_twitter.get_list_tweets(
+def held_insider_tweets(accounts, hours=24):
+    """A pack's held incremental window — for packs not queried this scan"""
+    if not INCREMENTAL_SEARCH:
+        return None
+    window_key = ("insiders", tuple(sorted(a.lower() for a in accounts)))
+    return incremental_store.view(window_key, datetime.utcnow() - timedelta(hours=hours))
+
+def list_search_call(list_id, hours=36):
+    """SearchCall for a Twitter list's recent tweets — high-signal curated feed"""
+    cache_key = ("list", list_id, hours)
+    # get_list_tweets has no since_id, but merging still keeps tweets that
+    # have scrolled off the list's latest page for the rest of the window
+    window_key = ("list", list_id)
+    
+    def build_params():
+        return dict(
             id=list_id,
             max_results=100,
             tweet_fields=['public_metrics', 'created_at', 'referenced_tweets', 'attachments'],
@@ -461,52 +459,75 @@ def search_list_tweets(list_id, hours=36):
             user_fields=['username', 'name'],
             media_fields=['url', 'preview_image_url', 'type']
         )
-        
-        # get_list_tweets has no start_time param — filter old tweets manually
-        if tweets and tweets.data:
-            cutoff = datetime.utcnow() - timedelta(hours=hours)
-            filtered_data = []
-            for tweet in tweets.data:
-                if tweet.created_at:
-                    try:
-                        tweet_time = tweet.created_at.replace(tzinfo=None)
-                        if tweet_time >= cutoff:
-                            filtered_data.append(tweet)
-                    except:
+    
+    def on_result(tweets):
+        result = _recent_list_tweets(tweets, hours)
+        if not INCREMENTAL_SEARCH:
+            return result
+        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        if result is None:
+            return incremental_store.view(window_key, cutoff)
+        return incremental_store.merge(window_key, result, cutoff)
+    
+    def on_error(e):
+        print(f"List search error (list {list_id}): {str(e)}")
+        if not INCREMENTAL_SEARCH:
+            return None
+        return incremental_store.view(window_key, datetime.utcnow() - timedelta(hours=hours))
+    
+    return SearchCall(cache_key, 'get_list_tweets', build_params, on_result, on_error)
+
+def _recent_list_tweets(tweets, hours):
+    """Drop list tweets older than the window (None if nothing is left)"""
+    # get_list_tweets has no start_time param — filter old tweets manually
+    if tweets and tweets.data:
+        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        filtered_data = []
+        for tweet in tweets.data:
+            if tweet.created_at:
+                try:
+                    tweet_time = tweet.created_at.replace(tzinfo=None)
+                    if tweet_time >= cutoff:
                         filtered_data.append(tweet)
-                else:
+                except:
                     filtered_data.append(tweet)
-            
-            if not filtered_data:
-                return None
-            
-            # Return a compatible wrapper (Response namedtuple is immutable)
-            class ListResult:
-                pass
-            result = ListResult()
-            result.data = filtered_data
-            result.includes = tweets.includes if hasattr(tweets, 'includes') else None
-            result.meta = tweets.meta if hasattr(tweets, 'meta') else None
-            return result
+            else:
+                filtered_data.append(tweet)
         
-        return tweets
-    except Exception as e:
-        print(f"List search error (list {list_id}): {str(e)}")
-        return None
+        if not filtered_data:
+            return None
+        
+        # Return a compatible wrapper (Response namedtuple is immutable)
+        return SearchResult(
+            filtered_data,
+            tweets.includes if hasattr(tweets, 'includes') else None,
+            tweets.meta if hasattr(tweets, 'meta') else None
+        )
+    
+    return tweets
+
+def search_viral_tweets(keywords, hours=36, debate_mode=False, sort_order='relevancy', start_time_override=None):
+    """Search for viral tweets — supports sort mode and time window overrides"""
+    return run_call(viral_search_call(keywords, hours, debate_mode, sort_order, start_time_override), client_twitter, search_cache)
+
+def search_insider_tweets(accounts, hours=24):
+    """Search for tweets FROM high-signal insider accounts"""
+    return run_call(insider_search_call(accounts, hours), client_twitter, search_cache)
+
+def search_list_tweets(list_id, hours=36):
+    """Fetch recent tweets from a Twitter list — high-signal curated feed"""
+    return run_call(list_search_call(list_id, hours), client_twitter, search_cache)
+
+def search_fanout(max_workers=None):
+    """Fan-out runner for the configured SEARCH_BACKEND"""
+    if SEARCH_BACKEND == "asyncio" and async_transport is not None:
+        return AsyncFanout(async_transport, search_cache, ASYNC_SEARCH_CONCURRENCY)
+    return ThreadFanout(client_twitter, search_cache, max_workers or SEARCH_FANOUT)
 
 def get_subject_penalty_from_history():
     """Penalize subjects that dominated previous scans (cross-scan balancing)"""
     try:
-        history = []
-        if SCAN_HISTORY_FILE.exists():
-            all_history = json.loads(SCAN_HISTORY_FILE.read_text())
-            history = all_history[-3:] if len(all_history) >= 3 else all_history
-        
-        subject_appearances = defaultdict(int)
-        for entry in history:
-            topics = entry.get("topics", {})
-            for subject in topics:
-                subject_appearances[subject] += 1
+        subject_appearances = scan_history.subject_appearances(last_n=3)
         
         penalty = {}
         for subject, count in subject_appearances.items():
@@ -519,49 +540,85 @@ def get_subject_penalty_from_history():
     except Exception:
         return {}
 
-def get_top_debate_tweets(exclude_ids=None):
-    """Main processing: 4 core + 2 fresh + 1 insider + scoring + diversity"""
+# Per-team slots + subject caps: 2 per subject, relaxed to 3 below 8/4 picks, 5 below 6/3
+DIVERSITY_QUOTAS = [
+    TeamQuota("broncos", lambda t: index_tweet(t['text']).has_any(BRONCOS_TEAM_KWS), 10, [2, (3, 8), (5, 6)]),
+    TeamQuota("nuggets", lambda t: index_tweet(t['text']).has_any(NUGGETS_TEAM_KWS), 5, [2, (3, 4), (5, 3)]),
+]
+
+def search_priority(source_name):
+    """Rate-budget priority of a scan source — core searches spend the last requests"""
+    if source_name.startswith('list_'):
+        return PRIORITY_LIST
+    if source_name.startswith('insiders'):
+        return PRIORITY_INSIDER
+    if source_name.endswith('_fresh') or source_name == 'volume_fallback':
+        return PRIORITY_FRESH
+    return PRIORITY_CORE
+
+def get_top_debate_tweets(exclude_ids=None, fresh_hours=None, on_progress=None):
+    """Main processing: 4 core + 2 fresh + packed insiders + lists + scoring + diversity
+    
+    Pass the previous scan's fresh_hours to re-rank from cached responses
+    (every search then hits the response cache — zero API calls within the TTL).
+    on_progress(broncos, nuggets, done_sources, pending_sources) is called with
+    a provisional ranking each time a source finishes while others are pending.
+    """
     
     if exclude_ids is None:
         exclude_ids = set()
     
     # Fresh window: random 12-18h for variety between scans
-    fresh_hours = random.randint(12, 18)
+    if fresh_hours is None:
+        fresh_hours = random.randint(12, 18)
     fresh_start = datetime.utcnow() - timedelta(hours=fresh_hours)
     
     # Run 7+ searches IN PARALLEL
     # Core 4: UNCHANGED from baseline (relevancy, full 36h window)
     # Fresh 2: ADDED (recency, recent 12-18h slice)
-    # Insider 1: ADDED (beat writers + team accounts)
+    # Insiders: ADDED (beat writers + team accounts, packed into as few queries as fit)
     # Lists 3: ADDED (Tyler's curated Twitter lists)
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = {
-            # --- CORE 4: identical to baseline ---
-            'broncos_normal': executor.submit(search_viral_tweets, BRONCOS_KEYWORDS, HOURS_BACK, False),
-            'broncos_debate': executor.submit(search_viral_tweets, BRONCOS_KEYWORDS, HOURS_BACK, True),
-            'nuggets_normal': executor.submit(search_viral_tweets, NUGGETS_KEYWORDS, HOURS_BACK, False),
-            'nuggets_debate': executor.submit(search_viral_tweets, NUGGETS_KEYWORDS, HOURS_BACK, True),
-            # --- FRESH 2: recency injection ---
-            'broncos_fresh': executor.submit(search_viral_tweets, BRONCOS_KEYWORDS, fresh_hours, False, 'recency', fresh_start),
-            'nuggets_fresh': executor.submit(search_viral_tweets, NUGGETS_KEYWORDS, fresh_hours, False, 'recency', fresh_start),
-            # --- INSIDER 1: beat writers + team accounts ---
-            'insiders': executor.submit(search_insider_tweets, INSIDER_ACCOUNTS, 24),
-        }
-        # --- LISTS: Tyler's curated Twitter lists ---
-        for i, list_id in enumerate(TWITTER_LISTS):
-            futures[f'list_{i}'] = executor.submit(search_list_tweets, list_id, HOURS_BACK)
-        
-        results = {name: f.result() for name, f in futures.items()}
+    transports = [t for t in (twitter_transport, async_transport) if t is not None]
+    conn_before = [t.connection_stats() for t in transports]
+    cache_before = search_cache.stats()
+    incremental_before = incremental_store.stats()
+    
+    trace = ScanTrace()
+    events_before = rate_limits.event_count()
+    
+    searches = {
+        # --- CORE 4: identical to baseline ---
+        'broncos_normal': viral_search_call(BRONCOS_KEYWORDS, HOURS_BACK, False),
+        'broncos_debate': viral_search_call(BRONCOS_KEYWORDS, HOURS_BACK, True),
+        'nuggets_normal': viral_search_call(NUGGETS_KEYWORDS, HOURS_BACK, False),
+        'nuggets_debate': viral_search_call(NUGGETS_KEYWORDS, HOURS_BACK, True),
+        # --- FRESH 2: recency injection ---
+        'broncos_fresh': viral_search_call(BRONCOS_KEYWORDS, fresh_hours, False, 'recency', fresh_start),
+        'nuggets_fresh': viral_search_call(NUGGETS_KEYWORDS, fresh_hours, False, 'recency', fresh_start),
+    }
+    # --- INSIDERS: every account, packed into `from:` queries; packs not due
+    # this scan (INSIDER_MAX_QUERIES) are served from their held window ---
+    insider_due, insider_held = insider_rotation.plan()
+    held_sources = {}
+    for i, pack in enumerate(insider_rotation.packs):
+        if pack in insider_due:
+            searches[f'insiders_{i}'] = insider_search_call(pack, 24)
+        else:
+            held_sources[f'insiders_{i}'] = held_insider_tweets(pack, 24)
+    # --- LISTS: Tyler's curated Twitter lists ---
+    for i, list_id in enumerate(TWITTER_LISTS):
+        searches[f'list_{i}'] = list_search_call(list_id, HOURS_BACK)
     
     # Track which results get relaxed filters (fresh + insider + list tweets)
-    recency_sources = {'broncos_fresh', 'nuggets_fresh', 'insiders'}
-    recency_sources.update(k for k in results if k.startswith('list_'))
+    source_order = list(searches) + list(held_sources)
+    recency_sources = {'broncos_fresh', 'nuggets_fresh'}
+    recency_sources.update(k for k in source_order if k.startswith(('list_', 'insiders')))
     
     # Get subject penalty from scan history (cross-scan balancing)
-    subject_penalty = get_subject_penalty_from_history()
+    with trace.span("history: subject penalty"):
+        subject_penalty = get_subject_penalty_from_history()
     
-    all_tweets = []
-    seen_ids = set()
+    scan_now = datetime.utcnow()
     all_users = {}
     all_media = {}
     
@@ -579,20 +636,30 @@ def get_top_debate_tweets(exclude_ids=None):
         'kept': 0,
         'kept_fresh': 0,
         'fresh_window': f"{fresh_hours}h",
-        'subjects_penalized': list(subject_penalty.keys()) if subject_penalty else []
+        'fresh_hours': fresh_hours,
+        'subjects_penalized': list(subject_penalty.keys()) if subject_penalty else [],
+        'timed_out': [],
     }
     
-    # Process all search results
-    for source_name, tweets_obj in results.items():
-        if not tweets_obj or not tweets_obj.data:
-            continue
-        
+    def screen(source_name, tweets_obj, call=None):
+        """screen_tweets in one span per source — nothing inside the per-tweet loop is traced"""
+        with trace.span(f"screen: {source_name}", tweets=len(tweets_obj.data)) as span:
+            outcomes = screen_tweets(source_name, tweets_obj, call)
+            span['kept'] = sum(1 for _, filtered, _ in outcomes if not filtered)
+        return outcomes
+    
+    def screen_tweets(source_name, tweets_obj, call=None):
+        """Filter + score one source's tweets -> [(tweet_id, filter stat or None, candidate)]
+
+        call is the SearchCall that produced tweets_obj, if any — only tweets it
+        fetched over the wire get a velocity snapshot, stamped with its fetch time
+        """
         is_recency = source_name in recency_sources
         
         stats['total_raw'] += len(tweets_obj.data)
         if source_name.startswith('list_'):
             stats['total_raw_lists'] += len(tweets_obj.data)
-        elif source_name == 'insiders':
+        elif source_name.startswith('insiders'):
             stats['total_raw_insider'] += len(tweets_obj.data)
         elif is_recency:
             stats['total_raw_fresh'] += len(tweets_obj.data)
@@ -609,70 +676,53 @@ def get_top_debate_tweets(exclude_ids=None):
             for media in tweets_obj.includes['media']:
                 all_media[media.media_key] = media
         
-        # Process tweets
+        outcomes = []
         for tweet in tweets_obj.data:
-            if tweet.id in seen_ids:
-                stats['filtered_duplicate'] += 1
-                continue
-            
             if tweet.id in exclude_ids:
-                stats['filtered_duplicate'] += 1
+                outcomes.append((tweet.id, 'filtered_duplicate', None))
                 continue
             
             metrics = tweet.public_metrics
             
             # Use relaxed spam thresholds for recency tweets
             if is_spam_tweet(tweet, metrics, is_recency=is_recency):
-                stats['filtered_spam'] += 1
+                outcomes.append((tweet.id, 'filtered_spam', None))
                 continue
             
             if not is_original_tweet(tweet):
-                stats['filtered_not_original'] += 1
+                outcomes.append((tweet.id, 'filtered_not_original', None))
                 continue
             
-            if is_wrong_broncos_team(tweet):
-                stats['filtered_rugby'] += 1
-                continue
+            # One tokenization pass shared by every classifier below
+            index = index_tweet(tweet.text)
             
-            if is_wrong_nuggets(tweet):
-                stats['filtered_spam'] += 1
+            if is_wrong_broncos_team(tweet, index):
+                outcomes.append((tweet.id, 'filtered_rugby', None))
                 continue
             
-            stats['kept'] += 1
+            if is_wrong_nuggets(tweet, index):
+                outcomes.append((tweet.id, 'filtered_spam', None))
+                continue
             
-            score = calculate_debate_score(metrics, tweet.text)
-            priority_info = determine_priority(tweet.text)
-            subjects = extract_subjects(tweet.text)
+            priority_info = determine_priority(tweet.text, index)
+            subjects = extract_subjects(tweet.text, index)
             
             user = all_users.get(tweet.author_id)
             
-            # Freshness bonus
-            is_fresh = False
-            age_hours = 999
-            if tweet.created_at:
-                try:
-                    age = datetime.utcnow() - tweet.created_at.replace(tzinfo=None)
-                    age_hours = age.total_seconds() / 3600
-                    if age_hours < 6:
-                        score += 100000
-                        is_fresh = True
-                    elif age_hours < 12:
-                        score += 50000
-                        is_fresh = True
-                except:
-                    pass
-            
-            if is_fresh:
-                stats['kept_fresh'] += 1
-            
-            # Velocity boost
-            if age_hours < 8 and metrics['reply_count'] > 3:
-                score += metrics['reply_count'] * 20000
-            
-            # Cross-scan subject penalty
-            for subj in subjects:
-                if subj in subject_penalty:
-                    score -= subject_penalty[subj] * 50000
+            # Debate score + freshness bonus + velocity boost - cross-scan penalty
+            # A cached / held copy carries counts already in the history, so it
+            # is scored from the history alone and not recorded again
+            fetched_at = call.fetched_at if call is not None and tweet.id in call.fetched_ids else None
+            if fetched_at is not None:
+                velocity = velocity_store.velocity(tweet.id, metrics['reply_count'], fetched_at)
+            else:
+                velocity = velocity_store.velocity(tweet.id)
+            penalty_units = sum(subject_penalty.get(subj, 0) for subj in subjects) if subject_penalty else 0
+            tweet_age = age_hours(tweet.created_at, scan_now)
+            parts = score_parts(
+                metrics, priority_info['priority'], index.has_any(CONTROVERSY_KWS),
+                tweet_age, velocity, penalty_units, SCORING_WEIGHTS
+            )
             
             # Attach media
             tweet_media = []
@@ -681,7 +731,7 @@ def get_top_debate_tweets(exclude_ids=None):
                     if mk in all_media:
                         tweet_media.append(all_media[mk])
             
-            all_tweets.append({
+            tweet_dict = {
                 'id': tweet.id,
                 'text': tweet.text,
                 'author': user.username if user else 'Unknown',
@@ -690,168 +740,205 @@ def get_top_debate_tweets(exclude_ids=None):
                 'likes': metrics['like_count'],
                 'retweets': metrics['retweet_count'],
                 'replies': metrics['reply_count'],
-                'debate_score': score,
+                'debate_score': sum(parts.values()),
+                'score_parts': parts,
+                'is_fresh': parts['freshness'] > 0,
                 'priority': priority_info,
                 'subjects': subjects,
                 'media': tweet_media,
-                'is_fresh': is_fresh,
-                'age_hours': round(age_hours, 1)
-            })
-            
-            seen_ids.add(tweet.id)
-    
-    # Sort all tweets by debate score
-    all_tweets.sort(key=lambda x: x['debate_score'], reverse=True)
-    
-    # DIVERSITY ENFORCEMENT: Max 2 tweets per subject
-    broncos_keywords_lower = [k.lower() for k in BRONCOS_KEYWORDS]
-    nuggets_keywords_lower = [k.lower() for k in NUGGETS_KEYWORDS]
-    
-    final_broncos = []
-    final_nuggets = []
-    subject_count_broncos = defaultdict(int)
-    subject_count_nuggets = defaultdict(int)
-    
-    broncos_backup = []
-    nuggets_backup = []
-    
-    for tweet in all_tweets:
-        text_lower = tweet['text'].lower()
-        
-        is_broncos = any(kw in text_lower for kw in broncos_keywords_lower)
-        is_nuggets = any(kw in text_lower for kw in nuggets_keywords_lower)
-        
-        if is_broncos and len(final_broncos) < 10:
-            can_add = True
-            for subj in tweet['subjects']:
-                if subject_count_broncos[subj] >= 2:
-                    can_add = False
-                    break
-            
-            if can_add:
-                final_broncos.append(tweet)
-                for subj in tweet['subjects']:
-                    subject_count_broncos[subj] += 1
-            else:
-                broncos_backup.append(tweet)
-        
-        elif is_nuggets and len(final_nuggets) < 5:
-            can_add = True
-            for subj in tweet['subjects']:
-                if subject_count_nuggets[subj] >= 2:
-                    can_add = False
-                    break
-            
-            if can_add:
-                final_nuggets.append(tweet)
-                for subj in tweet['subjects']:
-                    subject_count_nuggets[subj] += 1
-            else:
-                nuggets_backup.append(tweet)
-    
-    # FALLBACK: If short, relax to 3 max per subject
-    if len(final_broncos) < 8 and broncos_backup:
-        for tweet in broncos_backup:
-            if len(final_broncos) >= 10:
-                break
-            can_add = True
-            for subj in tweet['subjects']:
-                if subject_count_broncos[subj] >= 3:
-                    can_add = False
-                    break
-            if can_add:
-                final_broncos.append(tweet)
-                for subj in tweet['subjects']:
-                    subject_count_broncos[subj] += 1
-    
-    if len(final_nuggets) < 4 and nuggets_backup:
-        for tweet in nuggets_backup:
-            if len(final_nuggets) >= 5:
-                break
-            can_add = True
-            for subj in tweet['subjects']:
-                if subject_count_nuggets[subj] >= 3:
-                    can_add = False
-                    break
-            if can_add:
-                final_nuggets.append(tweet)
-                for subj in tweet['subjects']:
-                    subject_count_nuggets[subj] += 1
-    
-    # VOLUME FALLBACK: relax to 5 per subject
-    if len(final_broncos) < 6 and broncos_backup:
-        for tweet in broncos_backup:
-            if len(final_broncos) >= 10:
-                break
-            if tweet not in final_broncos:
-                can_add = True
-                for subj in tweet['subjects']:
-                    if subject_count_broncos[subj] >= 5:
-                        can_add = False
-                        break
-                if can_add:
-                    final_broncos.append(tweet)
-                    for subj in tweet['subjects']:
-                        subject_count_broncos[subj] += 1
-    
-    if len(final_nuggets) < 3 and nuggets_backup:
-        for tweet in nuggets_backup:
-            if len(final_nuggets) >= 5:
-                break
-            if tweet not in final_nuggets:
-                can_add = True
-                for subj in tweet['subjects']:
-                    if subject_count_nuggets[subj] >= 5:
-                        can_add = False
-                        break
-                if can_add:
-                    final_nuggets.append(tweet)
-                    for subj in tweet['subjects']:
-                        subject_count_nuggets[subj] += 1
+                'age_hours': round(tweet_age, 1),
+                'reply_velocity': round(velocity[0], 1) if velocity else None
+            }
+            snapshot = (
+                tweet.id, fetched_at, metrics['reply_count'], metrics['retweet_count'], metrics['like_count']
+            ) if fetched_at is not None else None
+            outcomes.append((tweet.id, None, (tweet_dict, snapshot)))
+        return outcomes
+    
+    def merge(screened):
+        """Dedup screened sources in search order — the same pool whatever order they arrived in"""
+        pool, snapshots, counts = [], {}, defaultdict(int)
+        seen_ids = set()
+        for source_name in source_order:
+            for tweet_id, filtered, candidate in screened.get(source_name, ()):
+                if candidate is not None and candidate[1] is not None:
+                    # A fresh fetch is worth a snapshot even when a cached copy won the dedup
+                    snapshots.setdefault(tweet_id, candidate[1])
+                if tweet_id in seen_ids:
+                    counts['filtered_duplicate'] += 1
+                elif filtered:
+                    counts[filtered] += 1
+                else:
+                    pool.append(candidate[0])
+                    seen_ids.add(tweet_id)
+        return pool, list(snapshots.values()), counts, seen_ids
+    
+    @contextmanager
+    def search_scope(source_name):
+        # Each search spends rate budget at its source's priority — when the
+        # budget runs low, lists/insider/fresh are refused before core searches
+        with trace.span(f"search: {source_name}"), rate_limits.context(source_name, search_priority(source_name)):
+            yield
+    
+    # Sources are screened as they finish. A source still running past its
+    # deadline is left out of this scan (on the thread backend it keeps going
+    # and still fills the response cache / incremental window for the next scan).
+    screened = {
+        name: screen(name, tweets_obj) if tweets_obj and tweets_obj.data else []
+        for name, tweets_obj in held_sources.items()
+    }
+    fanout = search_fanout()
+    deadlines = {name: SEARCH_DEADLINES[search_priority(name)] for name in searches}
+    with trace.span(f"searches + screening ({fanout.backend}, as completed)"):
+        for source_name, tweets_obj in fanout.completed(searches, deadlines, scope=search_scope):
+            screened[source_name] = screen(source_name, tweets_obj, searches[source_name]) if tweets_obj and tweets_obj.data else []
+            if fanout.pending and on_progress:
+                with trace.span("provisional ranking"):
+                    pool, _, _, _ = merge(screened)
+                    provisional_broncos, provisional_nuggets = select_diverse(pool, DIVERSITY_QUOTAS)
+                on_progress(provisional_broncos, provisional_nuggets, sorted(screened), fanout.pending)
+    stats['timed_out'] = fanout.timed_out
+    
+    with trace.span("merge sources"):
+        all_tweets, snapshots, counts, seen_ids = merge(screened)
+        for key, count in counts.items():
+            stats[key] += count
+        stats['kept'] = len(all_tweets)
+    
+    # One append per scan, each row stamped with its fetch time — feeds next
+    # scan's replies/hour + acceleration
+    with trace.span("snapshots: record", rows=len(snapshots)):
+        velocity_store.record_timed(snapshots)
+    
+    # DIVERSITY ENFORCEMENT: Max 2 tweets per subject, relaxed to 3 then 5 if short
+    with trace.span("diversity", tweets=len(all_tweets)):
+        final_broncos, final_nuggets = select_diverse(all_tweets, DIVERSITY_QUOTAS)
+        stats['kept_fresh'] = sum(1 for tweet in all_tweets if tweet['is_fresh'])
     
     # LAST RESORT: extra API call if still under 6 Broncos
     if len(final_broncos) < 6:
-        try:
-            extra = search_viral_tweets(BRONCOS_KEYWORDS, HOURS_BACK, True)
-            if extra and extra.data:
-                extra_users = {}
-                if hasattr(extra, 'includes') and extra.includes and 'users' in extra.includes:
-                    for u in extra.includes['users']:
-                        extra_users[u.id] = u
-                for tweet in extra.data:
-                    if len(final_broncos) >= 10:
-                        break
-                    if tweet.id in seen_ids or tweet.id in exclude_ids:
-                        continue
-                    m = tweet.public_metrics
-                    if is_spam_tweet(tweet, m):
-                        continue
-                    if not is_original_tweet(tweet):
-                        continue
-                    if is_wrong_broncos_team(tweet):
-                        continue
-                    eu = extra_users.get(tweet.author_id)
-                    final_broncos.append({
-                        'id': tweet.id,
-                        'text': tweet.text,
-                        'author': eu.username if eu else 'Unknown',
-                        'author_name': eu.name if eu else 'Unknown',
-                        'created_at': tweet.created_at,
-                        'likes': m['like_count'],
-                        'retweets': m['retweet_count'],
-                        'replies': m['reply_count'],
-                        'debate_score': calculate_debate_score(m, tweet.text),
-                        'priority': determine_priority(tweet.text),
-                        'subjects': extract_subjects(tweet.text),
-                        'media': [],
-                        'is_fresh': False,
-                        'age_hours': 999
-                    })
-        except Exception as e:
-            print(f"Volume fallback error: {e}")
+        with trace.span("volume fallback"), rate_limits.context('volume_fallback', search_priority('volume_fallback')):
+            try:
+                extra = search_viral_tweets(BRONCOS_KEYWORDS, HOURS_BACK, True)
+                if extra and extra.data:
+                    extra_users = {}
+                    if hasattr(extra, 'includes') and extra.includes and 'users' in extra.includes:
+                        for u in extra.includes['users']:
+                            extra_users[u.id] = u
+                    for tweet in extra.data:
+                        if len(final_broncos) >= 10:
+                            break
+                        if tweet.id in seen_ids or tweet.id in exclude_ids:
+                            continue
+                        m = tweet.public_metrics
+                        if is_spam_tweet(tweet, m):
+                            continue
+                        if not is_original_tweet(tweet):
+                            continue
+                        index = index_tweet(tweet.text)
+                        if is_wrong_broncos_team(tweet, index):
+                            continue
+                        eu = extra_users.get(tweet.author_id)
+                        final_broncos.append({
+                            'id': tweet.id,
+                            'text': tweet.text,
+                            'author': eu.username if eu else 'Unknown',
+                            'author_name': eu.name if eu else 'Unknown',
+                            'created_at': tweet.created_at,
+                            'likes': m['like_count'],
+                            'retweets': m['retweet_count'],
+                            'replies': m['reply_count'],
+                            'debate_score': calculate_debate_score(m, tweet.text, index),
+                            'priority': determine_priority(tweet.text, index),
+                            'subjects': extract_subjects(tweet.text, index),
+                            'media': [],
+                            'is_fresh': False,
+                            'age_hours': 999
+                        })
+            except Exception as e:
+                print(f"Volume fallback error: {e}")
+    
+    # Connection reuse for this scan (new connections = TLS handshakes paid)
+    http = [TwitterTransport.stats_delta(before, t.connection_stats()) for before, t in zip(conn_before, transports)]
+    stats['http'] = {k: sum(delta[k] for delta in http) for k in http[0]}
+    stats['response_cache'] = TTLCache.stats_delta(cache_before, search_cache.stats())
+    incremental_after = incremental_store.stats()
+    stats['incremental'] = {
+        'fetched': incremental_after['fetched'] - incremental_before['fetched'],
+        'new': incremental_after['new'] - incremental_before['new'],
+        'held': incremental_after['held'],
+        'refetches': incremental_after['refetches'] - incremental_before['refetches'],
+    }
+    # Degraded: some source was refused (low budget), hit a 429 or ran past its deadline — results are partial
+    stats['rate_limited'] = rate_limits.events_since(events_before)
+    stats['degraded'] = bool(stats['rate_limited'] or stats['timed_out'])
+    stats['rate_budget'] = rate_limits.snapshot()
+    stats['insiders'] = {**insider_rotation.stats(), 'queried': len(insider_due)}
+    stats['trace'] = trace  # The UI adds history/trending spans, then renders or exports it
     
     return final_broncos, final_nuggets, stats
 
+# ========================================
+# 🔄 METRIC REFRESH
+# ========================================
+
+METRICS_LOOKUP_BATCH = 100  # Max IDs per GET /2/tweets lookup
+
+def fetch_public_metrics(tweet_ids):
+    """Batch-lookup current public_metrics for known tweet IDs — returns ({id: metrics}, calls)"""
+    ids = list(dict.fromkeys(tweet_ids))
+    metrics_by_id = {}
+    calls = 0
+    for i in range(0, len(ids), METRICS_LOOKUP_BATCH):
+        batch = ids[i:i + METRICS_LOOKUP_BATCH]
+        calls += 1
+        try:
+            result = client_twitter.get_tweets(ids=batch, tweet_fields=['public_metrics'])
+        except Exception as e:
+            print(f"Metric refresh error: {e}")
+            continue
+        if result and result.data:
+            for tweet in result.data:
+                metrics_by_id[tweet.id] = tweet.public_metrics
+    return metrics_by_id, calls
+
+def refresh_tweet_metrics(tweets):
+    """Pull fresh metrics for already-ranked tweets and re-score them locally (in place)
+    
+    Order is left alone so per-position rewrites stay attached to their tweet.
+    Returns (tweets updated, lookup calls made).
+    """
+    metrics_by_id, calls = fetch_public_metrics(t['id'] for t in tweets)
+    now_ts = time.time()
+    now = datetime.utcnow()
+    
+    refreshed = [t for t in tweets if metrics_by_id.get(t['id'])]
+    for tweet in refreshed:
+        m = metrics_by_id[tweet['id']]
+        velocity = velocity_store.velocity(tweet['id'], m['reply_count'], now_ts)
+        parts = score_parts(
+            m, tweet['priority']['priority'], index_tweet(tweet['text']).has_any(CONTROVERSY_KWS),
+            age_hours(tweet.get('created_at'), now), velocity, weights=SCORING_WEIGHTS
+        )
+        # Keep the cross-scan penalty the tweet was ranked with
+        parts['penalty'] = tweet.get('score_parts', {}).get('penalty', 0)
+        tweet['reply_delta'] = m['reply_count'] - tweet['replies']
+        tweet['likes'] = m['like_count']
+        tweet['retweets'] = m['retweet_count']
+        tweet['replies'] = m['reply_count']
+        tweet['score_parts'] = parts
+        tweet['debate_score'] = sum(parts.values())
+        tweet['reply_velocity'] = round(velocity[0], 1) if velocity else None
+        if tweet.get('created_at'):
+            tweet['age_hours'] = round(age_hours(tweet['created_at'], now), 1)
+            tweet['is_fresh'] = parts['freshness'] > 0
+    
+    velocity_store.record(
+        ((tid, m['reply_count'], m['retweet_count'], m['like_count']) for tid, m in metrics_by_id.items()),
+        ts=now_ts
+    )
+    return len(refreshed), calls
+
 def fetch_tweet_media(tweet_id):
     """Fetch media for a specific tweet"""
     try:
@@ -925,47 +1012,75 @@ def display_tweet_card(tweet, is_top_pick=False, pick_number=None):
                     pass
         
         metric_style = "metric-high" if is_top_pick else ""
-        metrics_html = f'<div style="display: flex; gap: 20px; color: #71767b; font-size: 13px; margin: 12px 0;"><span class="{metric_style}">💬 {tweet["replies"]} replies</span><span class="{metric_style}">🔄 {tweet["retweets"]} RTs</span><span class="{metric_style}">❤️ {tweet["likes"]}</span></div>'
+        reply_delta = tweet.get('reply_delta')
+        delta_html = f' <span style="color: #00ba7c;">(+{reply_delta})</span>' if reply_delta and reply_delta > 0 else ''
+        velocity = tweet.get('reply_velocity')
+        velocity_html = f'<span class="{metric_style}">📈 {velocity:g} replies/hr</span>' if velocity and velocity > 0 else ''
+        metrics_html = f'<div style="display: flex; gap: 20px; color: #71767b; font-size: 13px; margin: 12px 0;"><span class="{metric_style}">💬 {tweet["replies"]} replies{delta_html}</span><span class="{metric_style}">🔄 {tweet["retweets"]} RTs</span><span class="{metric_style}">❤️ {tweet["likes"]}</span>{velocity_html}</div>'
         st.markdown(metrics_html, unsafe_allow_html=True)
         
         st.markdown(f'<a href="{tweet_url}" target="_blank" style="color: #1d9bf0; text-decoration: none;">🔗 View on Twitter →</a>', unsafe_allow_html=True)
 
-def generate_rewrites(original_tweet):
+def parse_json_response(response_text):
+    """Claude's JSON answer, minus any ```json fences"""
+    return json.loads(response_text.replace('```json', '').replace('```', '').strip())
+
+def complete(task, content, max_tokens, on_field=None):
+    """One Sonnet call -> (text, stop_reason), streamed when there's an on_field callback
+    
+    The shared persona system prompt goes first as a prompt-cache breakpoint;
+    only the task message varies. Token usage (cache reads / writes) is tallied per task.
+    """
+    request = dict(
+        model=GENERATION_MODEL,
+        max_tokens=max_tokens,
+        system=system_blocks(),
+        messages=[{"role": "user", "content": task_message(task, content)}]
+    )
+    if not (STREAM_GENERATION and on_field):
+        message = client.messages.create(**request)
+        token_usage.record(task, message.usage)
+        return message.content[0].text, message.stop_reason
+    fields = JsonFieldStream()
+    with client.messages.stream(**request) as stream:
+        for chunk in stream.text_stream:
+            for key, value in fields.feed(chunk):
+                on_field(key, value)
+        message = stream.get_final_message()
+    token_usage.record(task, message.usage)
+    return fields.text, message.stop_reason
+
+def cached_generation(kind, inputs, content, max_tokens, parse=parse_json_response, on_field=None):
+    """One Sonnet call (task kind.upper()) through the generation cache — raises on API / parse errors (nothing is cached)
+    
+    With STREAM_GENERATION and an on_field(key or index, value) callback, the
+    answer is streamed and each top-level JSON member is passed on as it completes.
+    """
+    def generate():
+        return parse(complete(kind.upper(), content, max_tokens, on_field)[0])
+    
+    key = generation_key(kind, PROMPT_VERSIONS[kind], GENERATION_MODEL, *inputs)
+    return generation_cache.get_or_generate(key, kind, generate)
+
+REWRITE_STYLE_NAMES = ("Default", "Controversial", "Retweet", "Reply")
+
+def rewrite_cache_key(original_tweet):
+    """Generation-cache key of a tweet's rewrites — shared by single and batched generation"""
+    return generation_key("rewrites", PROMPT_VERSIONS["rewrites"], GENERATION_MODEL, original_tweet)
+
+def cached_rewrites(original_tweet):
+    """Rewrites already in the generation cache, or None (never calls the API)"""
+    key = rewrite_cache_key(original_tweet)
+    return generation_cache.get(key) if key in generation_cache else None
+
+def valid_rewrites(rewrites):
+    return isinstance(rewrites, dict) and all(isinstance(rewrites.get(style), str) for style in REWRITE_STYLE_NAMES)
+
+def generate_rewrites(original_tweet, on_field=None):
     """Generate all 4 rewrite styles at once using Sonnet"""
     
-    prompt = f'''You are writing tweets for Tyler Polumbus — former Denver Broncos offensive lineman (Super Bowl 50 champion), current radio host on Altitude 92.5, and host of the "Mount Polumbus Speaks" podcast. He played 8 NFL seasons as an undrafted free agent and started over 60 games.
-
-Original tweet:
-{original_tweet}
-
-Generate 4 tweet versions:
-
-1. DEFAULT: Clean, informative take in Tyler's sports radio voice. Confident but balanced.
-
-2. CONTROVERSIAL: Spicy hot take designed to drive maximum engagement and debate. Bold, unapologetic.
-
-3. RETWEET: This will be used as a quote tweet. Add genuine value on top of the original — provide insider context, a layer of analysis, a connection most fans wouldn't make, or a strong opinion that elevates the conversation. Do NOT just rephrase the original. Think "what does Tyler uniquely bring to this that nobody else can?"
-
-4. REPLY: This will be posted as a direct reply to the original tweet. Either add meaningful context/layers that deepen the discussion, or give Tyler's clear opinion in response. Should feel like a natural reply in a conversation thread — direct, punchy, and engaging. Can agree, disagree, or build on the original.
-
-All versions should be tweet-length (under 280 characters). Sound like a real person, not a bot.
-
-Return ONLY valid JSON:
-{{"Default": "...", "Controversial": "...", "Retweet": "...", "Reply": "..."}}'''
-    
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-5-20250929",  # Back to reliable Sonnet
-            max_tokens=1000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        response_text = message.content[0].text
-        clean_response = response_text.replace('```json', '').replace('```', '').strip()
-        
-        import json
-        rewrites = json.loads(clean_response)
-        return rewrites
+        return cached_generation("rewrites", [original_tweet], f"Original tweet:\n{original_tweet}", 1000, on_field=on_field)
     except Exception as e:
         return {
             "Default": f"ERROR: {str(e)}",
@@ -974,50 +1089,94 @@ Return ONLY valid JSON:
             "Reply": f"ERROR: {str(e)}"
         }
 
+def generate_rewrites_batch(tweets, on_rewrites=None):
+    """Rewrites for several tweets -> {tweet id: rewrites}, REWRITE_BATCH_SIZE tweets per Sonnet call
+    
+    Tweets already in the generation cache skip the call. A batch cut off at
+    max_tokens keeps the tweets it finished and splits the rest in half; a
+    tweet the batch answer doesn't cover falls back to its own generate_rewrites.
+    on_rewrites(tweet_id, rewrites) is called as each tweet's set completes.
+    """
+    results = {}
+    pending = []
+    for tweet in tweets:
+        rewrites = cached_rewrites(tweet['text'])
+        if rewrites is None:
+            pending.append(tweet)
+            continue
+        results[tweet['id']] = rewrites
+        if on_rewrites:
+            on_rewrites(tweet['id'], rewrites)
+    for start in range(0, len(pending), REWRITE_BATCH_SIZE):
+        results.update(_rewrite_batch(pending[start:start + REWRITE_BATCH_SIZE], on_rewrites))
+    return results
+
+def _rewrite_batch(batch, on_rewrites):
+    if len(batch) == 1:
+        rewrites = generate_rewrites(batch[0]['text'])
+        if on_rewrites:
+            on_rewrites(batch[0]['id'], rewrites)
+        return {batch[0]['id']: rewrites}
+    
+    by_id = {str(tweet['id']): tweet for tweet in batch}
+    tweet_list = "\n\n".join(f"[{tweet['id']}]\n{tweet['text']}" for tweet in batch)
+    
+    def on_field(tweet_id, rewrites):
+        if tweet_id in by_id and valid_rewrites(rewrites):
+            on_rewrites(by_id[tweet_id]['id'], rewrites)
+    
+    try:
+        text, stop_reason = complete(
+            "REWRITES_BATCH", f"Original tweets, each under its tweet ID:\n\n{tweet_list}",
+            REWRITE_BATCH_TOKENS_PER_TWEET * len(batch), on_field if on_rewrites else None
+        )
+    except Exception as e:
+        print(f"Batch rewrite error: {e}")
+        text, stop_reason = "", None
+    
+    # Every tweet whose entry closed — also what a truncated answer managed to finish
+    answered = dict(JsonFieldStream().feed(text))
+    results = {}
+    for tweet_id, tweet in by_id.items():
+        rewrites = answered.get(tweet_id)
+        if valid_rewrites(rewrites):
+            generation_cache.put(rewrite_cache_key(tweet['text']), "rewrites", rewrites)
+            results[tweet['id']] = rewrites
+    
+    missing = [tweet for tweet in batch if tweet['id'] not in results]
+    if stop_reason == "max_tokens" and len(missing) > 1:
+        half = len(missing) // 2
+        results.update(_rewrite_batch(missing[:half], on_rewrites))
+        results.update(_rewrite_batch(missing[half:], on_rewrites))
+    else:
+        for tweet in missing:
+            results.update(_rewrite_batch([tweet], on_rewrites))
+    return results
+
 # ========================================
 # 🧵 THREAD BUILDER
 # ========================================
 
-def generate_thread(original_tweet, subject=""):
+def generate_thread(original_tweet, subject="", on_field=None):
     """Generate a 4-5 tweet thread building on the original tweet"""
     
-    prompt = f'''You are Tyler Polumbus — former Denver Broncos offensive lineman (Super Bowl 50 champion, 8 NFL seasons, undrafted free agent who started 60+ games), current radio host on Altitude 92.5 (12-3 PM MST), and host of the "Mount Polumbus Speaks" podcast.
-
-You just saw this viral tweet and want to build a full thread giving your take:
-
-Original tweet:
-{original_tweet}
-
-Generate a 4-5 tweet thread (each tweet under 280 characters). The thread should:
-
-- Tweet 1: Strong hook that grabs attention — a bold statement or question that makes people stop scrolling
-- Tweet 2: Your unique insider take — something only a guy who played in the NFL and was in that locker room would know
-- Tweet 3: Evidence or context — back up your take with a specific observation, comparison, or reference
-- Tweet 4: The counter-argument acknowledged — show you've thought about the other side, then explain why you still hold your position
-- Tweet 5 (optional): The closer — a punchy one-liner that's clip-worthy and shareable
+    try:
+        return cached_generation("thread", [original_tweet], f"Original tweet:\n{original_tweet}", 1500, on_field=on_field)
+    except Exception as e:
+        return [f"ERROR: {str(e)}"]
 
-Rules:
-- Sound like a real person, not an AI. Use natural language.
-- Be opinionated. Don't hedge everything.
-- Each tweet should stand on its own but flow as a thread
-- No hashtags in the thread (they look forced)
-- Number the tweets 1/ 2/ 3/ etc.
+def generate_reply_suggestion(author, follower_str, text, on_field=None):
+    """One reply to a high-follower account's tweet, in Tyler's voice (plain text)"""
+    request = f'''Tweet from @{author} ({follower_str} followers):
 
-Return valid JSON array of strings:
-["1/ tweet one text...", "2/ tweet two text...", "3/ tweet three text...", "4/ tweet four text...", "5/ tweet five text..."]'''
-    
+"{text}"'''
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-5-20250929",
-            max_tokens=1500,
-            messages=[{"role": "user", "content": prompt}]
+        return cached_generation(
+            "reply_suggestion", [author, follower_str, text], request, 300,
+            parse=lambda reply: reply.strip().strip('"'), on_field=on_field
         )
-        
-        response_text = message.content[0].text
-        clean_response = response_text.replace('```json', '').replace('```', '').strip()
-        return json.loads(clean_response)
     except Exception as e:
-        return [f"ERROR: {str(e)}"]
+        return f"ERROR: {str(e)}"
 
 def display_thread(thread_tweets, key_prefix):
     """Display a generated thread with editable text areas and copy buttons"""
@@ -1044,11 +1203,111 @@ def display_thread(thread_tweets, key_prefix):
             all_tweets.append(st.session_state.get(widget_key, thread_tweets[j]))
         st.code("\n\n".join(all_tweets), language=None)
 
+REWRITE_LABELS = {
+    "Default": "📝 Default",
+    "Controversial": "🔥 Controversial",
+    "Retweet": "🔄 Retweet (Quote Tweet)",
+    "Reply": "💬 Reply",
+}
+
+class StreamPreview:
+    """on_field callback that renders each streamed field as it completes — clear() once the real result shows"""
+    
+    def __init__(self, render, key_prefix, title=None):
+        self.render = render
+        self.key_prefix = key_prefix
+        self.title = title
+        self._slot = st.empty()
+        self._box = self._slot.container()
+    
+    def __call__(self, key, value):
+        with self._box:
+            if self.title:
+                st.caption(self.title)
+                self.title = None
+            self.render(key, value, self.key_prefix)
+    
+    def clear(self):
+        self._slot.empty()
+
+def render_rewrite_field(style, text, key_prefix):
+    st.markdown(f"**{REWRITE_LABELS.get(style, style)}:**")
+    st.text_area(style, value=str(text), height=100, disabled=True, key=f"{key_prefix}_stream_{style}", label_visibility="collapsed")
+
+def render_thread_field(j, text, key_prefix):
+    st.text_area(f"Tweet {j+1}", value=str(text), height=80, disabled=True, key=f"{key_prefix}_stream_thread_{j}", label_visibility="collapsed")
+
+def render_show_prep_field(sp_idx, segment, key_prefix):
+    st.markdown(show_prep_segment_html(sp_idx, segment), unsafe_allow_html=True)
+
+def render_podcast_idea_field(i, idea, key_prefix):
+    st.markdown(podcast_idea_html(i, idea), unsafe_allow_html=True)
+
+def idle_client_state(session):
+    """The session's last client state with its widget values but no button presses
+    
+    A rerun without widget states skips Streamlit's trigger reset, so the last
+    clicked button would read True again (a second scan, another Clear All).
+    Sending the current values minus triggers reruns the page as if nothing
+    was clicked.
+    """
+    client_state = ClientState()
+    client_state.CopyFrom(session._client_state)  # query string + page
+    client_state.widget_states.widgets.extend(
+        state for state in session.session_state.get_widget_states()
+        if state.WhichOneof("value") not in ("trigger_value", "json_trigger_value")
+    )
+    return client_state
+
+def wake_session(browser_session_id):
+    """Ask a browser session to rerun once it's idle, from any thread — how a finished job shows up without polling
+    
+    Streamlit 1.28 has no fragments / run_every, so there's no way to refresh
+    just the job panel; this costs one rerun per finished job instead of a
+    sleeping script run every poll tick. Leans on Runtime internals (session
+    manager, event loop, run state) — if they move, a finished job just shows
+    up on the next interaction instead.
+    """
+    if not Runtime.exists():
+        return  # Bare mode (benchmarks) — nothing to wake
+    try:
+        eventloop = Runtime.instance()._get_async_objs().eventloop
+    except AttributeError:
+        return
+    # AppSession isn't thread-safe — do the rest on the server's event loop
+    eventloop.call_soon_threadsafe(_rerun_when_idle, eventloop, browser_session_id)
+
+def _rerun_when_idle(eventloop, browser_session_id):
+    try:
+        info = Runtime.instance()._session_mgr.get_active_session_info(browser_session_id)
+        if info is None:
+            return  # Tab closed — the job expires from the registry
+        if info.session._state == AppSessionState.APP_IS_RUNNING:
+            # Don't cut a scan (or any run) short — rerun once it's done
+            eventloop.call_later(JOB_WAKE_RETRY_SECONDS, _rerun_when_idle, eventloop, browser_session_id)
+            return
+        info.session.request_rerun(idle_client_state(info.session))
+    except AttributeError as e:
+        print(f"Generation job wake skipped: {e}")
+
+def generation_job_button(label, button_key, tweet_id, kind, fn, *args, render=None):
+    """Button that queues fn(*args) as a background job — the page reruns once when it lands"""
+    job = generation_jobs.get(st.session_state.session_id, tweet_id, kind)
+    if job is None and st.button(label, key=button_key, use_container_width=True):
+        ctx = get_script_run_ctx()
+        on_done = (lambda: wake_session(ctx.session_id)) if ctx is not None else None
+        job = generation_jobs.submit(st.session_state.session_id, tweet_id, kind, fn, *args, on_done=on_done)
+    if job is not None:
+        st.caption("⏳ Generating in the background — keep reading, it'll show up here")
+        if render:
+            for field, value in list(job.partial.items()):
+                render(field, value, f"{kind}_{tweet_id}")
+
 # ========================================
 # 📋 SHOW PREP NOTES
 # ========================================
 
-def generate_show_prep(trending_topics):
+def generate_show_prep(trending_topics, on_field=None):
     """Generate radio-ready show prep talking points from trending topics"""
     
     # Build topic summary
@@ -1058,47 +1317,50 @@ def generate_show_prep(trending_topics):
         if topic.get('top_tweet'):
             topic_summary += f"\n   Hottest take: \"{topic['top_tweet']}\""
     
-    prompt = f'''You are a show prep producer for Tyler Polumbus's radio show on Altitude 92.5 (12-3 PM MST). Tyler is a former Denver Broncos offensive lineman (Super Bowl 50 champion, 8 NFL seasons as an undrafted free agent, started 60+ games) who now hosts a daily sports radio show.
-
-Here are today's trending topics from Denver sports Twitter:
-{topic_summary}
-
-Generate show prep notes Tyler can use on air TODAY. For each of the top 3-4 topics:
-
-1. **TOPIC**: The subject
-2. **OPEN WITH** (1 sentence): How Tyler should introduce this topic to listeners. Conversational, like you're talking to a friend at a bar.
-3. **KEY FACTS** (2-3 bullets): The specific things Tyler needs to know — stats, quotes, context
-4. **TYLER'S TAKE** (1-2 sentences): What Tyler's opinion should be, drawing on his playing experience
-5. **CALLER QUESTION**: A question to throw to callers that will light up the phone lines
-6. **TRANSITION**: One sentence to smoothly move to the next topic
-
-Keep it punchy. Tyler reads this during commercial breaks. No fluff.
-
-Return valid JSON array:
-[
-  {{
-    "topic": "...",
-    "open_with": "...",
-    "key_facts": ["...", "...", "..."],
-    "tylers_take": "...",
-    "caller_question": "...",
-    "transition": "..."
-  }}
-]'''
-    
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-5-20250929",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
+        return cached_generation(
+            "show_prep", [topic_summary], f"Today's trending topics from Denver sports Twitter:\n{topic_summary}", 2000, on_field=on_field
         )
-        
-        response_text = message.content[0].text
-        clean_response = response_text.replace('```json', '').replace('```', '').strip()
-        return json.loads(clean_response)
     except Exception as e:
         return [{"topic": f"ERROR: {str(e)}", "open_with": "", "key_facts": [], "tylers_take": "", "caller_question": "", "transition": ""}]
 
+def show_prep_segment_html(sp_idx, segment):
+    """One show-prep segment card"""
+    topic_name = html_lib.escape(str(segment.get('topic', 'Unknown')))
+    open_with = html_lib.escape(str(segment.get('open_with', '')))
+    facts = [html_lib.escape(str(f)) for f in segment.get('key_facts', [])]
+    take = html_lib.escape(str(segment.get('tylers_take', '')))
+    caller_q = html_lib.escape(str(segment.get('caller_question', '')))
+    transition = html_lib.escape(str(segment.get('transition', '')))
+    
+    # Segment colors
+    seg_colors = ["#f91880", "#ff6b35", "#1d9bf0", "#00ba7c"]
+    seg_color = seg_colors[sp_idx % len(seg_colors)]
+    
+    facts_html = "".join(f'<div style="font-size: 13px; color: #c4cad0; margin-left: 8px; line-height: 1.4;">• {fact}</div>' for fact in facts)
+    
+    return f'''<div style="background-color: #16181c; border-left: 4px solid {seg_color}; border-radius: 8px; padding: 16px; margin: 12px 0;">
+<div style="font-size: 11px; color: {seg_color}; font-weight: bold; margin-bottom: 4px;">SEGMENT {sp_idx + 1}</div>
+<div style="font-size: 18px; font-weight: bold; color: #e7e9ea; margin-bottom: 10px;">{topic_name}</div>
+<div style="margin-bottom: 10px;">
+<div style="font-size: 11px; color: #1d9bf0; font-weight: bold;">🎤 OPEN WITH:</div>
+<div style="font-size: 14px; color: #e7e9ea; line-height: 1.4;">&ldquo;{open_with}&rdquo;</div>
+</div>
+<div style="margin-bottom: 10px;">
+<div style="font-size: 11px; color: #1d9bf0; font-weight: bold;">📌 KEY FACTS:</div>
+{facts_html}
+</div>
+<div style="margin-bottom: 10px;">
+<div style="font-size: 11px; color: #1d9bf0; font-weight: bold;">💪 TYLER'S TAKE:</div>
+<div style="font-size: 14px; color: #e7e9ea; font-style: italic; line-height: 1.4;">&ldquo;{take}&rdquo;</div>
+</div>
+<div style="background-color: #1a2332; border-radius: 8px; padding: 10px; margin-bottom: 8px;">
+<div style="font-size: 11px; color: #ff6b35; font-weight: bold;">📞 CALLER QUESTION:</div>
+<div style="font-size: 14px; color: #e7e9ea;">&ldquo;{caller_q}&rdquo;</div>
+</div>
+<div style="font-size: 12px; color: #536471; font-style: italic;">➡️ Transition: {transition}</div>
+</div>'''
+
 # ========================================
 # 📊 MY TWEET PERFORMANCE TRACKER
 # ========================================
@@ -1170,28 +1432,25 @@ def find_reply_targets(min_followers=25000):
     seen_ids = set()
     
     def search_targets(query):
-        try:
-            result = client_twitter.search_recent_tweets(
-                query=query,
-                max_results=100,
-                start_time=start_time,
-                sort_order='relevancy',
-                tweet_fields=['public_metrics', 'created_at'],
-                expansions=['author_id'],
-                user_fields=['username', 'name', 'public_metrics', 'verified']
-            )
-            return result
-        except Exception as e:
+        def on_error(e):
             print(f"Reply target search error: {e}")
             return None
+        
+        return SearchCall(None, 'search_recent_tweets', lambda: dict(
+            query=query,
+            max_results=100,
+            start_time=start_time,
+            sort_order='relevancy',
+            tweet_fields=['public_metrics', 'created_at'],
+            expansions=['author_id'],
+            user_fields=['username', 'name', 'public_metrics', 'verified']
+        ), on_error=on_error)
     
-    # Search both in parallel
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        futures = [
-            executor.submit(search_targets, query_broncos),
-            executor.submit(search_targets, query_nuggets)
-        ]
-        results = [f.result() for f in futures]
+    # Search both in parallel (uncached — always live follower counts)
+    results = gather_calls(search_fanout(max_workers=2), {
+        'broncos': search_targets(query_broncos),
+        'nuggets': search_targets(query_nuggets),
+    }).values()
     
     for result in results:
         if not result or not result.data:
@@ -1251,9 +1510,7 @@ def find_reply_targets(min_followers=25000):
 # ========================================
 
 def save_scan_to_history(broncos_tweets, nuggets_tweets):
-    """Save scan results to persistent JSON for weekly rollup tracking"""
-    history = load_scan_history(days=30)  # Keep 30 days
-    
+    """Append scan results to the persistent history log for weekly rollup tracking"""
     # Build topic snapshot from this scan
     topic_data = defaultdict(lambda: {"tweet_count": 0, "total_replies": 0, "total_retweets": 0, "total_likes": 0, "sample_tweets": []})
     
@@ -1274,25 +1531,11 @@ def save_scan_to_history(broncos_tweets, nuggets_tweets):
         "topics": {k: dict(v) for k, v in topic_data.items()}
     }
     
-    history.append(scan_entry)
-    
     try:
-        SCAN_HISTORY_FILE.write_text(json.dumps(history, indent=2, default=str))
+        scan_history.append(scan_entry)  # O(1) — old entries are compacted away by the log
     except Exception as e:
         print(f"Failed to save scan history: {e}")
 
-def load_scan_history(days=7):
-    """Load scan history, filtering to the last N days"""
-    if not SCAN_HISTORY_FILE.exists():
-        return []
-    
-    try:
-        all_history = json.loads(SCAN_HISTORY_FILE.read_text())
-        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
-        return [entry for entry in all_history if entry.get("timestamp", "") >= cutoff]
-    except Exception:
-        return []
-
 # ========================================
 # TRENDING TOPICS (Current Scan)
 # ========================================
@@ -1380,47 +1623,13 @@ def get_trending_topics(broncos_tweets, nuggets_tweets):
 
 def get_weekly_topic_summary():
     """Aggregate 7 days of scan history into topic rankings"""
-    history = load_scan_history(days=7)
-    
-    if not history:
+    try:
+        return scan_history.topic_summary(days=7)
+    except Exception as e:
+        print(f"Weekly summary error: {e}")
         return [], 0
-    
-    weekly_agg = defaultdict(lambda: {
-        "appearances": 0,  # How many scans this topic showed up in
-        "total_tweets": 0,
-        "total_replies": 0,
-        "total_retweets": 0,
-        "total_likes": 0,
-        "total_engagement": 0,
-        "sample_tweets": []
-    })
-    
-    for scan in history:
-        for subject, data in scan.get("topics", {}).items():
-            wa = weekly_agg[subject]
-            wa["appearances"] += 1
-            wa["total_tweets"] += data.get("tweet_count", 0)
-            wa["total_replies"] += data.get("total_replies", 0)
-            wa["total_retweets"] += data.get("total_retweets", 0)
-            wa["total_likes"] += data.get("total_likes", 0)
-            wa["total_engagement"] += (
-                data.get("total_replies", 0) + 
-                data.get("total_retweets", 0) + 
-                data.get("total_likes", 0)
-            )
-            for st_text in data.get("sample_tweets", []):
-                if len(wa["sample_tweets"]) < 4:
-                    wa["sample_tweets"].append(st_text)
-    
-    sorted_weekly = sorted(
-        [{"subject": k, **v} for k, v in weekly_agg.items()],
-        key=lambda x: x["total_engagement"],
-        reverse=True
-    )
-    
-    return sorted_weekly, len(history)
 
-def generate_podcast_ideas(weekly_topics):
+def generate_podcast_ideas(weekly_topics, on_field=None):
     """Use Claude to generate 3 podcast episode ideas from the week's hottest topics"""
     
     # Build context from top topics
@@ -1431,45 +1640,48 @@ def generate_podcast_ideas(weekly_topics):
         if topic['sample_tweets']:
             topic_context += f"\n   Sample takes: {' | '.join(topic['sample_tweets'][:2])}"
     
-    prompt = f'''You are a podcast content strategist for Tyler Polumbus — former Denver Broncos offensive lineman (Super Bowl 50 champion), current radio host on Altitude 92.5 (12-3 PM MST), and host of the "Mount Polumbus Speaks" podcast. He played 8 NFL seasons as an undrafted free agent and started over 60 games.
-
-Here are the hottest topics from Denver sports Twitter this week, ranked by total engagement:
-{topic_context}
-
-Generate exactly 3 podcast episode ideas based on what's driving the most debate. For each:
-
-1. **EPISODE TITLE** — Catchy, clickable title
-2. **THE HOOK** — The central debate or question that will pull listeners in (1-2 sentences)
-3. **TYLER'S ANGLE** — What unique perspective can Tyler bring as a former player/insider that fans can't get elsewhere? (2-3 sentences)
-4. **SEGMENT BREAKDOWN** — 3 segments for a 30-45 min episode (one line each)
-5. **SPICY TAKE** — One bold, quotable opinion Tyler could lead with to drive social media clips
-
-Prioritize topics with high reply counts (that means debate) and topics that appeared across multiple scans (sustained interest, not just a flash).
-
-Return valid JSON array:
-[
-  {{
-    "title": "...",
-    "hook": "...",
-    "tylers_angle": "...",
-    "segments": ["...", "...", "..."],
-    "spicy_take": "..."
-  }}
-]'''
-    
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-5-20250929",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
+        return cached_generation(
+            "podcast_ideas", [topic_context],
+            f"This week's hottest topics from Denver sports Twitter, ranked by total engagement:\n{topic_context}", 2000, on_field=on_field
         )
-        
-        response_text = message.content[0].text
-        clean_response = response_text.replace('```json', '').replace('```', '').strip()
-        return json.loads(clean_response)
     except Exception as e:
         return [{"title": f"ERROR: {str(e)}", "hook": "", "tylers_angle": "", "segments": [], "spicy_take": ""}]
 
+def podcast_idea_html(i, idea):
+    """One podcast episode idea card (title, hook, Tyler's angle)"""
+    episode_num = i + 1
+    
+    # Color by rank
+    if episode_num == 1:
+        border_color = "#f91880"
+        rank_label = "🔥 TOP PICK"
+    elif episode_num == 2:
+        border_color = "#ff6b35"
+        rank_label = "⚡ STRONG"
+    else:
+        border_color = "#1d9bf0"
+        rank_label = "💡 SOLID"
+    
+    ep_title = html_lib.escape(str(idea.get("title", "Untitled")))
+    ep_hook = html_lib.escape(str(idea.get("hook", "")))
+    ep_angle = html_lib.escape(str(idea.get("tylers_angle", "")))
+    
+    return f'''<div style="background-color: #1a2332; border: 2px solid {border_color}; border-radius: 16px; padding: 20px; margin: 16px 0;">
+<div style="font-size: 11px; color: {border_color}; font-weight: bold; margin-bottom: 6px;">{rank_label} — EPISODE IDEA #{episode_num}</div>
+<div style="font-size: 20px; font-weight: bold; color: #e7e9ea; margin-bottom: 12px;">🎙️ {ep_title}</div>
+<div style="margin-bottom: 12px;">
+<div style="font-size: 11px; color: #1d9bf0; font-weight: bold; margin-bottom: 4px;">THE HOOK</div>
+<div style="font-size: 14px; color: #e7e9ea; line-height: 1.5;">{ep_hook}</div>
+</div>
+<div style="margin-bottom: 12px;">
+<div style="font-size: 11px; color: #1d9bf0; font-weight: bold; margin-bottom: 4px;">TYLER'S ANGLE</div>
+<div style="font-size: 14px; color: #e7e9ea; line-height: 1.5;">{ep_angle}</div>
+</div>
+</div>'''
+
+rerun_timer.mark("Session state + definitions")
+
 # Button section
 col1, col2, col3 = st.columns([3, 3, 1.5])
 
@@ -1484,6 +1696,7 @@ with col3:
         st.session_state.shown_tweet_ids = set()
         st.session_state.current_broncos_tweets = []
         st.session_state.current_nuggets_tweets = []
+        generation_jobs.cancel(st.session_state.session_id, kinds=("rewrites", "thread"))
         if 'filter_stats' in st.session_state:
             del st.session_state.filter_stats
         st.success("All cleared!")
@@ -1499,25 +1712,54 @@ if scan_button or scan_new_button:
     
     scan_type = "new tweets only" if scan_new_button else "all viral debates"
     
+    # Provisional top picks, redrawn as each search source finishes
+    provisional = st.empty()
+    
+    def show_provisional(broncos, nuggets, done_sources, pending_sources):
+        with provisional.container():
+            st.caption(f"⏳ Provisional picks — {len(done_sources)}/{len(done_sources) + len(pending_sources)} sources in, waiting on {', '.join(pending_sources)}")
+            for label, tweets in (("Broncos", broncos), ("Nuggets", nuggets)):
+                for tweet in tweets[:PROVISIONAL_TOP_N]:
+                    snippet = " ".join(tweet['text'].split())[:140]
+                    st.markdown(f"{label} · **{tweet['debate_score']:,}** · @{tweet['author']} — {snippet}")
+    
     with st.spinner(f"Scanning Twitter for {scan_type}..."):
         
         # Get top tweets with diversity enforcement
-        top_broncos, top_nuggets, filter_stats = get_top_debate_tweets(exclude_ids=exclude_ids)
+        # "Scan Again" reuses the last fresh window so every search can be
+        # served from the response cache and only the ranking is redone
+        fresh_hours = st.session_state.get('filter_stats', {}).get('fresh_hours') if scan_new_button else None
+        top_broncos, top_nuggets, filter_stats = get_top_debate_tweets(
+            exclude_ids=exclude_ids, fresh_hours=fresh_hours, on_progress=show_provisional
+        )
+        provisional.empty()
         
-        # Store in session state
+        # Store in session state — and drop queued rewrites / threads for tweets this scan replaced
         st.session_state.current_broncos_tweets = top_broncos
         st.session_state.current_nuggets_tweets = top_nuggets
+        generation_jobs.cancel(
+            st.session_state.session_id, keep={tweet['id'] for tweet in top_broncos + top_nuggets}, kinds=("rewrites", "thread")
+        )
         st.session_state.filter_stats = filter_stats  # Store stats for display
         
         # Track newly shown tweets
         for tweet in top_broncos + top_nuggets:
             st.session_state.shown_tweet_ids.add(tweet['id'])
         
+        trace = filter_stats['trace']
+        
         # Save scan to persistent history for weekly rollup
-        save_scan_to_history(top_broncos, top_nuggets)
+        with trace.span("history: save"):
+            save_scan_to_history(top_broncos, top_nuggets)
         
         # Calculate trending topics for this scan
-        st.session_state.trending_topics = get_trending_topics(top_broncos, top_nuggets)
+        with trace.span("trending topics"):
+            st.session_state.trending_topics = get_trending_topics(top_broncos, top_nuggets)
+        
+        if SCAN_TRACE_EXPORT:
+            trace.export(SCAN_TRACE_FILE, broncos=len(top_broncos), nuggets=len(top_nuggets))
+    
+    rerun_timer.mark("Scan")
 
 # Display tweets from session state (so they persist across reruns)
 if st.session_state.current_broncos_tweets or st.session_state.current_nuggets_tweets:
@@ -1525,12 +1767,24 @@ if st.session_state.current_broncos_tweets or st.session_state.current_nuggets_t
     if scan_button or scan_new_button:
         st.success(f"✅ Scan complete! Found {len(top_broncos)} Broncos tweets and {len(top_nuggets)} Nuggets tweets")
         
+        if st.session_state.get('filter_stats', {}).get('degraded'):
+            scan_stats = st.session_state.filter_stats
+            skipped = sorted({e['source'] or 'unknown' for e in scan_stats['rate_limited']})
+            if skipped:
+                st.warning(f"⚠️ Partial scan — rate limit budget low, skipped or cut short: {', '.join(skipped)}. Cached results were used where available.")
+            if scan_stats.get('timed_out'):
+                st.warning(f"⏱️ Partial scan — still waiting on {', '.join(scan_stats['timed_out'])} at the deadline. They'll be cached for the next scan.")
+        
         # Show filter stats if available
         if 'filter_stats' in st.session_state:
             stats = st.session_state.filter_stats
             with st.expander("📊 Scan Info — Search Breakdown + Filters"):
                 st.write(f"**Raw tweets from API:** {stats['total_raw']} (core: {stats.get('total_raw_core', '?')} | fresh: {stats.get('total_raw_fresh', '?')} | insider: {stats.get('total_raw_insider', '?')} | lists: {stats.get('total_raw_lists', '?')})")
                 st.write(f"**Fresh recency window:** last {stats.get('fresh_window', '?')}")
+                if stats.get('insiders'):
+                    ins = stats['insiders']
+                    coverage = "all covered this scan" if ins['queried'] == ins['packs'] else f"full coverage every {ins['scans_for_full_coverage']} scans"
+                    st.write(f"**Insiders:** {ins['accounts']} accounts in {ins['packs']} packed quer{'y' if ins['packs'] == 1 else 'ies'}, {ins['queried']} sent ({coverage})")
                 if stats.get('subjects_penalized'):
                     st.write(f"**Subjects penalized (overexposed):** {', '.join(stats['subjects_penalized'])}")
                 st.write(f"**Filtered out:**")
@@ -1540,12 +1794,42 @@ if st.session_state.current_broncos_tweets or st.session_state.current_nuggets_t
                 st.write(f"- Duplicates: {stats['filtered_duplicate']}")
                 st.write(f"**Kept after filters:** {stats['kept']} ({stats.get('kept_fresh', 0)} fresh tweets)")
                 st.write(f"**Final after diversity enforcement:** {len(top_broncos)} Broncos + {len(top_nuggets)} Nuggets")
+                if stats.get('http'):
+                    http = stats['http']
+                    st.write(f"**HTTP connections:** {http['requests']} requests — {http['reused']} reused, {http['new_connections']} new (TLS handshakes)")
+                gc = generation_cache.stats()
+                st.write(f"**Generation cache:** {gc['entries']} saved outputs ({gc['bytes'] / 1024 / 1024:.1f} of {GENERATION_CACHE_MAX_MB} MB) — {gc['hits']} hits / {gc['misses']} misses since restart")
+                if stats.get('response_cache'):
+                    rc = stats['response_cache']
+                    st.write(f"**Response cache:** {rc['hits']} hits / {rc['misses']} misses this scan ({rc['size']} cached, TTL {RESPONSE_CACHE_TTL_MINUTES} min, {rc['evictions']} evicted)")
+                if stats.get('incremental'):
+                    inc = stats['incremental']
+                    st.write(f"**Incremental fetch:** {inc['fetched']} tweets downloaded ({inc['new']} new) — {inc['held']} held in the {HOURS_BACK}h window, {inc['refetches']} window(s) re-pulled in full for fresh metrics")
+                if stats.get('rate_limited'):
+                    reasons = ', '.join(f"{e['source']} ({e['reason']})" for e in stats['rate_limited'])
+                    st.write(f"**Rate limited:** {reasons}")
+                for endpoint, budget in sorted(stats.get('rate_budget', {}).items()):
+                    resets = datetime.fromtimestamp(budget['reset']).strftime('%H:%M')
+                    st.write(f"- `{endpoint}`: {budget['remaining']}/{budget['limit']} requests left (resets {resets})")
+                if stats.get('trace'):
+                    trace = stats['trace']
+                    st.write(f"**Scan timing:** {trace.total:.2f}s — where it went:")
+                    st.code(trace.waterfall(), language=None)
+                    if SCAN_TRACE_EXPORT:
+                        st.caption(f"Trace appended to {SCAN_TRACE_FILE}")
     
     top_broncos = st.session_state.current_broncos_tweets
     top_nuggets = st.session_state.current_nuggets_tweets
     
     st.success(f"✅ Found {len(top_broncos)} Broncos + {len(top_nuggets)} Nuggets debates with max variety!")
     
+    # "Are these still hot?" — one batched lookup instead of re-running every search
+    if st.button("🔄 Refresh Metrics (no new search)", key="refresh_metrics", use_container_width=True):
+        with st.spinner("Pulling fresh reply/RT/like counts..."):
+            updated, calls = refresh_tweet_metrics(top_broncos + top_nuggets)
+            st.session_state.trending_topics = get_trending_topics(top_broncos, top_nuggets)
+        st.caption(f"🔄 Refreshed {updated} tweets with {calls} lookup call{'s' if calls != 1 else ''}")
+    
     # ========================================
     # 📈 TRENDING TOPICS SECTION
     # ========================================
@@ -1616,7 +1900,9 @@ if st.session_state.current_broncos_tweets or st.session_state.current_nuggets_t
             st.markdown("")
             if st.button("📋 Generate Show Prep Notes for Today", key="gen_show_prep", use_container_width=True, type="primary"):
                 with st.spinner("🎙️ Building your show prep..."):
-                    st.session_state.show_prep = generate_show_prep(trending)
+                    preview = StreamPreview(render_show_prep_field, "show_prep")
+                    st.session_state.show_prep = generate_show_prep(trending, on_field=preview)
+                    preview.clear()
             
             # Display show prep if generated
             if 'show_prep' in st.session_state:
@@ -1624,67 +1910,51 @@ if st.session_state.current_broncos_tweets or st.session_state.current_nuggets_t
                 st.caption("Read during commercial breaks. Each topic = ~5 min segment.")
                 
                 for sp_idx, segment in enumerate(st.session_state.show_prep):
-                    topic_name = html_lib.escape(str(segment.get('topic', 'Unknown')))
-                    open_with = html_lib.escape(str(segment.get('open_with', '')))
-                    facts = [html_lib.escape(str(f)) for f in segment.get('key_facts', [])]
-                    take = html_lib.escape(str(segment.get('tylers_take', '')))
-                    caller_q = html_lib.escape(str(segment.get('caller_question', '')))
-                    transition = html_lib.escape(str(segment.get('transition', '')))
-                    
-                    # Segment colors
-                    seg_colors = ["#f91880", "#ff6b35", "#1d9bf0", "#00ba7c"]
-                    seg_color = seg_colors[sp_idx % len(seg_colors)]
-                    
-                    facts_html = "".join(f'<div style="font-size: 13px; color: #c4cad0; margin-left: 8px; line-height: 1.4;">• {fact}</div>' for fact in facts)
-                    
-                    segment_html = f'''<div style="background-color: #16181c; border-left: 4px solid {seg_color}; border-radius: 8px; padding: 16px; margin: 12px 0;">
-<div style="font-size: 11px; color: {seg_color}; font-weight: bold; margin-bottom: 4px;">SEGMENT {sp_idx + 1}</div>
-<div style="font-size: 18px; font-weight: bold; color: #e7e9ea; margin-bottom: 10px;">{topic_name}</div>
-<div style="margin-bottom: 10px;">
-<div style="font-size: 11px; color: #1d9bf0; font-weight: bold;">🎤 OPEN WITH:</div>
-<div style="font-size: 14px; color: #e7e9ea; line-height: 1.4;">&ldquo;{open_with}&rdquo;</div>
-</div>
-<div style="margin-bottom: 10px;">
-<div style="font-size: 11px; color: #1d9bf0; font-weight: bold;">📌 KEY FACTS:</div>
-{facts_html}
-</div>
-<div style="margin-bottom: 10px;">
-<div style="font-size: 11px; color: #1d9bf0; font-weight: bold;">💪 TYLER'S TAKE:</div>
-<div style="font-size: 14px; color: #e7e9ea; font-style: italic; line-height: 1.4;">&ldquo;{take}&rdquo;</div>
-</div>
-<div style="background-color: #1a2332; border-radius: 8px; padding: 10px; margin-bottom: 8px;">
-<div style="font-size: 11px; color: #ff6b35; font-weight: bold;">📞 CALLER QUESTION:</div>
-<div style="font-size: 14px; color: #e7e9ea;">&ldquo;{caller_q}&rdquo;</div>
-</div>
-<div style="font-size: 12px; color: #536471; font-style: italic;">➡️ Transition: {transition}</div>
-</div>'''
-                    
-                    st.markdown(segment_html, unsafe_allow_html=True)
+                    st.markdown(show_prep_segment_html(sp_idx, segment), unsafe_allow_html=True)
     
     st.markdown("---")
     
+    # Optional: batch-generate every other card's rewrites in the background —
+    # results land in the generation cache and show up on the next rerun
+    if st.toggle("⚡ Pre-generate rewrites for every card", value=PREGENERATE_REWRITES, key="pregenerate_rewrites"):
+        submitted = st.session_state.setdefault('pregenerate_submitted', set())
+        remaining = [
+            {'id': tweet['id'], 'text': tweet['text']}
+            for tweet in top_broncos[3:] + top_nuggets
+            if f"rewrites_{tweet['id']}" not in st.session_state and tweet['id'] not in submitted
+        ]
+        if remaining:
+            pregenerate_executor.submit(generate_rewrites_batch, remaining)
+            submitted.update(tweet['id'] for tweet in remaining)
+            st.caption(f"⚡ Pre-generating rewrites for {len(remaining)} cards in the background — they'll appear as you interact")
+    
     if top_broncos:
         top_3_count = min(3, len(top_broncos))
         if top_3_count > 0:
             st.markdown("### ⭐ TOP 3 BRONCOS PICKS")
             
-            # Generate all TOP 3 rewrites concurrently (parallel) - MUCH FASTER!
+            # Generate all TOP 3 rewrites in one batched call (cached ones are skipped)
             top_3_tweets = top_broncos[:top_3_count]
             
             # Check if we need to generate rewrites
-            need_generation = any(f"rewrites_b{i}" not in st.session_state for i in range(top_3_count))
+            need_generation = [tweet for tweet in top_3_tweets if f"rewrites_{tweet['id']}" not in st.session_state]
             
             if need_generation:
-                with st.spinner(f"🚀 Generating rewrites for TOP 3 in parallel..."):
-                    def generate_for_index(idx):
-                        return idx, generate_rewrites(top_3_tweets[idx]['text'])
+                with st.spinner(f"🚀 Generating rewrites for TOP 3 in one batch..."):
+                    previews = {
+                        tweet['id']: StreamPreview(render_rewrite_field, f"rewrites_{tweet['id']}", title=f"⭐ Pick #{i+1}")
+                        for i, tweet in enumerate(top_3_tweets) if tweet in need_generation
+                    }
                     
-                    # Run all 3 API calls at the same time!
-                    with ThreadPoolExecutor(max_workers=3) as executor:
-                        futures = [executor.submit(generate_for_index, i) for i in range(top_3_count)]
-                        for future in futures:
-                            idx, rewrites = future.result()
-                            st.session_state[f"rewrites_b{idx}"] = rewrites
+                    def show_rewrites(tweet_id, rewrites):
+                        for style, text in rewrites.items():
+                            previews[tweet_id](style, text)
+                    
+                    batch = generate_rewrites_batch(need_generation, on_rewrites=show_rewrites)
+                    for tweet_id, rewrites in batch.items():
+                        st.session_state[f"rewrites_{tweet_id}"] = rewrites
+                    for preview in previews.values():
+                        preview.clear()
             
             # Display all TOP 3 with their rewrites
             for i in range(top_3_count):
@@ -1692,7 +1962,7 @@ if st.session_state.current_broncos_tweets or st.session_state.current_nuggets_t
                 display_tweet_card(tweet, is_top_pick=True, pick_number=i+1)
                 
                 # Show rewrites (already generated)
-                rewrite_key = f"rewrites_b{i}"
+                rewrite_key = f"rewrites_{tweet['id']}"
                 if rewrite_key in st.session_state:
                     rewrites = st.session_state[rewrite_key]
                     st.markdown("**✍️ Your Rewrites (edit before copying):**")
@@ -1746,12 +2016,12 @@ if st.session_state.current_broncos_tweets or st.session_state.current_nuggets_t
                             st.code(edited_reply, language=None)
                 
                 # Thread builder button
-                thread_key = f"thread_top{i}"
+                thread_key = f"thread_{tweet['id']}"
                 if thread_key not in st.session_state:
-                    if st.button("🧵 Build Thread from This Tweet", key=f"gen_thread_top{i}", use_container_width=True):
-                        with st.spinner("🧵 Building your thread..."):
-                            st.session_state[thread_key] = generate_thread(tweet['text'])
-                            st.rerun()
+                    generation_job_button(
+                        "🧵 Build Thread from This Tweet", f"gen_thread_top{i}", tweet['id'], "thread", generate_thread, tweet['text'],
+                        render=render_thread_field
+                    )
                 
                 if thread_key in st.session_state:
                     display_thread(st.session_state[thread_key], f"top{i}")
@@ -1764,13 +2034,19 @@ if st.session_state.current_broncos_tweets or st.session_state.current_nuggets_t
                 display_tweet_card(tweet, is_top_pick=False)
                 
                 # Button to generate rewrites on demand
-                rewrite_key = f"rewrites_b{idx}"
+                rewrite_key = f"rewrites_{tweet['id']}"
                 
+                # Pre-generated (or generated in another session) — show without a click
                 if rewrite_key not in st.session_state:
-                    if st.button(f"✨ Generate Rewrites", key=f"gen_b{idx}", use_container_width=True):
-                        with st.spinner("Generating rewrites..."):
-                            st.session_state[rewrite_key] = generate_rewrites(tweet['text'])
-                            st.rerun()
+                    pregenerated = cached_rewrites(tweet['text'])
+                    if pregenerated:
+                        st.session_state[rewrite_key] = pregenerated
+                
+                if rewrite_key not in st.session_state:
+                    generation_job_button(
+                        "✨ Generate Rewrites", f"gen_b{idx}", tweet['id'], "rewrites", generate_rewrites, tweet['text'],
+                        render=render_rewrite_field
+                    )
                 
                 # Show rewrites if generated
                 if rewrite_key in st.session_state:
@@ -1826,12 +2102,12 @@ if st.session_state.current_broncos_tweets or st.session_state.current_nuggets_t
                             st.code(edited_reply, language=None)
                 
                 # Thread builder button
-                thread_key = f"thread_b{idx}"
+                thread_key = f"thread_{tweet['id']}"
                 if thread_key not in st.session_state:
-                    if st.button("🧵 Build Thread from This Tweet", key=f"gen_thread_b{idx}", use_container_width=True):
-                        with st.spinner("🧵 Building your thread..."):
-                            st.session_state[thread_key] = generate_thread(tweet['text'])
-                            st.rerun()
+                    generation_job_button(
+                        "🧵 Build Thread from This Tweet", f"gen_thread_b{idx}", tweet['id'], "thread", generate_thread, tweet['text'],
+                        render=render_thread_field
+                    )
                 
                 if thread_key in st.session_state:
                     display_thread(st.session_state[thread_key], f"b{idx}")
@@ -1844,13 +2120,19 @@ if st.session_state.current_broncos_tweets or st.session_state.current_nuggets_t
             display_tweet_card(tweet, is_top_pick=False)
             
             # Button to generate rewrites on demand
-            rewrite_key = f"rewrites_n{idx}"
+            rewrite_key = f"rewrites_{tweet['id']}"
+            
+            # Pre-generated (or generated in another session) — show without a click
+            if rewrite_key not in st.session_state:
+                pregenerated = cached_rewrites(tweet['text'])
+                if pregenerated:
+                    st.session_state[rewrite_key] = pregenerated
             
             if rewrite_key not in st.session_state:
-                if st.button(f"✨ Generate Rewrites", key=f"gen_n{idx}", use_container_width=True):
-                    with st.spinner("Generating rewrites..."):
-                        st.session_state[rewrite_key] = generate_rewrites(tweet['text'])
-                        st.rerun()
+                generation_job_button(
+                    "✨ Generate Rewrites", f"gen_n{idx}", tweet['id'], "rewrites", generate_rewrites, tweet['text'],
+                    render=render_rewrite_field
+                )
             
             # Show rewrites if generated
             if rewrite_key in st.session_state:
@@ -1906,12 +2188,12 @@ if st.session_state.current_broncos_tweets or st.session_state.current_nuggets_t
                         st.code(edited_reply, language=None)
             
             # Thread builder button
-            thread_key = f"thread_n{idx}"
+            thread_key = f"thread_{tweet['id']}"
             if thread_key not in st.session_state:
-                if st.button("🧵 Build Thread from This Tweet", key=f"gen_thread_n{idx}", use_container_width=True):
-                    with st.spinner("🧵 Building your thread..."):
-                        st.session_state[thread_key] = generate_thread(tweet['text'])
-                        st.rerun()
+                generation_job_button(
+                    "🧵 Build Thread from This Tweet", f"gen_thread_n{idx}", tweet['id'], "thread", generate_thread, tweet['text'],
+                    render=render_thread_field
+                )
             
             if thread_key in st.session_state:
                 display_thread(st.session_state[thread_key], f"n{idx}")
@@ -1922,6 +2204,8 @@ else:
     if scan_button or scan_new_button:
         st.warning("⚠️ No viral debates found in the last 36 hours. Try again later!")
 
+rerun_timer.mark("Tweet cards + generation")
+
 # ========================================
 # 🎙️ WEEKLY ROLLUP — PODCAST IDEAS
 # ========================================
@@ -1971,7 +2255,7 @@ else:
     with podcast_col2:
         if st.button("🗑️ Clear History", use_container_width=True):
             try:
-                SCAN_HISTORY_FILE.unlink(missing_ok=True)
+                scan_history.clear()
                 if 'podcast_ideas' in st.session_state:
                     del st.session_state['podcast_ideas']
                 st.success("History cleared!")
@@ -1984,8 +2268,10 @@ else:
             st.warning("Need more scan data to generate good ideas. Run a few more scans!")
         else:
             with st.spinner("🧠 Claude is cooking up podcast ideas from this week's hottest debates..."):
-                ideas = generate_podcast_ideas(weekly_topics)
+                preview = StreamPreview(render_podcast_idea_field, "podcast")
+                ideas = generate_podcast_ideas(weekly_topics, on_field=preview)
                 st.session_state.podcast_ideas = ideas
+                preview.clear()
     
     # Display podcast ideas
     if 'podcast_ideas' in st.session_state:
@@ -1996,34 +2282,7 @@ else:
         for i, idea in enumerate(ideas):
             episode_num = i + 1
             
-            # Color by rank
-            if episode_num == 1:
-                border_color = "#f91880"
-                rank_label = "🔥 TOP PICK"
-            elif episode_num == 2:
-                border_color = "#ff6b35"
-                rank_label = "⚡ STRONG"
-            else:
-                border_color = "#1d9bf0"
-                rank_label = "💡 SOLID"
-            
-            ep_title = html_lib.escape(str(idea.get("title", "Untitled")))
-            ep_hook = html_lib.escape(str(idea.get("hook", "")))
-            ep_angle = html_lib.escape(str(idea.get("tylers_angle", "")))
-            
-            idea_html = f'''<div style="background-color: #1a2332; border: 2px solid {border_color}; border-radius: 16px; padding: 20px; margin: 16px 0;">
-<div style="font-size: 11px; color: {border_color}; font-weight: bold; margin-bottom: 6px;">{rank_label} — EPISODE IDEA #{episode_num}</div>
-<div style="font-size: 20px; font-weight: bold; color: #e7e9ea; margin-bottom: 12px;">🎙️ {ep_title}</div>
-<div style="margin-bottom: 12px;">
-<div style="font-size: 11px; color: #1d9bf0; font-weight: bold; margin-bottom: 4px;">THE HOOK</div>
-<div style="font-size: 14px; color: #e7e9ea; line-height: 1.5;">{ep_hook}</div>
-</div>
-<div style="margin-bottom: 12px;">
-<div style="font-size: 11px; color: #1d9bf0; font-weight: bold; margin-bottom: 4px;">TYLER'S ANGLE</div>
-<div style="font-size: 14px; color: #e7e9ea; line-height: 1.5;">{ep_angle}</div>
-</div>
-</div>'''
-            st.markdown(idea_html, unsafe_allow_html=True)
+            st.markdown(podcast_idea_html(i, idea), unsafe_allow_html=True)
             
             # Segments and spicy take in expandable section
             with st.expander(f"📋 Segments & Spicy Take — Episode #{episode_num}", expanded=False):
@@ -2049,6 +2308,8 @@ else:
             
             st.markdown("")
 
+rerun_timer.mark("Weekly rollup")
+
 # ========================================
 # 📊 MY TWEET PERFORMANCE
 # ========================================
@@ -2139,6 +2400,8 @@ if 'my_tweets' in st.session_state and st.session_state.my_tweets:
             ranked_html = f'<div style="background-color: #16181c; border: 1px solid #2f3336; border-radius: 10px; padding: 12px; margin-bottom: 8px;"><div style="display: flex; justify-content: space-between; align-items: flex-start;"><div style="flex: 1;"><span style="font-size: 14px; margin-right: 8px;">{rank_icon}</span><span style="font-size: 13px; color: #e7e9ea;">{tweet_text_esc}</span></div><div style="flex-shrink: 0; margin-left: 12px; text-align: right;"><div style="font-size: 18px; font-weight: bold; color: {eng_color};">{t["total_engagement"]:,}</div><div style="font-size: 10px; color: #536471;">total eng</div></div></div><div style="display: flex; gap: 16px; font-size: 12px; color: #71767b; margin-top: 8px;"><span>💬 {t["replies"]}</span><span>🔄 {t["retweets"]}</span><span>❤️ {t["likes"]}</span><span style="color: #536471;">{time_str}</span><a href="{tweet_url}" target="_blank" style="color: #1d9bf0; text-decoration: none;">View →</a></div></div>'
             st.markdown(ranked_html, unsafe_allow_html=True)
 
+rerun_timer.mark("Tweet performance")
+
 # ========================================
 # 🎯 REPLY TARGET FINDER
 # ========================================
@@ -2200,33 +2463,12 @@ if 'reply_targets' in st.session_state:
             st.markdown(target_html, unsafe_allow_html=True)
             
             # Generate a quick reply suggestion
-            reply_gen_key = f"reply_suggestion_{t_idx}"
+            reply_gen_key = f"reply_suggestion_{target['id']}"
             if reply_gen_key not in st.session_state:
-                if st.button(f"✨ Generate Reply Suggestion", key=f"gen_reply_sug_{t_idx}", use_container_width=True):
-                    with st.spinner("Crafting your reply..."):
-                        reply_prompt = f'''You are Tyler Polumbus — former Broncos OL (Super Bowl 50), radio host on Altitude 92.5. Write a smart, engaging reply to this tweet from @{target['author']} ({follower_str} followers):
-
-"{target['text']}"
-
-Your reply should:
-- Be under 280 characters
-- Add insider value or a strong opinion
-- Be the kind of reply that makes their followers want to follow YOU
-- Sound natural, not like a bot
-
-Return just the reply text, nothing else.'''
-                        
-                        try:
-                            reply_msg = client.messages.create(
-                                model="claude-sonnet-4-5-20250929",
-                                max_tokens=300,
-                                messages=[{"role": "user", "content": reply_prompt}]
-                            )
-                            st.session_state[reply_gen_key] = reply_msg.content[0].text.strip().strip('"')
-                            st.rerun()
-                        except Exception as e:
-                            st.session_state[reply_gen_key] = f"ERROR: {str(e)}"
-                            st.rerun()
+                generation_job_button(
+                    "✨ Generate Reply Suggestion", f"gen_reply_sug_{t_idx}", target['id'], "reply_suggestion",
+                    generate_reply_suggestion, target['author'], follower_str, target['text']
+                )
             
             if reply_gen_key in st.session_state:
                 suggestion = st.session_state[reply_gen_key]
@@ -2248,3 +2490,36 @@ Return just the reply text, nothing else.'''
                     st.markdown(f'<a href="{intent_url}" target="_blank" style="display: block; background-color: #1d9bf0; color: white; text-align: center; padding: 8px; border-radius: 20px; text-decoration: none; font-weight: bold;">🚀 Post Reply on 𝕏 →</a>', unsafe_allow_html=True)
             
             st.markdown("")
+
+rerun_timer.mark("Reply targets")
+
+# ========================================
+# 🧾 CLAUDE USAGE
+# ========================================
+with st.sidebar.expander("🧾 Claude Usage", expanded=False):
+    usage = token_usage.snapshot()
+    overall = usage.pop("all")
+    if overall["calls"]:
+        st.caption(f"{overall['calls']} calls since restart — {TokenUsage.cache_hit_rate(overall):.0%} of prompt tokens read from the persona prompt cache")
+        st.table([
+            {
+                "task": task,
+                "calls": totals["calls"],
+                "uncached in": totals["input_tokens"],
+                "cache write": totals["cache_creation_input_tokens"],
+                "cache read": totals["cache_read_input_tokens"],
+                "out": totals["output_tokens"],
+            }
+            for task, totals in {**usage, "TOTAL": overall}.items()
+        ])
+    else:
+        st.caption("No Claude calls yet this process")
+    jobs = generation_jobs.stats()
+    st.caption(f"Background jobs: {jobs['in_flight']} running · {jobs['submitted']} queued · {jobs['deduplicated']} duplicate clicks joined · {jobs['cancelled']} cancelled by rescans · {jobs['expired']} expired uncollected")
+
+# ========================================
+# ⏱️ RERUN TIMING
+# ========================================
+with st.sidebar.expander("⏱️ Rerun Timing", expanded=False):
+    st.caption(f"This run: {rerun_timer.total * 1000:.0f} ms")
+    st.table(rerun_timer.report())
@@ -0,0 +1,77 @@
+from keyword_index import compile_keywords, index_tweet
+
+# ========================================
+# SUBJECT MATCHER
+# ========================================
+# Every subject keyword list is compiled once at import time into a single
+# keyword -> subjects lookup. Tagging a tweet is one set intersection against
+# its keyword index (see keyword_index.py), so keywords match on whole words.
+
+# Ordered (subject, keywords) — same lists extract_subjects has always used
+SUBJECT_KEYWORDS = [
+    # BRONCOS PLAYERS
+    ("Bo Nix", ["bo nix", "nix", "bo-nix", "bonix"]),
+    ("Patrick Surtain", ["patrick surtain", "surtain", "ps2"]),
+    ("Courtland Sutton", ["courtland sutton", "sutton"]),
+    ("Javonte Williams", ["javonte williams", "javonte"]),
+    ("Russell Wilson", ["russell wilson", "russ wilson", "russ"]),
+    ("Riley Moss", ["riley moss"]),
+    ("Troy Franklin", ["troy franklin", "franklin"]),
+    # BRONCOS COACHES/STAFF
+    ("Sean Payton", ["sean payton", "payton", "coach payton"]),
+    ("Vance Joseph", ["vance joseph", "vance"]),
+    # BRONCOS TOPICS
+    ("Fire Payton", ["fire payton", "payton out", "fire sean"]),
+    ("QB Discussion", ["qb", "quarterback"]),
+    ("Defense", ["defense", "defensive", "no fly zone"]),
+    ("Offense", ["offense", "offensive"]),
+    ("Draft", ["draft"]),
+    ("Playoffs", ["playoffs", "playoff"]),
+    # NUGGETS PLAYERS
+    ("Nikola Jokic", ["nikola jokic", "jokic", "joker"]),
+    ("Jamal Murray", ["jamal murray", "murray"]),
+    ("Aaron Gordon", ["aaron gordon", "ag", "gordon"]),
+    ("Michael Porter Jr", ["michael porter", "mpj", "porter jr"]),
+    # NUGGETS TOPICS
+    ("MVP", ["mvp"]),
+    ("Player Rest", ["rest", "resting", "load management"]),
+    ("Championship", ["championship", "title", "ring"]),
+    # GENERAL TOPICS (cross-team)
+    ("Trade Talk", ["trade", "traded", "trading"]),
+    ("AJ Brown", ["aj brown", "a.j. brown"]),
+    ("Contract", ["contract", "extension", "deal"]),
+    ("Injury", ["injury", "injured", "hurt"]),
+]
+
+
+def _compile(rules):
+    """Compile (label, keywords) rules into keyword set + keyword -> labels map"""
+    labels_by_kw = {}
+    for label, keywords in rules:
+        for kw in compile_keywords(keywords):
+            labels_by_kw.setdefault(kw, set()).add(label)
+    return frozenset(labels_by_kw), labels_by_kw
+
+
+_SUBJECT_KWS, _SUBJECT_LABELS = _compile(SUBJECT_KEYWORDS)
+_BRONCOS_FALLBACK = compile_keywords(["broncos"])
+_NUGGETS_FALLBACK = compile_keywords(["nuggets", "jokic"])
+
+
+def extract_subjects(tweet_text, index=None):
+    """Extract key subjects/topics from tweet - returns set of subject strings"""
+    index = index or index_tweet(tweet_text)
+    subjects = set()
+    for kw in index.matches(_SUBJECT_KWS):
+        subjects |= _SUBJECT_LABELS[kw]
+
+    # Fallback: if no specific subject identified
+    if not subjects:
+        if index.has_any(_BRONCOS_FALLBACK):
+            subjects.add("General Broncos")
+        elif index.has_any(_NUGGETS_FALLBACK):
+            subjects.add("General Nuggets")
+        else:
+            subjects.add("Other")
+
+    return subjects
@@ -0,0 +1,73 @@
+import pytest
+
+from filter_keywords import CONTROVERSY_KWS, RUGBY_KWS
+from keyword_index import compile_keywords, index_tweet
+from subject_matcher import extract_subjects
+
+
+@pytest.mark.parametrize("text, keyword", [
+    ("What an ideal fit for this offense", "deal"),
+    ("He got hurt during the second half", "ring"),
+    ("Nobody talks about the kicker", "out"),
+    ("Great night against the Lakers", "ag"),
+    ("Phoenix was no match tonight", "nix"),
+    ("Zero interest in that free agent", "rest"),
+    ("Aging roster, but still good", "ag"),
+])
+def test_keywords_match_whole_words_only(text, keyword):
+    assert not index_tweet(text).has_any(compile_keywords([keyword]))
+
+
+@pytest.mark.parametrize("text, keyword", [
+    ("Two trades before the deadline", "trade"),
+    ("Too many injuries on the line", "injury"),
+    ("Coach fired after the loss", "fire"),
+    ("That pick busted hard", "bust"),
+    ("Best of both leagues", "league"),
+    ("He was trading shots with Murray", "trade"),
+])
+def test_keywords_match_regular_inflections(text, keyword):
+    assert index_tweet(text).has_any(compile_keywords([keyword]))
+
+
+def test_inflect_false_matches_exact_words_only():
+    assert not index_tweet("Two trades today").has_any(compile_keywords(["trade"], inflect=False))
+
+
+def test_punctuated_keywords_and_hashtags():
+    aj, bonix = compile_keywords(["a.j. brown"]), compile_keywords(["bo-nix"])
+    assert index_tweet("A.J. Brown torched them").has_any(aj)
+    assert index_tweet("Bo-Nix to Sutton again").has_any(bonix)
+    assert index_tweet("#Nuggets win").has_any(compile_keywords(["nuggets"]))
+    assert index_tweet("#Nuggets win").has_any(compile_keywords(["#nuggets"]))
+
+
+def test_index_cache_cleared_when_longer_phrase_compiled():
+    text = "the quick brown fox jumped"
+    index_tweet(text)  # Cached before any phrase starting with "quick" exists
+    compiled = compile_keywords(["quick brown fox"])
+    assert index_tweet(text).has_any(compiled)
+
+
+@pytest.mark.parametrize("text, subject", [
+    ("What an ideal fit", "Contract"),
+    ("He got hurt during the game", "Championship"),
+    ("Zero interest in Murray", "Player Rest"),
+])
+def test_subjects_ignore_partial_words(text, subject):
+    assert subject not in extract_subjects(text)
+
+
+@pytest.mark.parametrize("text, subject", [
+    ("Two trades before the deadline", "Trade Talk"),
+    ("Too many injuries again", "Injury"),
+    ("Extensions for everyone", "Contract"),
+])
+def test_subjects_match_inflections(text, subject):
+    assert subject in extract_subjects(text)
+
+
+def test_filters_catch_inflections():
+    assert index_tweet("Payton should be fired").has_any(CONTROVERSY_KWS)
+    assert index_tweet("Another first rounder busted").has_any(CONTROVERSY_KWS)
+    assert index_tweet("Both leagues are watching").has_any(RUGBY_KWS)
@@ -0,0 +1,166 @@
+import threading
+from datetime import datetime, timedelta
+
+# ========================================
+# INCREMENTAL TWEET WINDOWS
+# ========================================
+# For each logical search we keep the tweets seen over the last HOURS_BACK
+# plus the newest tweet ID. The next call only asks the API for tweets newer
+# than that ID (since_id) and merges them in, so a scan moves bytes in
+# proportion to new activity rather than to the size of the 36h window.
+# since_id never returns a held tweet again, so its public_metrics would stay
+# frozen at first sight — every refetch_minutes a window is pulled in full
+# (no since_id) and the re-fetched copies replace the stale ones.
+
+
+class SearchResult:
+    """Minimal stand-in for tweepy.Response — data / includes / meta"""
+
+    def __init__(self, data, includes=None, meta=None):
+        self.data = data
+        self.includes = includes
+        self.meta = meta
+
+
+def _naive_utc(dt):
+    return dt.replace(tzinfo=None) if dt is not None and dt.tzinfo else dt
+
+
+class TweetWindow:
+    """Tweets (plus their users/media) held for one logical search"""
+
+    def __init__(self):
+        self.tweets = {}
+        self.users = {}
+        self.media = {}
+        self.newest_id = None
+        self.full_fetch_at = None  # Last fetch without since_id
+
+    def merge(self, response):
+        """Fold an API response into the window — returns how many tweets were new"""
+        if response is None or not response.data:
+            return 0
+        includes = getattr(response, 'includes', None) or {}
+        for user in includes.get('users', []):
+            self.users[user.id] = user
+        for m in includes.get('media', []):
+            self.media[m.media_key] = m
+
+        new_count = 0
+        for tweet in response.data:
+            if tweet.id not in self.tweets:
+                new_count += 1
+            # Newer copy wins — its public_metrics are fresher
+            self.tweets[tweet.id] = tweet
+            if self.newest_id is None or int(tweet.id) > int(self.newest_id):
+                self.newest_id = tweet.id
+        return new_count
+
+    def evict(self, cutoff, max_tweets):
+        """Drop tweets created before cutoff, then the oldest beyond max_tweets"""
+        keep = [t for t in self.tweets.values() if t.created_at is None or _naive_utc(t.created_at) >= cutoff]
+        keep.sort(key=lambda t: int(t.id), reverse=True)
+        self.tweets = {t.id: t for t in keep[:max_tweets]}
+
+        author_ids = {t.author_id for t in self.tweets.values()}
+        media_keys = {mk for t in self.tweets.values() for mk in _media_keys(t)}
+        self.users = {uid: u for uid, u in self.users.items() if uid in author_ids}
+        self.media = {mk: m for mk, m in self.media.items() if mk in media_keys}
+
+    def view(self, start_time=None):
+        """The held tweets newer than start_time, newest first, as a SearchResult"""
+        start_time = _naive_utc(start_time)
+        data = [
+            t for t in self.tweets.values()
+            if start_time is None or t.created_at is None or _naive_utc(t.created_at) >= start_time
+        ]
+        if not data:
+            return None
+        data.sort(key=lambda t: int(t.id), reverse=True)
+        author_ids = {t.author_id for t in data}
+        media_keys = {mk for t in data for mk in _media_keys(t)}
+        includes = {
+            'users': [u for uid, u in self.users.items() if uid in author_ids],
+            'media': [m for mk, m in self.media.items() if mk in media_keys],
+        }
+        return SearchResult(data, includes, {'result_count': len(data), 'newest_id': self.newest_id})
+
+
+def _media_keys(tweet):
+    attachments = getattr(tweet, 'attachments', None)
+    if attachments and 'media_keys' in attachments:
+        return attachments['media_keys']
+    return []
+
+
+class IncrementalSearchStore:
+    """Thread-safe map of logical search key -> TweetWindow"""
+
+    def __init__(self, hours_back=36, max_tweets_per_window=2000, refetch_minutes=30):
+        self.hours_back = hours_back
+        self.max_tweets_per_window = max_tweets_per_window
+        self.refetch_minutes = refetch_minutes
+        self._windows = {}
+        self._refetching = set()  # Keys told to fetch in full, until their merge lands
+        self._lock = threading.Lock()
+        self.fetched = 0   # tweets that came over the wire
+        self.new = 0       # of those, tweets we had not seen before
+        self.refetches = 0
+
+    def _refetch_due(self, key):
+        # Caller holds the lock
+        window = self._windows.get(key)
+        if window is None or window.newest_id is None:
+            return True
+        stale_at = (window.full_fetch_at or datetime.min) + timedelta(minutes=self.refetch_minutes)
+        if datetime.utcnow() < stale_at:
+            return False
+        self._refetching.add(key)
+        return True
+
+    def refetch_due(self, key):
+        """True if the next fetch for key should skip since_id (cold window, or its metrics are stale)"""
+        with self._lock:
+            return self._refetch_due(key)
+
+    def since_id(self, key):
+        """Newest held ID, or None when the window is due a full fetch"""
+        with self._lock:
+            return None if self._refetch_due(key) else self._windows[key].newest_id
+
+    def merge(self, key, response, start_time=None):
+        """Merge a fresh response and return the window's view for start_time"""
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = TweetWindow()
+                window.full_fetch_at = datetime.utcnow()
+            elif key in self._refetching:
+                self._refetching.discard(key)
+                window.full_fetch_at = datetime.utcnow()
+                self.refetches += 1
+            new_count = window.merge(response)
+            self.fetched += len(response.data) if response is not None and response.data else 0
+            self.new += new_count
+            window.evict(datetime.utcnow() - timedelta(hours=self.hours_back), self.max_tweets_per_window)
+            return window.view(start_time)
+
+    def view(self, key, start_time=None):
+        """The window's current view without fetching (e.g. after an API error)"""
+        with self._lock:
+            window = self._windows.get(key)
+            return window.view(start_time) if window else None
+
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+            self._refetching.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "fetched": self.fetched,
+                "new": self.new,
+                "held": sum(len(w.tweets) for w in self._windows.values()),
+                "refetches": self.refetches,
+            }
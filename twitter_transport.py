@@ -0,0 +1,150 @@
+import asyncio
+import threading
+
+import tweepy
+from requests.adapters import HTTPAdapter
+
+from rate_limits import BudgetedClient, RateLimitTracker
+
+try:
+    import aiohttp
+    from tweepy.asynchronous import AsyncClient
+except ImportError:  # tweepy[async] not installed — only the thread-pool search backend works
+    aiohttp = AsyncClient = None
+
+# ========================================
+# TWITTER TRANSPORT
+# ========================================
+# tweepy.Client talks to the API through a single requests.Session. We mount
+# an HTTPAdapter whose connection pool is sized to the search fan-out, so all
+# parallel searches share warm keep-alive connections instead of opening (and
+# TLS-handshaking) new ones. The transport is meant to be built once per server
+# process and reused across scans and Streamlit reruns.
+#
+# Rate limits: with wait_on_rate_limit=False a 429 raises instead of sleeping
+# until reset, and every response's x-rate-limit-* headers feed a
+# RateLimitTracker that refuses low-priority calls before the budget runs out.
+
+# tweepy.Client method -> the parameter its follow-up pages are requested with
+# (recent search rejects pagination_token)
+PAGING_PARAMS = {
+    "search_recent_tweets": "next_token",
+    "get_list_tweets": "pagination_token",
+    "get_users_tweets": "pagination_token",
+}
+
+
+class TwitterTransport:
+    """tweepy.Client with a pooled keep-alive HTTPS session, reuse counters + rate budgets"""
+
+    def __init__(self, bearer_token, pool_size=10, wait_on_rate_limit=False, reserves=None):
+        self.pool_size = pool_size
+        self.raw_client = tweepy.Client(bearer_token=bearer_token, wait_on_rate_limit=wait_on_rate_limit)
+
+        # pool_block: a worker waits for a free connection rather than opening
+        # a throwaway one that gets discarded when the pool is full
+        self.adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+        self.raw_client.session.mount("https://", self.adapter)
+        self._lock = threading.Lock()
+
+        self.rate_limits = RateLimitTracker(reserves)
+        self.raw_client.session.hooks["response"].append(self.rate_limits.observe)
+        self.client = BudgetedClient(self.raw_client, self.rate_limits)
+
+    def connection_stats(self):
+        """Cumulative counts: requests sent, new connections (TLS handshakes), reused"""
+        new_connections = 0
+        requests_sent = 0
+        with self._lock:
+            pools = self.adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                new_connections += pool.num_connections
+                requests_sent += pool.num_requests
+        return {
+            "requests": requests_sent,
+            "new_connections": new_connections,
+            "reused": max(requests_sent - new_connections, 0),
+        }
+
+    @staticmethod
+    def stats_delta(before, after):
+        """Per-scan connection counts from two connection_stats() snapshots"""
+        return {k: after[k] - before[k] for k in after}
+
+
+class EventLoopThread:
+    """An asyncio loop that runs for the life of the process on a daemon thread
+
+    submit() hands it a coroutine from any thread. Anything bound to a loop
+    (an aiohttp session) is opened on this one once and reused.
+    """
+
+    def __init__(self, name="async-fanout"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, coro):
+        """Schedule coro on the loop -> concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+class AsyncTwitterTransport:
+    """One tweepy.AsyncClient on a long-lived loop + connection counters + the shared rate budgets
+
+    An aiohttp session belongs to the event loop it was opened on, so the
+    transport owns the loop (see EventLoopThread) and connect() opens the
+    session on it once — keep-alive connections carry over from scan to scan.
+    """
+
+    def __init__(self, bearer_token, rate_limits, pool_size=10):
+        if AsyncClient is None:
+            raise RuntimeError("asyncio search backend needs tweepy[async] (aiohttp + async-lru)")
+        self.bearer_token = bearer_token
+        self.pool_size = pool_size
+        self.rate_limits = rate_limits
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._new_connections = 0
+        self.loop = EventLoopThread()
+        self._client = None
+
+    @staticmethod
+    def available():
+        return AsyncClient is not None
+
+    async def connect(self):
+        """The shared client — opened on first use (always on self.loop, so no race)"""
+        if self._client is not None:
+            return self._client
+        trace = aiohttp.TraceConfig()
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_connection_create_end.append(self._on_connection_create_end)
+        client = AsyncClient(bearer_token=self.bearer_token, wait_on_rate_limit=False)
+        client.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.pool_size),
+            trace_configs=[trace],
+        )
+        self._client = BudgetedClient(client, self.rate_limits)
+        return self._client
+
+    async def _on_request_end(self, session, context, params):
+        with self._lock:
+            self._requests += 1
+        self.rate_limits.record_headers(str(params.url), params.response.status, params.response.headers)
+
+    async def _on_connection_create_end(self, session, context, params):
+        with self._lock:
+            self._new_connections += 1
+
+    def connection_stats(self):
+        """Same shape as TwitterTransport.connection_stats"""
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "new_connections": self._new_connections,
+                "reused": max(self._requests - self._new_connections, 0),
+            }
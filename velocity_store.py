@@ -0,0 +1,154 @@
+import struct
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# ========================================
+# REPLY VELOCITY STORE
+# ========================================
+# Append-only time series of engagement snapshots, one fixed-size binary
+# record per (tweet, scan): tweet_id, unix time, replies, retweets, likes.
+# The file is read once per process into an in-memory index keyed by tweet_id;
+# after that every scan is a single buffered append. Records older than the
+# retention window are dropped by an occasional compaction rewrite.
+
+_RECORD = struct.Struct("<QIIII")  # 24 bytes per snapshot
+
+MIN_INTERVAL_SECONDS = 5 * 60  # Ignore snapshot pairs closer than this — too noisy
+
+
+class VelocityStore:
+    """On-disk engagement snapshots + per-tweet index for reply velocity"""
+
+    def __init__(self, path, retention_days=3):
+        self.path = Path(path)
+        self.retention_seconds = retention_days * 86400
+        self._index = defaultdict(list)  # tweet_id -> [(ts, replies, retweets, likes)], oldest first
+        self._oldest_ts = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            raw = self.path.read_bytes()
+        except Exception as e:
+            print(f"Velocity store read error: {e}")
+            return
+        usable = len(raw) - len(raw) % _RECORD.size  # Ignore a torn trailing record
+        cutoff = time.time() - self.retention_seconds
+        stale = 0
+        for tweet_id, ts, replies, retweets, likes in _RECORD.iter_unpack(raw[:usable]):
+            if ts < cutoff:
+                stale += 1
+                continue
+            self._add(tweet_id, ts, replies, retweets, likes)
+        if stale or usable != len(raw):
+            self._rewrite()
+
+    def _add(self, tweet_id, ts, replies, retweets, likes):
+        self._index[tweet_id].append((ts, replies, retweets, likes))
+        if self._oldest_ts is None or ts < self._oldest_ts:
+            self._oldest_ts = ts
+
+    def _rewrite(self):
+        """Compaction: write back only the in-retention snapshots"""
+        records = [
+            _RECORD.pack(tweet_id, *snap)
+            for tweet_id, snaps in self._index.items()
+            for snap in snaps
+        ]
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            tmp.write_bytes(b"".join(records))
+            tmp.replace(self.path)
+        except Exception as e:
+            print(f"Velocity store compaction error: {e}")
+
+    def _compact_if_stale(self, now):
+        # Compact once the oldest record is a full day past retention
+        if self._oldest_ts is None or now - self._oldest_ts < self.retention_seconds + 86400:
+            return
+        cutoff = now - self.retention_seconds
+        index = defaultdict(list)
+        for tweet_id, snaps in self._index.items():
+            kept = [s for s in snaps if s[0] >= cutoff]
+            if kept:
+                index[tweet_id] = kept
+        self._index = index
+        self._oldest_ts = min((snaps[0][0] for snaps in index.values()), default=None)
+        self._rewrite()
+
+    def record(self, snapshots, ts=None):
+        """Append snapshots taken at one time: iterable of (tweet_id, replies, retweets, likes)"""
+        ts = int(ts if ts is not None else time.time())
+        self.record_timed((tweet_id, ts, r, rt, l) for tweet_id, r, rt, l in snapshots)
+
+    def record_timed(self, snapshots):
+        """Append snapshots each stamped with when it was fetched: iterable of (tweet_id, ts, replies, retweets, likes)"""
+        rows = [(int(tweet_id), int(ts), int(r), int(rt), int(l)) for tweet_id, ts, r, rt, l in snapshots]
+        if not rows:
+            return
+        with self._lock:
+            try:
+                with self.path.open("ab") as f:
+                    f.write(b"".join(_RECORD.pack(*row) for row in rows))
+            except Exception as e:
+                print(f"Velocity store write error: {e}")
+                return
+            for row in rows:
+                self._add(*row)
+            self._compact_if_stale(max(row[1] for row in rows))
+
+    def history(self, tweet_id):
+        """All snapshots for a tweet, oldest first: [(ts, replies, retweets, likes)]"""
+        with self._lock:
+            return list(self._index.get(int(tweet_id), ()))
+
+    def velocity(self, tweet_id, replies_now=None, ts=None):
+        """(replies_per_hour, acceleration) from stored snapshots + the current count
+
+        replies_now is a count fetched at ts (default now). Leave it out for a
+        copy served from a cache or a held window: its count is already in the
+        history at the time it was fetched, and pairing it with a later time
+        would read as a stall.
+
+        replies_per_hour is measured over the latest interval of at least
+        MIN_INTERVAL_SECONDS. acceleration is the change in that rate per hour
+        versus the interval before it (0 when only one interval exists).
+        Returns None when the tweet has no usable history yet.
+        """
+        points = [(s[0], s[1]) for s in self.history(tweet_id)]
+        if replies_now is not None:
+            points.append((int(ts if ts is not None else time.time()), replies_now))
+        if not points:
+            return None
+
+        # Walk back from the newest point, keeping points at least MIN_INTERVAL apart
+        spaced = [points[-1]]
+        for point in reversed(points[:-1]):
+            if spaced[-1][0] - point[0] >= MIN_INTERVAL_SECONDS:
+                spaced.append(point)
+                if len(spaced) == 3:
+                    break
+        if len(spaced) < 2:
+            return None
+
+        def rate(newer, older):
+            return (newer[1] - older[1]) / ((newer[0] - older[0]) / 3600)
+
+        latest = rate(spaced[0], spaced[1])
+        if len(spaced) < 3:
+            return latest, 0.0
+        previous = rate(spaced[1], spaced[2])
+        midpoint_gap_hours = ((spaced[0][0] - spaced[2][0]) / 2) / 3600
+        return latest, (latest - previous) / midpoint_gap_hours
+
+    def stats(self):
+        with self._lock:
+            return {
+                "tweets": len(self._index),
+                "snapshots": sum(len(s) for s in self._index.values()),
+            }